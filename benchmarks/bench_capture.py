@@ -0,0 +1,91 @@
+# Benchmark: capture timing while the main process is busy
+# Usage: python -m benchmarks.bench_capture [seconds]
+#
+# Delivers 10 ms chunks of synthetic audio while the main process parses large
+# JSON responses (which holds the GIL), once through the in-process Recorder, as
+# PortAudio's callback would, and once through CaptureProcess. Late chunks are
+# chunks delivered more than 15 ms after the previous one; on a real device each
+# is an input overflow or a gap waiting to happen.
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.capture import CaptureProcess, SyntheticSource
+from src.recorder import FakePyAudio, Recorder
+
+# A long response, as returned for a lecture with word and phoneme details
+PAYLOAD = json.dumps({"result": {"words": [{"word": "supermarket", "scores": {"overall": 90},
+                                            "phonics": [{"phoneme": "s", "overall": 90}] * 8}] * 20000}})
+
+
+def _load(seconds):
+    """Parse the payload over and over; returns the number of parses."""
+    end = time.monotonic() + seconds
+    parses = 0
+    while time.monotonic() < end:
+        json.loads(PAYLOAD)
+        parses += 1
+    return parses
+
+
+def _in_process(seconds):
+    source = SyntheticSource()
+    audio = FakePyAudio()
+    recorder = Recorder(source.sample_rate, chunk=source.chunk, max_seconds=seconds + 1, audio=audio)
+    recorder.start()
+    gaps = []
+    last = [None]
+
+    def deliver(data, status_flags):
+        now = time.monotonic()
+        if last[0] is not None:
+            gaps.append(now - last[0])
+        last[0] = now
+        audio.stream.push(data, status_flags)
+
+    stop = threading.Event()
+    thread = threading.Thread(target=source.run, args=(deliver, stop))
+    thread.start()
+    parses = _load(seconds)
+    stop.set()
+    thread.join()
+    recorder.stop()
+    interval = source.chunk / source.sample_rate
+    return {"chunks": len(gaps) + 1, "late_chunks": sum(gap > 1.5 * interval for gap in gaps),
+            "max_gap": max(gaps, default=0.0), "max_latency": None, "parses": parses}
+
+
+def _out_of_process(seconds):
+    with CaptureProcess(SyntheticSource(), max_seconds=seconds + 1) as capture:
+        capture.start()
+        end = time.monotonic() + seconds
+        parses = 0
+        while time.monotonic() < end:
+            json.loads(PAYLOAD)
+            parses += 1
+            capture.read().release()
+        capture.stop().release()
+        stats = capture.stats()
+    return {"chunks": stats["frames"] // 160, "late_chunks": stats["late_chunks"],
+            "max_gap": stats["max_gap"], "max_latency": stats["max_latency"], "parses": parses}
+
+
+def main(seconds=5.0):
+    start = time.perf_counter()
+    json.loads(PAYLOAD)
+    print(f"Main process parses a {len(PAYLOAD) / 1e6:.1f} MB response "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms each) for {seconds:g} s")
+    print(f"{'capture':<16} {'chunks':>7} {'late':>6} {'max gap':>9} {'max latency':>12} {'parses':>7}")
+    for label, run in (("in-process", _in_process), ("out-of-process", _out_of_process)):
+        stats = run(seconds)
+        latency = f"{stats['max_latency'] * 1000:>9.1f} ms" if stats["max_latency"] is not None else f"{'':>12}"
+        print(f"{label:<16} {stats['chunks']:>7} {stats['late_chunks']:>6} "
+              f"{stats['max_gap'] * 1000:>6.1f} ms {latency} {stats['parses']:>7}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
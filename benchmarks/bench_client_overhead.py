@@ -0,0 +1,41 @@
+# Benchmark: client-side CPU cost per evaluation, excluding the network
+# Usage: python -m benchmarks.bench_client_overhead [calls]
+#
+# Times payload construction (dict + json.dumps vs the cached template) and a
+# whole evaluate_pronunciation call with the upload replaced by a canned answer.
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import CANNED_RESULT
+
+PCM = bytes(32000)  # one second of 16 kHz silence
+
+
+def _per_call(stmt, calls):
+    return min(timeit.repeat(stmt, number=calls, repeat=5)) / calls * 1e6
+
+
+def main(calls=20000):
+    api = SuperSpeech(app_key="bench_key", secret_key="bench_secret")
+    request = api._pronunciation_request("안녕하세요 반갑습니다", "sent.eval.kr")
+
+    rebuilt = _per_call(lambda: json.dumps(api._build_params(request)), calls)
+    templated = _per_call(lambda: api._serialize_params(request), calls)
+
+    canned = json.dumps(CANNED_RESULT)
+    api._send = lambda core_type, params, source, timeout=None: (200, canned)
+    full = _per_call(lambda: api.evaluate_pronunciation(PCM, "안녕하세요 반갑습니다", "sent.eval.kr"),
+                     calls // 10)
+
+    print(f"payload, dict + json.dumps   {rebuilt:8.1f} us/call")
+    print(f"payload, cached template     {templated:8.1f} us/call")
+    print(f"evaluate_pronunciation       {full:8.1f} us/call (upload stubbed out)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,115 @@
+# Benchmark: compressed uploads against the WAV baseline
+# Usage: python -m benchmarks.bench_compressed_upload [uplink_kbps] [--live]
+#
+# For every recording in audio_samples/ and every compressed format some backend
+# (soundfile or ffmpeg) can write, reports the upload size, the encode time and the
+# end-to-end latency on the local stand-in server, which holds each request for as
+# long as its body would take over an uplink of uplink_kbps (default: 256 kbit/s,
+# a weak mobile connection). With --live and API credentials in the environment,
+# each recording is also scored by the real API in every format and the score
+# drift from WAV is reported.
+
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.audio_source import AudioSource
+from src.encoding import ACCEPTED_FORMATS, encode_source, pick_encoder
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        "audio_samples", "*.wav")))
+REPEATS = 5
+
+# Reference texts of the bundled recordings, for the live score comparison
+REF_TEXTS = {"supermarket.wav": ("supermarket", "word.eval.promax"),
+             "korean_word.wav": ("namja", "word.eval.kr"),
+             "recorded_korean.wav": ("namja", "word.eval.kr"),
+             "my_recording.wav": ("supermarket", "word.eval.promax")}
+
+
+def _encoders():
+    encoders = []
+    for audio_type in ACCEPTED_FORMATS:
+        try:
+            encoders.append(pick_encoder(audio_type))
+        except ImportError:
+            print(f"No backend can write {audio_type}; install soundfile or ffmpeg to include it")
+    return encoders
+
+
+def _uplink(kbps):
+    """Stand-in response that waits as long as the request body would take to upload."""
+    def respond(handler):
+        time.sleep(int(handler.headers.get("Content-Length", 0)) * 8 / (kbps * 1000))
+        return 200, CANNED_RESULT
+    return respond
+
+
+def _latency(server, compress, path):
+    api = SuperSpeech(app_key="bench_key", secret_key="bench_secret", base_url=server.url,
+                      compress=compress)
+    with api:
+        api.evaluate_pronunciation(path, "supermarket", use_cache=False)  # open the connection
+        times = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            api.evaluate_pronunciation(path, "supermarket", use_cache=False)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _drift(encoders):
+    print("\nScore drift against WAV on the live API")
+    print(f"{'sample':<22} {'format':<6} {'overall':>8} {'pron.':>8} {'Δ overall':>10} {'Δ pron.':>8}")
+    for path in SAMPLES:
+        name = os.path.basename(path)
+        ref_text, core_type = REF_TEXTS.get(name, ("supermarket", "word.eval.promax"))
+        baseline = None
+        for encoder in [None] + encoders:
+            with SuperSpeech(compress=encoder, typed_results=True) as api:
+                result = api.evaluate_pronunciation(path, ref_text, core_type, use_cache=False)
+            label = encoder.audio_type if encoder else "wav"
+            if not result.ok:
+                print(f"{name:<22} {label:<6} error: {result.error}")
+                continue
+            baseline = baseline or result
+            print(f"{name:<22} {label:<6} {result.overall:>8} {result.pronunciation:>8} "
+                  f"{result.overall - baseline.overall:>+10} {result.pronunciation - baseline.pronunciation:>+8}")
+
+
+def main(uplink_kbps=256, live=False):
+    encoders = _encoders()
+    if not encoders:
+        print("No compressed format can be written here; nothing to compare")
+        return
+
+    with StandInServer(respond=_uplink(uplink_kbps)) as server:
+        print(f"Uplink of {uplink_kbps} kbit/s simulated by {server.url}, median of {REPEATS} calls")
+        print(f"{'sample':<22} {'format':<6} {'bytes':>9} {'saved':>7} {'encode':>9} {'latency':>9}")
+        for path in SAMPLES:
+            name = os.path.basename(path)
+            wav_size = os.path.getsize(path)
+            print(f"{name:<22} {'wav':<6} {wav_size:>9} {'':>7} {'':>9} "
+                  f"{_latency(server, None, path) * 1000:>6.0f} ms")
+            for encoder in encoders:
+                start = time.perf_counter()
+                encoded = encode_source(encoder, AudioSource(path))
+                encode_time = time.perf_counter() - start
+                print(f"{name:<22} {encoder.audio_type:<6} {encoded.size:>9} "
+                      f"{1 - encoded.size / wav_size:>6.0%} {encode_time * 1000:>6.1f} ms "
+                      f"{_latency(server, encoder, path) * 1000:>6.0f} ms")
+
+    if live:
+        _drift(encoders)
+    else:
+        print("\nScore drift needs the real API: rerun with --live and SPEECHSUPER_APP_KEY/SECRET_KEY set")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--live"]
+    main(*(int(arg) for arg in args), live="--live" in sys.argv)
@@ -0,0 +1,68 @@
+# Benchmark: audio normalization throughput
+# Usage: python -m benchmarks.bench_normalize [seconds]
+#
+# Converts synthetic phone-style recordings (44.1/48 kHz stereo, 24-bit and float)
+# to 16 kHz 16-bit mono and reports hours of audio converted per CPU-second,
+# along with the upload size before and after.
+
+import io
+import os
+import struct
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.audio_source import AudioSource
+from src.preprocess import to_mono16
+
+
+def _recording(rate, channels, sample_width, seconds):
+    """Speech-like test signal: a few harmonics with a slow amplitude envelope plus noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds)) / rate
+    signal = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 540, 2500)))
+    signal *= 0.3 * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    frames = np.repeat(signal[:, None], channels, axis=1) + 0.01 * rng.standard_normal((len(t), channels))
+    if sample_width == 4:
+        data = frames.astype(np.float32).tobytes()
+        header = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + len(data), b"WAVE", b"fmt ", 16, 3,
+                             channels, rate, rate * channels * 4, channels * 4, 32, b"data", len(data))
+        return header + data
+    if sample_width == 3:
+        ints = (frames * 8388607).astype(np.int32).reshape(-1)
+        data = np.stack([ints & 0xFF, (ints >> 8) & 0xFF, (ints >> 16) & 0xFF], axis=1).astype(np.uint8).tobytes()
+    else:
+        data = (frames * 32767).astype(np.int16).tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(rate)
+        wav.writeframes(data)
+    return buffer.getvalue()
+
+
+def main(seconds=300):
+    print(f"{seconds} s of audio per format")
+    print(f"{'input':<26} {'CPU time':>9} {'h audio/CPU-s':>14} {'x realtime':>11} {'bytes in':>10} {'bytes out':>10}")
+    for rate, channels, width, label in ((48000, 2, 2, "48 kHz stereo 16-bit"),
+                                         (44100, 2, 2, "44.1 kHz stereo 16-bit"),
+                                         (48000, 2, 3, "48 kHz stereo 24-bit"),
+                                         (44100, 1, 4, "44.1 kHz mono float"),
+                                         (16000, 2, 2, "16 kHz stereo 16-bit"),
+                                         (8000, 1, 2, "8 kHz mono 16-bit")):
+        data = _recording(rate, channels, width, seconds)
+        source = AudioSource(data)
+        to_mono16(source)  # warm up
+        start = time.process_time()
+        samples = to_mono16(source)
+        cpu = time.process_time() - start
+        print(f"{label:<26} {cpu:>8.3f}s {seconds / 3600 / cpu:>14.2f} {seconds / cpu:>10.0f}x "
+              f"{len(data) / 1e6:>8.1f}MB {(samples.nbytes + 44) / 1e6:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,58 @@
+# Benchmark: memory and decode time of plain result dicts vs EvaluationResult
+# Usage: python -m benchmarks.bench_results [count]
+#
+# Decodes the same sentence-level response many times and reports the Python
+# heap held by all results (tracemalloc) and the time spent decoding.
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.results import EvaluationResult, orjson
+
+_WORD = {"word": "supermarket", "scores": {"overall": 88, "pronunciation": 90},
+         "span": {"start": 0, "end": 60},
+         "phonics": [[{"phoneme": p, "spell": p, "overall": 85} for p in ("s", "u", "p", "ə", "m")]]}
+RESPONSE = json.dumps({"result": {"overall": 88, "pronunciation": 90, "fluency": 85, "rhythm": 80,
+                                  "integrity": 100, "speed": 120, "duration": "3.2",
+                                  "words": [_WORD] * 6}}).encode("utf-8")
+
+
+def _measure(build, count):
+    # Each response arrives as its own bytes object, as it would from the network
+    bodies = [bytes(bytearray(RESPONSE)) for _ in range(count)]
+    start = time.perf_counter()
+    results = [build(body) for body in bodies]
+    elapsed = time.perf_counter() - start
+    del results
+
+    tracemalloc.start()
+    results = [build(body) for body in bodies]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current, elapsed
+
+
+def _typed_read(body):
+    result = EvaluationResult(body)
+    result.overall
+    return result
+
+
+def main(count=100000):
+    print(f"{count} results of {len(RESPONSE)} bytes, orjson {'installed' if orjson else 'not installed'}")
+    print(f"{'representation':<30} {'memory':>10} {'time':>9}")
+    for name, build in (("dict (json.loads)", json.loads),
+                        ("EvaluationResult, unread", EvaluationResult),
+                        ("EvaluationResult, fields read", _typed_read)):
+        memory, elapsed = _measure(build, count)
+        print(f"{name:<30} {memory / 1e6:>7.1f} MB {elapsed:>8.2f}s")
+    print(f"EvaluationResult also keeps the response bytes: {count * len(RESPONSE) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,70 @@
+# Benchmark: per-request latency with and without the pooled session
+# Usage: python -m benchmarks.bench_session_pool [requests]
+#
+# Compares the old behaviour (module-level requests.post, one new connection
+# per evaluation) with SuperSpeech's pooled keep-alive session, both against
+# the local stand-in server. The server adds HANDSHAKE_DELAY to every new
+# connection to mimic the TCP+TLS setup cost of reaching api.speechsuper.com.
+
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer
+
+AUDIO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "audio_samples", "supermarket.wav")
+HANDSHAKE_DELAY = 0.03
+
+
+def _time_calls(call, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label, timings):
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<28} mean {statistics.mean(timings) * 1000:7.2f} ms   "
+          f"p50 {p50:7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main(count=200):
+    with StandInServer(connect_delay=HANDSHAKE_DELAY) as server:
+        api = SuperSpeech(app_key="bench_key", secret_key="bench_secret", base_url=server.url)
+
+        # Old path: every call opens (and tears down) its own connection
+        def unpooled():
+            with open(AUDIO_PATH, "rb") as audio_file:
+                requests.post(server.url + "word.eval.promax", data={"text": "{}"},
+                              files={"audio": audio_file}, headers={"Request-Index": "0"})
+
+        with api:
+            api.warm_up()
+
+            def pooled():
+                api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+
+            unpooled_timings = _time_calls(unpooled, count)
+            pooled_timings = _time_calls(pooled, count)
+
+    print(f"{count} requests against {server.url} "
+          f"(simulated handshake {HANDSHAKE_DELAY * 1000:.0f} ms)")
+    _report("requests.post (no pool)", unpooled_timings)
+    _report("SuperSpeech pooled session", pooled_timings)
+    saved = statistics.mean(unpooled_timings) - statistics.mean(pooled_timings)
+    print(f"Saved per request: {saved * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
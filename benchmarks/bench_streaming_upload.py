@@ -0,0 +1,65 @@
+# Benchmark: peak client memory per upload, in-memory vs streaming multipart
+# Usage: python -m benchmarks.bench_streaming_upload [megabytes ...]
+#
+# Uploads silent WAV files of increasing size to the local stand-in server and
+# reports the peak Python heap growth (tracemalloc) for each upload path.
+
+import os
+import sys
+import tempfile
+import tracemalloc
+import wave
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer
+
+
+def _make_wav(path, megabytes):
+    block = bytes(1024 * 1024)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        for _ in range(megabytes):
+            wav.writeframes(block)
+
+
+def _peak_upload_memory(api, path):
+    tracemalloc.start()
+    try:
+        result = api.evaluate_spontaneous_speech(path, "Tell me about your weekend.")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return peak
+
+
+def main(sizes=(1, 8, 32, 64)):
+    with StandInServer() as server, tempfile.TemporaryDirectory() as tmp:
+        # The files run far past the API's 90 s limit, so the local duration check is off
+        in_memory = SuperSpeech(app_key="bench_key", secret_key="bench_secret",
+                                base_url=server.url, streaming_threshold=None, preflight=False)
+        streaming = SuperSpeech(app_key="bench_key", secret_key="bench_secret",
+                                base_url=server.url, streaming_threshold=0, preflight=False)
+
+        print(f"{'audio':>8}  {'in-memory peak':>16}  {'streaming peak':>16}")
+        for megabytes in sizes:
+            path = os.path.join(tmp, f"speech_{megabytes}mb.wav")
+            _make_wav(path, megabytes)
+            # Warm both sessions so connection setup is not counted
+            _peak_upload_memory(in_memory, path)
+            _peak_upload_memory(streaming, path)
+            buffered_peak = _peak_upload_memory(in_memory, path)
+            streamed_peak = _peak_upload_memory(streaming, path)
+            print(f"{megabytes:>6} MB  {buffered_peak / 1e6:>13.2f} MB  {streamed_peak / 1e6:>13.2f} MB")
+            os.remove(path)
+
+        in_memory.close()
+        streaming.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (1, 8, 32, 64))
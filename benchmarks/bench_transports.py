@@ -0,0 +1,56 @@
+# Benchmark: throughput and latency of each transport on the local stand-in server
+# Usage: python -m benchmarks.bench_transports [evaluations] [concurrency]
+#
+# Runs the same concurrent batch through every available transport. The server
+# adds HANDSHAKE_DELAY to each new connection and SERVER_DELAY to each request.
+# The stand-in speaks plain HTTP/1.1, so "http2" falls back to HTTP/1.1 here;
+# point base_url at an HTTPS endpoint that speaks HTTP/2 to measure multiplexing.
+# The fake transport shows the client's own overhead without any sockets.
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.speech_api import SuperSpeech
+from src.transport import httpx
+from benchmarks.standin_server import StandInServer
+
+AUDIO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "audio_samples", "supermarket.wav")
+HANDSHAKE_DELAY = 0.03
+SERVER_DELAY = 0.01
+
+
+def _run(transport, base_url, count, concurrency):
+    api = SuperSpeech(app_key="bench_key", secret_key="bench_secret", base_url=base_url,
+                      transport=transport, pool_size=concurrency)
+    with api:
+        api.evaluate_batch([(AUDIO_PATH, "supermarket")] * concurrency)  # open connections
+        start = time.perf_counter()
+        records = api.evaluate_batch([(AUDIO_PATH, "supermarket")] * count, max_workers=concurrency)
+        elapsed = time.perf_counter() - start
+    failures = sum(record["error"] is not None for record in records)
+    latencies = sorted(record["elapsed"] for record in records)
+    return count / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], failures
+
+
+def main(count=400, concurrency=16):
+    transports = ["fake", "requests"]
+    if httpx is not None:
+        transports += ["httpx", "http2"]
+    else:
+        print("httpx is not installed; skipping the httpx and http2 transports")
+
+    with StandInServer(delay=SERVER_DELAY, connect_delay=HANDSHAKE_DELAY) as server:
+        print(f"{count} evaluations, {concurrency} concurrent, against {server.url}")
+        print(f"{'transport':<10} {'req/s':>9} {'p50':>10} {'p95':>10} {'failed':>7}")
+        for transport in transports:
+            rate, p50, p95, failures = _run(transport, server.url, count, concurrency)
+            print(f"{transport:<10} {rate:>9.1f} {p50 * 1000:>7.2f} ms {p95 * 1000:>7.2f} ms {failures:>7}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
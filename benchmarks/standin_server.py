@@ -0,0 +1,121 @@
+# Local stand-in for the SpeechSuper HTTP API
+# Accepts the same multipart uploads as api.speechsuper.com and answers with a
+# canned result, so the client can be benchmarked without a network or API key.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_RESULT = {
+    "result": {
+        "overall": 88,
+        "pronunciation": 90,
+        "fluency": 85,
+        "rhythm": 80,
+        "integrity": 100,
+        "speed": 120,
+        "duration": "1.2",
+        "words": [{"word": "supermarket", "scores": {"overall": 88, "pronunciation": 90}}]
+    }
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # Runs once per TCP connection; stands in for the TLS handshake cost
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        # Drain the body in small pieces so uploads of any size are accepted
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            received = self._read_chunked()
+        else:
+            received = self._read_exactly(int(self.headers.get("Content-Length", 0)))
+        self.server.request_count += 1
+        self.server.bytes_received += received
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        status, body = self.server.respond(self)
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_exactly(self, length):
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 65536))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return length - remaining
+
+    def _read_chunked(self):
+        total = 0
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                self.rfile.readline()
+                return total
+            total += self._read_exactly(size)
+            self.rfile.readline()
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, respond=None, port=0, connect_delay=0.0):
+        """Start a stand-in server on localhost.
+
+        Args:
+            delay (float): Seconds to wait before answering each request (default: 0)
+            respond (callable): Optional handler -> (status, body) override
+            port (int): Port to bind, 0 picks a free one (default: 0)
+            connect_delay (float): Seconds added to every new connection, to
+                mimic a TLS handshake with the real host (default: 0)
+        """
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.delay = delay
+        self.connect_delay = connect_delay
+        self.respond = respond or (lambda handler: (200, CANNED_RESULT))
+        self.request_count = 0
+        self.bytes_received = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
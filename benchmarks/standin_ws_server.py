@@ -0,0 +1,145 @@
+# Local stand-in for the SpeechSuper WebSocket API
+# Accepts streaming sessions (connect, start, binary audio, empty stop frame) and
+# answers with a canned result, so streaming can be tested without a network.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.websocket import OP_BINARY, OP_CLOSE, OP_PING, OP_TEXT, accept_key, encode_frame, read_frame
+
+from .standin_server import CANNED_RESULT
+
+
+class StreamRecord:
+    def __init__(self, path):
+        """What the stand-in received during one streaming session."""
+        self.path = path
+        self.connect = None
+        self.start = None
+        self.audio = bytearray()
+        self.frames = 0
+        self.stopped = False
+
+    @property
+    def core_type(self):
+        return self.path.rsplit("/", 1)[-1]
+
+
+class StandInWebSocketHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self.send_error(400, "Expected a WebSocket upgrade")
+            return
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept_key(key))
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        record = StreamRecord(self.path)
+        with self.server.lock:
+            self.server.sessions.append(record)
+        try:
+            self._receive(record)
+        except (ConnectionError, ValueError):
+            return
+        if not record.stopped:
+            return
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        body = self.server.respond(record)
+        if isinstance(body, dict):
+            body = json.dumps(body)
+        self._send(OP_TEXT, body.encode("utf-8") if isinstance(body, str) else body)
+        self._send(OP_CLOSE, (1000).to_bytes(2, "big"))
+
+    def _read_exactly(self, size):
+        data = self.rfile.read(size)
+        if len(data) < size:
+            raise ConnectionError("Client closed the connection")
+        return data
+
+    def _send(self, opcode, payload):
+        try:
+            self.wfile.write(encode_frame(opcode, payload, mask=False))
+            self.wfile.flush()
+        except OSError:
+            pass
+
+    def _receive(self, record):
+        """Read the session until the empty binary stop frame or a close."""
+        while True:
+            fin, opcode, payload = read_frame(self._read_exactly)
+            if opcode == OP_CLOSE:
+                return
+            if opcode == OP_PING:
+                continue
+            if opcode == OP_TEXT:
+                message = json.loads(payload)
+                if record.connect is None:
+                    record.connect = message
+                else:
+                    record.start = message
+            elif opcode == OP_BINARY:
+                if not payload:
+                    record.stopped = True
+                    return
+                record.audio += payload
+                record.frames += 1
+
+
+def _canned_response(record):
+    token_id = ((record.start or {}).get("param") or {}).get("request", {}).get("tokenId")
+    return dict(CANNED_RESULT, tokenId=token_id)
+
+
+class StandInWebSocketServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, respond=None, port=0):
+        """Start a stand-in WebSocket server on localhost.
+
+        Args:
+            delay (float): Seconds between the stop frame and the result (default: 0)
+            respond (callable): Optional respond(StreamRecord) -> dict, str or bytes override
+                (default: CANNED_RESULT with the session's tokenId)
+            port (int): Port to bind, 0 picks a free one (default: 0)
+        """
+        super().__init__(("127.0.0.1", port), StandInWebSocketHandler)
+        self.delay = delay
+        self.respond = respond or _canned_response
+        self.sessions = []
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"ws://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -1,14 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-import pyaudio
 import wave
 import os
 import json
+import logging
 import re
 from src.speech_api import SuperSpeech
+from src.hedging import HedgePolicy
+from src.capture import CaptureProcess, MicrophoneSource
+from src.results import EvaluationResult
+from src.vad import detect_speech
 from hangul_romanize import Transliter
 from hangul_romanize.rule import academic
 
+logger = logging.getLogger(__name__)
+
 # Instantiate the transliterator for automatic romanization
 transliter = Transliter(academic)
 
@@ -22,19 +28,22 @@ class KoreanRecorderApp:
         self.root.configure(padx=20, pady=20)
         
         # Initialize audio settings
-        self.chunk = 1024
-        self.format = pyaudio.paInt16
         self.channels = 1
         self.rate = 16000
-        self.frames = []
         self.recording = False
-        self.p = pyaudio.PyAudio()
+        self.session = None
+        self.session_text = None
+        # The microphone is read in its own process, so building requests, parsing
+        # results and redrawing here cannot make it miss audio; takes are capped
+        # at the API's 90-second limit
+        self.capture = CaptureProcess(MicrophoneSource(self.rate, self.channels, chunk=1024), max_seconds=90)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Create widgets
         self.setup_ui()
         
         # Initialize SuperSpeech API
-        self.api = SuperSpeech()
+        self.api = SuperSpeech(coalesce=True, hedge=HedgePolicy(), typed_results=True)
         
     def setup_ui(self):
         # Korean word entry
@@ -79,63 +88,99 @@ class KoreanRecorderApp:
     
     def start_recording(self):
         self.recording = True
-        self.frames = []
         self.record_button.config(text="Stop Recording")
         self.status_label.config(text="Recording...")
         self.result_label.config(text="")
         
-        # Open audio stream
-        self.stream = self.p.open(
-            format=self.format,
-            channels=self.channels,
-            rate=self.rate,
-            input=True,
-            frames_per_buffer=self.chunk
-        )
+        # When the word is already entered, evaluate while the learner is speaking
+        self.open_session(self.word_entry.get().strip())
         
-        # Start recording in a separate function
-        self.root.after(10, self.record_frame)
+        self.capture.start()
+        self.root.after(20, self.poll_capture)
     
-    def record_frame(self):
+    def poll_capture(self):
         if self.recording:
-            data = self.stream.read(self.chunk)
-            self.frames.append(data)
-            self.root.after(10, self.record_frame)
+            self.forward_audio()
+            self.root.after(20, self.poll_capture)
+    
+    def forward_audio(self):
+        """Send audio captured since the last call to the streaming session."""
+        while True:
+            pcm = self.capture.read()
+            if not pcm:
+                break
+            if self.session is not None:
+                self.session.send(pcm)
+    
+    def close(self):
+        self.finish_session()
+        self.capture.close()
+        self.root.destroy()
+    
+    def open_session(self, korean_word):
+        """Open a streaming evaluation for the entered word, if there is one."""
+        self.session = self.session_text = None
+        if not korean_word:
+            return
+        try:
+            romanized_word = transliter.translit(korean_word) if re.search(r'[가-힣]', korean_word) else korean_word
+        except Exception as e:
+            logger.debug("Not streaming, could not romanize '%s': %s", korean_word, e)
+            return
+        core_type = "word.eval.kr" if len(romanized_word.split()) == 1 else "sent.eval.kr"
+        self.session = self.api.stream_pronunciation(romanized_word, core_type, audio_sample_rate=self.rate)
+        self.session_text = romanized_word
+        logger.debug("Streaming %s evaluation of '%s'", core_type, romanized_word)
+    
+    def finish_session(self, romanized_word=None):
+        """Return the streamed result if it was for romanized_word, else cancel the session."""
+        session, self.session = self.session, None
+        if session is None:
+            return None
+        if romanized_word is None or romanized_word != self.session_text:
+            session.cancel()
+            return None
+        result = session.finish()
+        logger.debug("Streamed result after %s s: %s", session.latency, result)
+        return result
     
     def stop_recording(self):
         self.recording = False
         self.record_button.config(text="Start Recording")
         self.status_label.config(text="Processing...")
         
-        # Stop and close the stream
-        self.stream.stop_stream()
-        self.stream.close()
-        
-        # Save the recorded audio
+        # Keep the recording in memory for the API; the file is only for playback
+        pcm = self.capture.stop()
+        self.forward_audio()
+        logger.debug("Capture: %s", self.capture.stats())
         audio_path = "audio_samples/recorded_korean.wav"
         wf = wave.open(audio_path, 'wb')
         wf.setnchannels(self.channels)
-        wf.setsampwidth(self.p.get_sample_size(self.format))
+        wf.setsampwidth(2)
         wf.setframerate(self.rate)
-        wf.writeframes(b''.join(self.frames))
+        wf.writeframes(pcm)
         wf.close()
         
         # Enable playback button
         self.playback_button.config(state="normal")
 
-        # Check if the recording is likely silent
-        file_size = os.path.getsize(audio_path)
-        if file_size < 20000:  # Heuristic: 20KB for a short word is generous
-            self.result_label.config(text=f"Warning: Recorded audio is very small ({file_size} bytes).\n"
+        # Reject a silent take, and upload only the speech and a short margin around it
+        span = detect_speech(pcm, self.rate)
+        if span is None:
+            self.result_label.config(text="Warning: No speech detected in the recording.\n"
                                           "Please check if your microphone is working and not muted.\n"
                                           "Try speaking louder and closer to the microphone.")
             self.status_label.config(text="Ready")
+            self.finish_session()
             return
+        pcm = span.speech
+        file_size = pcm.nbytes + 44  # PCM data plus the WAV header
         
         # Get the Korean word
         korean_word = self.word_entry.get().strip()
         if not korean_word:
             self.status_label.config(text="Please enter a Korean word!")
+            self.finish_session()
             return
         
         # Automatically convert Korean text to romanized text
@@ -146,83 +191,77 @@ class KoreanRecorderApp:
             except Exception as e:
                 self.result_label.config(text=f"Could not romanize '{korean_word}': {e}")
                 self.status_label.config(text="Ready")
+                self.finish_session()
                 return
         else:
             romanized_word = korean_word
         
         # Add debugging info
-        print(f"DEBUG: Audio file size: {file_size} bytes")
-        print(f"DEBUG: Korean word: '{korean_word}'")
-        print(f"DEBUG: Romanized word: '{romanized_word}'")
-        print(f"DEBUG: Audio file saved to: {audio_path}")
+        logger.debug("Upload size: %s bytes, %s bytes of silence trimmed", file_size, span.bytes_saved)
+        logger.debug("Korean word: '%s'", korean_word)
+        logger.debug("Romanized word: '%s'", romanized_word)
+        logger.debug("Audio file saved to: %s", audio_path)
         
         # Evaluate pronunciation
         try:
             # Use romanized text for the API call
-            print(f"DEBUG: Trying API call with romanized text: '{romanized_word}'")
+            logger.debug("Trying API call with romanized text: '%s'", romanized_word)
             
             # Check if it's a single word or multiple words
             word_count = len(romanized_word.split())
-            print(f"DEBUG: Word count: {word_count}")
+            logger.debug("Word count: %s", word_count)
             
             if word_count == 1:
                 # Single word - use Korean-specific word evaluation endpoint
                 core_types_to_try = ["word.eval.kr"]
-                print(f"DEBUG: Using single word evaluation with Korean word.eval.kr")
+                logger.debug("Using single word evaluation with Korean word.eval.kr")
             else:
                 # Multiple words - use Korean sentence evaluation endpoint (newly granted access)
                 core_types_to_try = ["sent.eval.kr"]
-                print(f"DEBUG: Using sentence evaluation with Korean sent.eval.kr (newly granted access)")
+                logger.debug("Using sentence evaluation with Korean sent.eval.kr (newly granted access)")
             
-            result = None
-            for core_type in core_types_to_try:
-                try:
-                    print(f"DEBUG: Trying core_type: {core_type}")
-                    result = self.api.evaluate_pronunciation(
-                        audio_path=audio_path,
-                        ref_text=romanized_word,
-                        core_type=core_type
-                    )
-                    print(f"DEBUG: API result for {core_type}: {result}")
-                    
-                    # If no error, break out of the loop
-                    if result and not result.get('error'):
-                        print(f"DEBUG: Success with {core_type}")
-                        break
-                    elif result and result.get('error'):
-                        print(f"DEBUG: {core_type} failed with error: {result.get('error')}")
-                        continue
-                        
-                except Exception as e:
-                    print(f"DEBUG: Exception with {core_type}: {e}")
-                    continue
+            # The streamed evaluation is usually done by now; upload the recording only
+            # if the text was edited during recording or streaming failed
+            result = self.finish_session(romanized_word)
+            if result is not None and result.ok:
+                core_type = core_types_to_try[0]
+            else:
+                # Send every (core type, text) variant at once and keep the first success,
+                # instead of paying a round-trip for each one that fails
+                variants = [(candidate, romanized_word) for candidate in core_types_to_try]
+                if korean_word != romanized_word:
+                    variants += [(candidate, korean_word) for candidate in core_types_to_try]
+                record = self.api.evaluate_speculative(pcm, variants, audio_sample_rate=self.rate)
+                result = record["result"]
+                core_type = (record["variant"] or variants[0])[0]
+                logger.debug("Speculative result: winner %s, %s request(s), %s cancelled, %.2fs",
+                             record["variant"], record["requests"], record["cancelled"], record["elapsed"])
             
             # If all attempts failed, show the last result
             if not result or result.get('error'):
-                print(f"DEBUG: All core types failed. Last result: {result}")
+                logger.debug("All core types failed. Last result: %s", result)
                 
         except Exception as e:
-            print(f"DEBUG: Exception: {e}")
+            logger.debug("Exception: %s", e)
             self.result_label.config(text=f"Error: {str(e)}")
             self.status_label.config(text="Ready")
             return
             
         # Display results with detailed metrics
-        print(f"DEBUG: Final result to display: {result}")
-        if isinstance(result, dict):
-            if 'error' in result:
-                self.result_label.config(text=f"API Error: {result['error']}\n"
+        logger.debug("Final result to display: %s", result)
+        if isinstance(result, EvaluationResult):
+            if not result.ok:
+                self.result_label.config(text=f"API Error: {result.error}\n"
                                               f"Core type attempted: {core_type if 'core_type' in locals() else 'Unknown'}")
             else:
                 # Extract detailed metrics from the result
-                res = result.get('result', {})
-                overall_score = res.get('overall', 0)
-                pronunciation_score = res.get('pronunciation', 0)
-                fluency_score = res.get('fluency', 0)
-                rhythm_score = res.get('rhythm', 0)
-                speed_wpm = res.get('speed', 0)
-                integrity_score = res.get('integrity', 0)
-                duration = res.get('duration', '0')
+                overall_score = result.overall or 0
+                pronunciation_score = result.pronunciation or 0
+                fluency_score = result.fluency or 0
+                rhythm_score = result.rhythm or 0
+                speed_wpm = result.speed or 0
+                integrity_score = result.integrity or 0
+                duration = result.duration or 0
                 
                 # Create a detailed results display
                 result_text = f"🎯 Overall Score: {overall_score}/100\n\n"
@@ -237,18 +276,18 @@ class KoreanRecorderApp:
                 result_text += f"• Duration: {duration}s\n\n"
                 
                 # Word-by-word analysis
-                words = res.get('words', [])
+                words = result.words
                 if words:
                     result_text += f"📝 Word Analysis:\n"
                     for i, word in enumerate(words):
-                        word_text = word.get('word', f'Word {i+1}')
-                        word_score = word.get('scores', {}).get('overall', 0)
-                        word_pronunciation = word.get('scores', {}).get('pronunciation', 0)
+                        word_text = word.word or f'Word {i+1}'
+                        word_score = word.overall or 0
+                        word_pronunciation = word.pronunciation or 0
                         result_text += f"• {word_text}: {word_score}/100 (pronunciation: {word_pronunciation}/100)\n"
                     result_text += "\n"
                 
                 # Audio info
-                result_text += f"🔊 Audio: {audio_path} ({file_size} bytes)\n"
+                result_text += f"🔊 Audio: {audio_path} ({file_size} bytes sent, {span.bytes_saved} bytes of silence trimmed)\n"
                 result_text += f"📝 Text: '{korean_word}' → '{romanized_word}'\n"
                 result_text += f"⚙️ Core Type: {core_type if 'core_type' in locals() else 'sent.eval.promax'}"
                 
@@ -263,8 +302,8 @@ class KoreanRecorderApp:
         audio_path = "audio_samples/recorded_korean.wav"
         abs_audio_path = os.path.abspath(audio_path)
         
-        print(f"DEBUG: Trying to play: {abs_audio_path}")
-        print(f"DEBUG: File exists: {os.path.exists(abs_audio_path)}")
+        logger.debug("Trying to play: %s", abs_audio_path)
+        logger.debug("File exists: %s", os.path.exists(abs_audio_path))
         
         if os.path.exists(abs_audio_path):
             try:
@@ -309,6 +348,8 @@ class KoreanRecorderApp:
             self.result_label.config(text=f"No recording found at: {abs_audio_path}\nRecord something first!")
 
 if __name__ == "__main__":
+    # SUPERSPEECH_LOG_LEVEL=DEBUG shows each step of the evaluation
+    logging.basicConfig(level=os.getenv("SUPERSPEECH_LOG_LEVEL", "WARNING"))
     root = tk.Tk()
     app = KoreanRecorderApp(root)
     root.mainloop()
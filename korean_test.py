@@ -5,7 +5,7 @@ import hashlib
 import requests
 import json
 import wave
-import pyaudio
+from src.recorder import Recorder
 
 # API credentials
 app_key = "175152606100052e"
@@ -22,7 +22,6 @@ audio_sample_rate = 16000
 
 # Recording settings
 CHUNK = 1024
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
 RECORD_SECONDS = 3
@@ -30,13 +29,7 @@ RECORD_SECONDS = 3
 def record_audio():
     """Record audio from microphone"""
     print("Recording Setup...")
-    p = pyaudio.PyAudio()
-    
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK)
+    recorder = Recorder(RATE, CHANNELS, CHUNK, max_seconds=RECORD_SECONDS)
     
     print(f"Say '{ref_text}' (convenience store in Korean) after the countdown!")
     for i in range(3, 0, -1):
@@ -45,24 +38,22 @@ def record_audio():
     
     print("Recording NOW!")
     
-    frames = []
-    
-    for i in range(0, int(RATE / CHUNK * RECORD_SECONDS)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    # PortAudio fills the recorder's buffer from its own thread while we wait
+    recorder.start()
+    time.sleep(RECORD_SECONDS)
+    pcm = recorder.stop()
+    recorder.close()
     
     print("Recording complete!")
-    
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+    if recorder.overflows:
+        print(f"Warning: the input overflowed {recorder.overflows} time(s), some audio was lost")
     
     os.makedirs(os.path.dirname(audio_path), exist_ok=True)
     wf = wave.open(audio_path, 'wb')
     wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
+    wf.setsampwidth(2)
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(pcm)
     wf.close()
     
     print(f"Audio saved to {audio_path}")
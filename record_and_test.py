@@ -1,13 +1,12 @@
 # Record and test your voice with SuperSpeech API
 import os
 import wave
-import pyaudio
 import time
+from src.recorder import Recorder
 from src.speech_api import SuperSpeech
 
 # Audio recording settings
 CHUNK = 1024
-FORMAT = pyaudio.paInt16  # 16-bit format
 CHANNELS = 1  # Mono
 RATE = 16000  # 16kHz sample rate
 RECORD_SECONDS = 3  # Adjust recording length as needed
@@ -21,14 +20,7 @@ REFERENCE_TEXT = "supermarket"  # Change this to what you plan to say!
 def record_audio():
     """Record audio from microphone"""
     print("Recording Setup...")
-    p = pyaudio.PyAudio()
-    
-    # Open stream
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK)
+    recorder = Recorder(RATE, CHANNELS, CHUNK, max_seconds=RECORD_SECONDS)
     
     print(f"Say '{REFERENCE_TEXT}' after the countdown!")
     for i in range(3, 0, -1):
@@ -37,27 +29,23 @@ def record_audio():
     
     print("Recording NOW!")
     
-    frames = []
-    
-    # Record audio in chunks
-    for i in range(0, int(RATE / CHUNK * RECORD_SECONDS)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    # PortAudio fills the recorder's buffer from its own thread while we wait
+    recorder.start()
+    time.sleep(RECORD_SECONDS)
+    pcm = recorder.stop()
+    recorder.close()
     
     print("Recording complete!")
-    
-    # Stop and close the stream
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+    if recorder.overflows:
+        print(f"Warning: the input overflowed {recorder.overflows} time(s), some audio was lost")
     
     # Save the recorded data as a WAV file
     os.makedirs(os.path.dirname(WAVE_OUTPUT_FILENAME), exist_ok=True)
     wf = wave.open(WAVE_OUTPUT_FILENAME, 'wb')
     wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
+    wf.setsampwidth(2)
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(pcm)
     wf.close()
     
     print(f"Audio saved to {WAVE_OUTPUT_FILENAME}")
@@ -1,11 +1,12 @@
 # Record and test Korean pronunciation
 import os
 import wave
-import pyaudio
 import time
 import hashlib
 import requests
 import json
+from src.recorder import Recorder
+from src.vad import detect_speech
 
 # API credentials
 app_key = "175152606100052e"
@@ -15,7 +16,6 @@ user_id = "guest"
 
 # Audio recording settings
 CHUNK = 1024
-FORMAT = pyaudio.paInt16  # 16-bit format
 CHANNELS = 1  # Mono
 RATE = 16000  # 16kHz sample rate
 RECORD_SECONDS = 3  # Adjust recording length as needed
@@ -30,14 +30,7 @@ WAVE_OUTPUT_FILENAME = os.path.join("audio_samples", "korean_word.wav")
 def record_audio():
     """Record audio from microphone"""
     print("Recording Setup...")
-    p = pyaudio.PyAudio()
-    
-    # Open stream
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK)
+    recorder = Recorder(RATE, CHANNELS, CHUNK, max_seconds=RECORD_SECONDS)
     
     print(f"Say the Korean word '{KOREAN_WORD}' (pyeonuijeom) after the countdown!")
     for i in range(3, 0, -1):
@@ -46,27 +39,30 @@ def record_audio():
     
     print("Recording NOW!")
     
-    frames = []
-    
-    # Record audio in chunks
-    for i in range(0, int(RATE / CHUNK * RECORD_SECONDS)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    # PortAudio fills the recorder's buffer from its own thread while we wait
+    recorder.start()
+    time.sleep(RECORD_SECONDS)
+    pcm = recorder.stop()
+    recorder.close()
     
     print("Recording complete!")
+    if recorder.overflows:
+        print(f"Warning: the input overflowed {recorder.overflows} time(s), some audio was lost")
     
-    # Stop and close the stream
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+    # Reject a silent take and trim the silence around the word before saving
+    span = detect_speech(pcm, RATE)
+    if span is None:
+        print("No speech detected. Check that your microphone is working and not muted.")
+        return None
+    print(f"Trimmed {span.bytes_saved} bytes of silence")
     
     # Save the recorded data as a WAV file
     os.makedirs(os.path.dirname(WAVE_OUTPUT_FILENAME), exist_ok=True)
     wf = wave.open(WAVE_OUTPUT_FILENAME, 'wb')
     wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
+    wf.setsampwidth(2)
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(span.speech)
     wf.close()
     
     print(f"Audio saved to {WAVE_OUTPUT_FILENAME}")
@@ -167,6 +163,8 @@ def main():
     
     # Record audio
     audio_file = record_audio()
+    if audio_file is None:
+        return
     
     # First try with Korean characters
     evaluate_korean(audio_file, use_romanized=False)
@@ -1,4 +1,5 @@
 # SuperSpeech package
 from .speech_api import SuperSpeech
+from .async_api import AsyncSuperSpeech
 
-__all__ = ['SuperSpeech']
+__all__ = ['SuperSpeech', 'AsyncSuperSpeech']
@@ -0,0 +1,131 @@
+# Adaptive concurrency control for SuperSpeech
+# Finds how many evaluations the API can take at once: additive increase while
+# responses are fast and clean, multiplicative decrease on overload signals.
+
+import re
+import threading
+import time
+from collections import deque
+
+from .results import EvaluationResult
+
+# Phrases typical of quota and throttling error messages; bare "rate" or "limit"
+# would also match input errors such as "sample rate" or "word limit"
+_RATE_LIMIT_PATTERN = re.compile(r"rate[ _-]?limit|too many requests|quota|frequency", re.IGNORECASE)
+
+
+def is_rate_limited(result, err_ids=()):
+    """Return True if an API result is a rate-limit or quota rejection.
+
+    Args:
+        result (dict or EvaluationResult): Result returned by an evaluate method
+        err_ids (iterable): errId values that always count as rate limiting
+    """
+    if not isinstance(result, (dict, EvaluationResult)) or "errId" not in result:
+        return False
+    return result.get("errId") in err_ids or bool(_RATE_LIMIT_PATTERN.search(str(result.get("error", ""))))
+
+
+class AIMDLimiter:
+    def __init__(self, initial=4, min_limit=1, max_limit=64, increase=1.0, decrease=0.5,
+                 latency_tolerance=2.0, history_size=1000, err_ids=()):
+        """Concurrency limit that adapts to upstream latency and errors.
+
+        Args:
+            initial (int): Starting limit (default: 4)
+            min_limit (int): Lowest the limit may go (default: 1)
+            max_limit (int): Highest the limit may go (default: 64)
+            increase (float): Limit gained per full window of healthy responses (default: 1)
+            decrease (float): Factor applied to the limit on overload (default: 0.5)
+            latency_tolerance (float): A response slower than this multiple of the
+                running average latency counts as a latency spike (default: 2.0)
+            history_size (int): Number of limit changes kept for metrics (default: 1000)
+            err_ids (iterable): errId values that always count as rate limiting, in
+                addition to throttling messages (default: none)
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.history = deque(maxlen=history_size)
+        self.err_ids = frozenset(err_ids)
+
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self._record("initial")
+
+    @property
+    def limit(self):
+        """Current number of requests allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _record(self, reason):
+        self.history.append((time.time(), self.limit, reason))
+
+    def try_acquire(self):
+        """Take a slot if one is free, without waiting."""
+        with self._cond:
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot.
+
+        Returns:
+            bool: True once a slot was taken, False if the timeout expired first
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < self.limit, timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency=None, congested=False):
+        """Free a slot and feed the outcome of the request into the limit.
+
+        Args:
+            latency (float): Seconds the request took (optional)
+            congested (bool): The request hit a timeout, throttling or rate-limit error
+        """
+        with self._cond:
+            well_used = 2 * self._in_flight >= self.limit
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            spike = (latency is not None and self._latency is not None
+                     and latency > self.latency_tolerance * self._latency)
+            if latency is not None:
+                self._latency = latency if self._latency is None else 0.9 * self._latency + 0.1 * latency
+
+            if congested or spike:
+                # One cut per round trip, so a burst of failures from the same
+                # window does not collapse the limit all the way to the floor
+                if now - self._last_decrease >= (self._latency or 0.0):
+                    old_limit = self.limit
+                    self._limit = max(self.min_limit, self._limit * self.decrease)
+                    self._last_decrease = now
+                    if self.limit != old_limit:
+                        self._record("congestion" if congested else "latency")
+            elif well_used:
+                # Only grow while at least half of the current limit is in use
+                old_limit = self.limit
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+                if self.limit != old_limit:
+                    self._record("increase")
+            self._cond.notify_all()
+
+    def stats(self):
+        """Return the current limit, load and average latency."""
+        with self._cond:
+            return {"limit": self.limit, "in_flight": self._in_flight,
+                    "latency": self._latency, "changes": len(self.history)}
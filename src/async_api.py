@@ -0,0 +1,182 @@
+# SuperSpeech asyncio client
+# Same requests and results as SuperSpeech, for event-loop based services.
+
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency, only needed for AsyncSuperSpeech
+    aiohttp = None
+
+from .adaptive import is_rate_limited
+from .audio_source import AudioSource
+from .speech_api import BaseSpeechClient
+
+
+class AsyncSuperSpeech(BaseSpeechClient):
+    def __init__(self, app_key=None, secret_key=None, max_concurrency=10, pool_size=None,
+                 base_url=None, adaptive=None, keys=None, typed_results=False, preflight=True,
+                 normalize_audio=True, compress=None):
+        """Initialize AsyncSuperSpeech with your API credentials.
+
+        Args:
+            app_key (str): Your SpeechSuper application key (optional, defaults to environment variable)
+            secret_key (str): Your SpeechSuper secret key (optional, defaults to environment variable)
+            max_concurrency (int): Maximum number of evaluations in flight at once (default: 10)
+            pool_size (int): Maximum number of pooled connections (default: max_concurrency)
+            base_url (str): API base URL (optional, defaults to https://api.speechsuper.com/)
+            adaptive (AIMDLimiter): Adaptive concurrency limit, applied below max_concurrency and
+                driven by latency, timeouts and rate-limit errors (default: fixed max_concurrency)
+            keys (KeyPool or list): Several credentials to spread requests over (default: one key)
+            typed_results (bool): Return EvaluationResult objects instead of dicts (default: False)
+            preflight (bool): Reject requests the API is known to refuse locally, reading only
+                the WAV header (default: True)
+            normalize_audio (bool): Convert WAV audio to 16 kHz 16-bit mono before uploading it,
+                off the event loop (default: True)
+            compress (str or Encoder): Encode WAV audio before upload, off the event loop:
+                "ogg", "mp3", "auto" or an Encoder (default: None, upload WAV)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSuperSpeech requires aiohttp. Install it with: pip install aiohttp")
+
+        super().__init__(app_key, secret_key, base_url, keys, typed_results, preflight,
+                         normalize_audio, compress)
+
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size or max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.adaptive = adaptive
+        self._adaptive_cond = asyncio.Condition()
+        self._session = None
+
+    def _get_session(self):
+        """Return the pooled session, creating it on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _evaluate(self, audio_path, request, audio_type, audio_sample_rate, report_empty=True):
+        """Run one evaluation under the concurrency limits.
+
+        Returns:
+            dict: Evaluation results, or {"error": ...} on failure
+        """
+        try:
+            source = AudioSource(audio_path, audio_type, audio_sample_rate)
+            # Reads at most the WAV header, cheap enough to do on the loop
+            self._preflight(request, source, audio_type, audio_sample_rate)
+            if self.normalize_audio:
+                # Converting audio is CPU work, so it runs off the loop
+                source, audio_sample_rate = await asyncio.to_thread(
+                    self._prepare_audio, source, audio_type, audio_sample_rate)
+            if self.encoder is not None:
+                source, audio_type = await asyncio.to_thread(self._encode, source, audio_type)
+        except Exception as e:
+            return self._as_result({"error": str(e)})
+        if self.adaptive is not None:
+            async with self._adaptive_cond:
+                await self._adaptive_cond.wait_for(self.adaptive.try_acquire)
+        start = time.monotonic()
+        congested = False
+        key = None
+        outcome = "error"
+        try:
+            if self.keys is not None:
+                key = self.keys.acquire()
+                if key is None:
+                    return self._as_result({"error": "No API key available: every key is out of "
+                                                     f"quota or rejected, retry in {self.keys.retry_after():.1f}s"})
+            params = self._serialize_params(request, audio_type, audio_sample_rate, key)
+            status, text = await self._post(request["coreType"], params, source)
+            if key is not None:
+                outcome = self.keys.outcome(status, text)
+            congested = status in (429, 503)
+            result = self._decode_response(status, text, report_empty)
+            if self.adaptive is not None:
+                congested = congested or is_rate_limited(result, self.adaptive.err_ids)
+            return result
+        except asyncio.TimeoutError as e:
+            congested = True
+            return self._as_result({"error": str(e) or "Request timed out"})
+        except Exception as e:
+            return self._as_result({"error": str(e)})
+        finally:
+            if key is not None:
+                self.keys.release(key, outcome)
+            if self.adaptive is not None:
+                self.adaptive.release(time.monotonic() - start, congested)
+                async with self._adaptive_cond:
+                    self._adaptive_cond.notify_all()
+
+    async def _post(self, core_type, params, source):
+        """Upload the audio with its payload and return (status, text)."""
+        async with self._semaphore:
+            audio_data = await asyncio.to_thread(_read_all, source)
+
+            form = aiohttp.FormData()
+            form.add_field("text", params)
+            form.add_field("audio", audio_data, filename=source.name)
+
+            async with self._get_session().post(self.base_url + core_type, data=form,
+                                                headers={"Request-Index": "0"}) as response:
+                body = await response.read() if self.typed_results else await response.text()
+                return response.status, body
+
+    async def evaluate_pronunciation(self, audio_path, ref_text, core_type="word.eval.promax",
+                                     audio_type="wav", audio_sample_rate=16000):
+        """Evaluate pronunciation using SpeechSuper API.
+
+        Args:
+            audio_path: Path to the audio file, or the audio itself as WAV/PCM bytes,
+                a buffer, a binary file-like object or an int16 NumPy array
+            ref_text (str): Reference text for evaluation
+            core_type (str): API evaluation type (default: word.eval.promax)
+            audio_type (str): Audio file format (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+
+        Returns:
+            dict: Evaluation results from the API
+        """
+        request = self._pronunciation_request(ref_text, core_type)
+        return await self._evaluate(audio_path, request, audio_type, audio_sample_rate)
+
+    async def evaluate_spontaneous_speech(self, audio_path, question_prompt,
+                                          test_type="ielts", model="non_native",
+                                          penalize_offtopic=1, audio_type="wav",
+                                          audio_sample_rate=16000):
+        """Evaluate spontaneous speech using SpeechSuper API.
+
+        Args:
+            audio_path: Path to the audio file, or the audio itself (see evaluate_pronunciation)
+            question_prompt (str): Question prompt for scoring relevance
+            test_type (str): Test type (default: ielts)
+            model (str): Transcription model (default: non_native)
+            penalize_offtopic (int): Whether to penalize off-topic responses (default: 1)
+            audio_type (str): Audio file format (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+
+        Returns:
+            dict: Evaluation results from the API
+        """
+        request = self._spontaneous_request(question_prompt, test_type, model, penalize_offtopic)
+        return await self._evaluate(audio_path, request, audio_type, audio_sample_rate,
+                                    report_empty=False)
+
+
+def _read_all(source):
+    with source.open() as audio_file:
+        return audio_file.read()
@@ -0,0 +1,251 @@
+# SuperSpeech audio sources
+# Lets the evaluate methods take a file path, WAV/PCM bytes, any buffer,
+# a file-like object or an int16 NumPy array, without copying the samples.
+
+import io
+import os
+import struct
+from collections import namedtuple
+
+# Format of a WAV file as read from its header. duration is in seconds, format is
+# WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT, and the samples are the data_size bytes
+# starting data_offset bytes into the file.
+WavInfo = namedtuple("WavInfo", ["sample_rate", "channels", "sample_width", "duration",
+                                 "format", "data_offset", "data_size"])
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def wav_header(data_size, sample_rate=16000, channels=1, sample_width=2):
+    """Build a 44-byte PCM WAV header for data_size bytes of samples."""
+    byte_rate = sample_rate * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, channels * sample_width, sample_width * 8,
+        b"data", data_size
+    )
+
+
+class _BufferReader(io.RawIOBase):
+    """Read-only file object over a sequence of buffers, served without joining them."""
+
+    def __init__(self, parts):
+        super().__init__()
+        self._parts = parts
+        self._part = 0
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        target = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(target) and self._part < len(self._parts):
+            part = self._parts[self._part]
+            count = min(len(target) - written, len(part) - self._offset)
+            target[written:written + count] = part[self._offset:self._offset + count]
+            written += count
+            self._offset += count
+            if self._offset == len(part):
+                self._part += 1
+                self._offset = 0
+        return written
+
+
+class AudioSource:
+    def __init__(self, audio, audio_type="wav", sample_rate=16000):
+        """Wrap any supported audio input.
+
+        Args:
+            audio: One of
+                - a file path (str or os.PathLike)
+                - WAV bytes, or raw 16-bit PCM bytes (bytes, bytearray, memoryview, other buffers)
+                - a binary file-like object
+                - a 1-D (or single-channel 2-D) int16 NumPy array of samples
+            audio_type (str): Audio format declared to the API (default: wav)
+            sample_rate (int): Sample rate used when raw PCM needs a WAV header (default: 16000)
+
+        Raw PCM and NumPy samples are given a WAV header when audio_type is "wav";
+        the samples themselves are never copied. Non-seekable streams are read into
+        memory once, since they have to be both hashed and uploaded.
+        """
+        self.audio_type = audio_type
+        self.path = None
+        self.name = "audio." + audio_type
+        self._parts = None
+        self._stream = None
+        self._start = 0
+
+        if isinstance(audio, (str, os.PathLike)):
+            self.path = os.fspath(audio)
+            self.name = os.path.basename(self.path)
+        elif hasattr(audio, "read"):
+            self._init_stream(audio)
+        else:
+            self._init_buffer(_as_bytes_view(audio), audio_type, sample_rate)
+
+    def _init_stream(self, stream):
+        seekable = getattr(stream, "seekable", None)
+        if seekable is not None and seekable():
+            self._start = stream.tell()
+            self._stream = stream
+        else:
+            self._parts = [memoryview(stream.read())]
+        name = getattr(stream, "name", None)
+        if isinstance(name, str):
+            self.name = os.path.basename(name)
+
+    def _init_buffer(self, view, audio_type, sample_rate):
+        is_wav = len(view) >= 12 and view[:4] == b"RIFF" and view[8:12] == b"WAVE"
+        if audio_type == "wav" and not is_wav:
+            self._parts = [memoryview(wav_header(len(view), sample_rate)), view]
+        else:
+            self._parts = [view]
+
+    @property
+    def size(self):
+        """Total upload size in bytes."""
+        if self.path is not None:
+            return os.path.getsize(self.path)
+        if self._parts is not None:
+            return sum(len(part) for part in self._parts)
+        end = self._stream.seek(0, io.SEEK_END)
+        self._stream.seek(self._start)
+        return end - self._start
+
+    @property
+    def shareable(self):
+        """True if several uploads of this audio may run at the same time."""
+        return self._stream is None
+
+    def open(self):
+        """Return a file object positioned at the start of the audio.
+
+        Use it as a context manager; streams passed in by the caller are rewound
+        but left open.
+        """
+        if self.path is not None:
+            return open(self.path, 'rb')
+        if self._parts is not None:
+            return _BufferReader(self._parts)
+        self._stream.seek(self._start)
+        return _Borrowed(self._stream)
+
+    def wav_info(self):
+        """Read the format of WAV audio from its header, without reading the samples.
+
+        Returns:
+            WavInfo: Format and duration, or None if the audio does not start with a
+            RIFF/WAVE header
+
+        Raises:
+            ValueError: If the header is truncated or has no fmt or data chunk
+        """
+        with self.open() as audio_file:
+            return read_wav_header(audio_file, self.size)
+
+    def blocks(self, block_size=1024 * 1024):
+        """Yield the audio as consecutive bytes-like blocks, for hashing."""
+        if self._parts is not None:
+            for part in self._parts:
+                for offset in range(0, len(part), block_size):
+                    yield part[offset:offset + block_size]
+            return
+        with self.open() as audio_file:
+            for block in iter(lambda: audio_file.read(block_size), b''):
+                yield block
+
+
+class _Borrowed:
+    """Context manager around a caller-owned stream that must not be closed."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __enter__(self):
+        return self._stream
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+def read_wav_header(audio_file, total_size=None):
+    """Parse a WAV header, leaving audio_file positioned at the first sample.
+
+    Args:
+        audio_file: Binary file object positioned at the start of the WAV data
+        total_size (int): Size of the whole file, to bound a placeholder data size (optional)
+
+    Returns:
+        WavInfo: Format and duration, or None if the data does not start with a
+        RIFF/WAVE header
+
+    Raises:
+        ValueError: If the header is truncated or has no fmt or data chunk
+    """
+    head = _read_exactly(audio_file, 12)
+    if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    offset = 12
+    fmt = None
+    while True:
+        chunk_id, chunk_size = struct.unpack("<4sI", _read_exactly(audio_file, 8))
+        offset += 8
+        if chunk_id == b"data":
+            break
+        padded = chunk_size + (chunk_size & 1)
+        if chunk_id == b"fmt ":
+            body = _read_exactly(audio_file, min(padded, 40))
+            fmt = struct.unpack("<HHIIHH", body[:16])
+            if fmt[0] == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                # The real format is the first two bytes of the SubFormat GUID
+                fmt = (struct.unpack("<H", body[24:26])[0],) + fmt[1:]
+            _skip(audio_file, padded - len(body))
+        else:
+            _skip(audio_file, padded)
+        offset += padded
+    if fmt is None:
+        raise ValueError("WAV header has no fmt chunk before the data")
+    format_tag, channels, sample_rate, byte_rate, _, bits = fmt
+    data_size = chunk_size
+    if total_size is not None:
+        # Streamed recordings may carry a placeholder size; the real end is the end of the audio
+        data_size = min(data_size, total_size - offset)
+    duration = data_size / byte_rate if byte_rate else 0.0
+    return WavInfo(sample_rate, channels, (bits + 7) // 8, duration, format_tag, offset, data_size)
+
+
+def _read_exactly(audio_file, size):
+    data = audio_file.read(size)
+    if not isinstance(data, (bytes, bytearray)) or len(data) < size:
+        raise ValueError("WAV header is truncated")
+    return data
+
+
+def _skip(audio_file, size):
+    """Move past size bytes of a file object that may not be seekable."""
+    seekable = getattr(audio_file, "seekable", None)
+    if seekable is not None and seekable():
+        audio_file.seek(size, io.SEEK_CUR)
+    else:
+        _read_exactly(audio_file, size)
+
+
+def _as_bytes_view(audio):
+    """Return a flat byte view of a buffer or int16 array without copying it."""
+    dtype = getattr(audio, "dtype", None)
+    if dtype is not None:
+        if dtype.kind != "i" or dtype.itemsize != 2:
+            raise ValueError(f"NumPy audio must be int16 samples, got {dtype}")
+        if audio.ndim == 2 and audio.shape[1] == 1:
+            audio = audio[:, 0]
+        if audio.ndim != 1:
+            raise ValueError(f"NumPy audio must be mono, got shape {audio.shape}")
+    view = memoryview(audio)
+    if not view.c_contiguous:
+        raise ValueError("Audio buffer must be contiguous")
+    return view.cast("B") if view.format != "B" or view.ndim != 1 else view
@@ -0,0 +1,144 @@
+# SuperSpeech result cache
+# Persists evaluation results on disk, keyed by the audio content and the
+# request parameters, so re-scoring the same recording skips the API call.
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .audio_source import AudioSource
+from .results import EvaluationResult
+
+
+def cache_key(audio, request, audio_params):
+    """Build a content-addressed cache key for an evaluation.
+
+    Args:
+        audio (AudioSource or str): The audio being evaluated, or a path to it
+        request (dict): The "request" section of the payload (coreType, refText, ...)
+        audio_params (dict): The "audio" section of the payload (audioType, sampleRate, ...)
+
+    Returns:
+        str: Hex SHA-256 digest identifying the evaluation
+    """
+    if not isinstance(audio, AudioSource):
+        audio = AudioSource(audio)
+    digest = hashlib.sha256()
+    for block in audio.blocks():
+        digest.update(block)
+    # tokenId only labels the request, it does not change the result
+    fields = {k: v for k, v in request.items() if k != "tokenId"}
+    digest.update(json.dumps([fields, audio_params], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path="superspeech_cache.sqlite", max_entries=None, max_bytes=None, ttl=None):
+        """Open (or create) an on-disk result cache.
+
+        Args:
+            path (str): SQLite database file, or ":memory:" (default: superspeech_cache.sqlite)
+            max_entries (int): Evict least recently used results above this count (default: no limit)
+            max_bytes (int): Evict least recently used results above this total size (default: no limit)
+            ttl (float): Seconds a result stays valid (default: forever)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+
+    def get(self, key):
+        """Return the cached result for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """Store a result. Error responses are never cached.
+
+        Returns:
+            bool: True if the result was stored
+        """
+        if isinstance(result, EvaluationResult):
+            if not result.ok:
+                return False
+            value = result.body.decode("utf-8")
+        elif not isinstance(result, dict) or "error" in result:
+            return False
+        else:
+            value = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self._evict(now)
+            self._db.commit()
+        return True
+
+    def _evict(self, now):
+        """Drop expired results, then least recently used ones until under the limits."""
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        if self.max_entries is not None:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if self.max_bytes is not None:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._db.execute("SELECT key, size FROM results ORDER BY accessed, rowid").fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    total -= size
+
+    def clear(self):
+        """Remove every cached result."""
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,331 @@
+# Out-of-process audio capture for SuperSpeech
+# Reads the microphone in a child process that writes into a shared-memory ring
+# buffer, so a busy main process (GIL held by JSON, requests, Tk) cannot cause gaps.
+
+import logging
+import multiprocessing
+import struct
+import time
+from array import array
+from multiprocessing import shared_memory
+
+try:
+    import pyaudio
+except ImportError:  # optional dependency, only needed to record from a microphone
+    pyaudio = None
+
+from .recorder import PA_CONTINUE, PA_INPUT_OVERFLOW, PA_INT16
+
+logger = logging.getLogger(__name__)
+
+# Counters at the start of the shared memory, written by the capture process:
+# bytes written, bytes dropped at the cap, input overflows, late chunks, chunks,
+# monotonic time of the last write, longest interval between chunks (seconds)
+_HEADER = struct.Struct("<qqqqqdd")
+
+# A chunk arriving this many chunk durations after the previous one is late
+_LATE_FACTOR = 1.5
+
+
+class MicrophoneSource:
+    def __init__(self, sample_rate=16000, channels=1, chunk=1024):
+        """16-bit PCM from the default input device, read with PyAudio in callback mode.
+
+        Args:
+            sample_rate (int): Sample rate in Hz (default: 16000)
+            channels (int): Number of channels (default: 1)
+            chunk (int): Frames per callback (default: 1024)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk = chunk
+
+    def run(self, write, stop):
+        """Capture until stop is set, passing each chunk to write(data, status_flags)."""
+        if pyaudio is None:
+            raise ImportError("Recording requires pyaudio. Install it with: pip install pyaudio")
+
+        def callback(in_data, frame_count, time_info, status_flags):
+            write(in_data, status_flags)
+            return None, PA_CONTINUE
+        audio = pyaudio.PyAudio()
+        try:
+            stream = audio.open(format=PA_INT16, channels=self.channels, rate=self.sample_rate,
+                                input=True, frames_per_buffer=self.chunk, stream_callback=callback)
+            stop.wait()
+            stream.stop_stream()
+            stream.close()
+        finally:
+            audio.terminate()
+
+
+class SyntheticSource:
+    def __init__(self, sample_rate=16000, channels=1, chunk=160):
+        """Stand-in for the microphone in tests and benchmarks.
+
+        Delivers chunks in real time, each sample being its index in the take
+        (wrapping at 16 bits), so readers can check nothing was lost or reordered.
+
+        Args:
+            sample_rate (int): Sample rate in Hz (default: 16000)
+            channels (int): Number of channels (default: 1)
+            chunk (int): Frames per chunk (default: 160, i.e. 10 ms at 16 kHz)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk = chunk
+
+    def run(self, write, stop):
+        count = self.chunk * self.channels
+        interval = self.chunk / self.sample_rate
+        index = 0
+        deadline = time.monotonic()
+        while not stop.is_set():
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            write(array("h", (((index + i + 32768) & 0xFFFF) - 32768 for i in range(count))), 0)
+            index += count
+
+
+class _RingWriter:
+    """Capture-process side of the ring: copies chunks in and updates the counters."""
+
+    def __init__(self, buffer, capacity, overwrite, bytes_per_second):
+        self.header = buffer[:_HEADER.size]
+        self.data = buffer[_HEADER.size:_HEADER.size + capacity]
+        self.capacity = capacity
+        self.overwrite = overwrite
+        self.bytes_per_second = bytes_per_second
+
+    def write(self, chunk, status_flags=0):
+        now = time.monotonic()
+        written, dropped, overflows, late, chunks, last_time, max_gap = _HEADER.unpack_from(self.header)
+        view = memoryview(chunk).cast("B")
+        size = len(view)
+        if not self.overwrite:
+            count = min(size, self.capacity - written)
+            self.data[written:written + count] = view[:count]
+            dropped += size - count
+            written += count
+        elif size:
+            if size > self.capacity:
+                written += size - self.capacity
+                view = view[size - self.capacity:]
+                size = self.capacity
+            position = written % self.capacity
+            first = min(size, self.capacity - position)
+            self.data[position:position + first] = view[:first]
+            self.data[:size - first] = view[first:size]
+            written += size
+        if status_flags & PA_INPUT_OVERFLOW:
+            overflows += 1
+        if chunks:
+            gap = now - last_time
+            max_gap = max(max_gap, gap)
+            if gap > _LATE_FACTOR * len(view) / self.bytes_per_second:
+                late += 1
+        # The samples are in place before the counters announce them
+        _HEADER.pack_into(self.header, 0, written, dropped, overflows, late, chunks + 1, now, max_gap)
+
+
+def _capture_main(name, capacity, overwrite, source, start, stop, idle, shutdown):
+    """Entry point of the capture process."""
+    memory = shared_memory.SharedMemory(name=name)
+    writer = _RingWriter(memory.buf, capacity, overwrite, source.sample_rate * source.channels * 2)
+    try:
+        idle.set()
+        while not shutdown.is_set():
+            if not start.wait(0.1):
+                continue
+            start.clear()
+            try:
+                source.run(writer.write, stop)
+            except Exception as e:
+                logger.error("Capture failed: %s", e)
+            finally:
+                idle.set()
+    finally:
+        writer.header.release()
+        writer.data.release()
+        memory.close()
+
+
+class CaptureProcess:
+    def __init__(self, source=None, max_seconds=90.0, overwrite=False, ready_timeout=10.0):
+        """Capture audio in a child process into shared memory.
+
+        The child process owns the audio device and copies every chunk into a
+        ring buffer of max_seconds in shared memory; the main process reads it
+        in place. Once a take fills the buffer, further audio is dropped, or
+        with overwrite=True the oldest audio is overwritten.
+
+        Args:
+            source: MicrophoneSource or SyntheticSource; it is pickled to the
+                child process (default: MicrophoneSource())
+            max_seconds (float): Capacity of the buffer (default: 90.0, the API limit)
+            overwrite (bool): Keep capturing past max_seconds, overwriting the oldest
+                audio (default: False)
+            ready_timeout (float): Seconds to wait for the child process to start (default: 10)
+
+        Raises:
+            RuntimeError: If the capture process does not start in time
+        """
+        self.source = source or MicrophoneSource()
+        self.sample_rate = self.source.sample_rate
+        self.frame_bytes = 2 * self.source.channels
+        self.capacity = int(max_seconds * self.sample_rate) * self.frame_bytes
+        self.overwrite = overwrite
+        self.latency = None
+        self.max_latency = 0.0
+        self.overruns = 0
+        self._read = 0
+        self._shared = shared_memory.SharedMemory(create=True, size=_HEADER.size + self.capacity)
+        self._header = self._shared.buf[:_HEADER.size]
+        self._data = self._shared.buf[_HEADER.size:_HEADER.size + self.capacity]
+        self._reset()
+
+        # Spawn rather than fork, so the child does not inherit Tk or client threads
+        context = multiprocessing.get_context("spawn")
+        self._start, self._stop, self._idle, self._shutdown = (context.Event() for _ in range(4))
+        self._process = context.Process(
+            target=_capture_main, name="superspeech-capture", daemon=True,
+            args=(self._shared.name, self.capacity, overwrite, self.source,
+                  self._start, self._stop, self._idle, self._shutdown))
+        self._process.start()
+        if not self._idle.wait(ready_timeout):
+            self.close()
+            raise RuntimeError("Capture process did not start")
+        self.recording = False
+
+    def _reset(self):
+        _HEADER.pack_into(self._header, 0, 0, 0, 0, 0, 0, 0.0, 0.0)
+        self._read = 0
+        self.latency = None
+        self.max_latency = 0.0
+        self.overruns = 0
+
+    def _wait_idle(self):
+        while not self._idle.wait(0.1):
+            if not self._process.is_alive():
+                self.recording = False
+                raise RuntimeError("Capture process exited")
+
+    def _counters(self):
+        return _HEADER.unpack_from(self._header)
+
+    def start(self):
+        """Start a new take, reusing the buffer of the previous one."""
+        if self.recording:
+            raise RuntimeError("Capture is already recording")
+        self._wait_idle()
+        self._reset()
+        self._stop.clear()
+        self._idle.clear()
+        self._start.set()
+        self.recording = True
+        return self
+
+    def stop(self):
+        """End the take once the capture process has stopped writing.
+
+        Returns:
+            The take, as returned by data()
+        """
+        if self.recording:
+            self._stop.set()
+            self._wait_idle()
+            self.recording = False
+        stats = self.stats()
+        if stats["overflows"] or stats["late_chunks"] or stats["dropped_frames"]:
+            logger.debug("Capture: %s", stats)
+        return self.data()
+
+    def read(self):
+        """Audio captured since the previous read, as a view of the shared buffer.
+
+        At most the part up to the end of the ring is returned; call again for
+        the rest. Views stay valid until the same part of the ring is written
+        again, which without overwrite=True is not before the next start().
+
+        Returns:
+            memoryview: New 16-bit PCM, empty if there is none
+        """
+        written, _, _, _, chunks, last_time, _ = self._counters()
+        if chunks:
+            self.latency = time.monotonic() - last_time
+            self.max_latency = max(self.max_latency, self.latency)
+        if written - self._read > self.capacity:
+            # The capture process lapped us; the oldest unread audio is gone
+            self.overruns += (written - self.capacity - self._read) // self.frame_bytes
+            self._read = written - self.capacity
+        position = self._read % self.capacity
+        end = min(written - self._read, self.capacity - position)
+        self._read += end
+        return self._data[position:position + end]
+
+    def data(self):
+        """The take as one contiguous buffer of 16-bit PCM.
+
+        Unless overwrite=True and the ring wrapped around, this is a view of the
+        shared memory, valid until the next start().
+
+        Returns:
+            memoryview or bytearray: The captured samples
+        """
+        written = self._counters()[0]
+        if written <= self.capacity:
+            return self._data[:written]
+        position = written % self.capacity
+        output = bytearray(self.capacity)
+        output[:self.capacity - position] = self._data[position:]
+        output[self.capacity - position:] = self._data[:position]
+        return output
+
+    def stats(self):
+        """Capture health counters.
+
+        Returns:
+            dict: "frames" captured, "dropped_frames" (over max_seconds),
+                "overrun_frames" (overwritten before read()), "overflows" (input
+                overflows reported by PortAudio), "late_chunks" (chunks arriving more
+                than 1.5 chunk durations after the previous one), "max_gap" (longest
+                interval between chunks, seconds), and "latency"/"max_latency"
+                (age of the newest audio at the last/slowest read(), seconds)
+        """
+        written, dropped, overflows, late, chunks, _, max_gap = self._counters()
+        return {"frames": min(written, self.capacity) // self.frame_bytes,
+                "dropped_frames": dropped // self.frame_bytes,
+                "overrun_frames": self.overruns,
+                "overflows": overflows,
+                "late_chunks": late,
+                "max_gap": max_gap,
+                "latency": self.latency,
+                "max_latency": self.max_latency}
+
+    def close(self):
+        """Stop the capture process and free the shared memory.
+
+        Views returned by read() and data() must be released first.
+        """
+        if self._process.is_alive():
+            self._stop.set()
+            self._shutdown.set()
+            self._process.join(5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self.recording = False
+        self._header.release()
+        self._data.release()
+        try:
+            self._shared.close()
+        except BufferError:
+            logger.debug("Shared capture buffer still in use; it is freed when the last view is")
+        self._shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,143 @@
+# Core type registry for SuperSpeech
+# Describes what each SpeechSuper evaluation type accepts, so requests the API
+# would reject are caught locally before any audio is uploaded.
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PreflightError(ValueError):
+    """A request that the API would reject, found before sending it."""
+
+
+class CoreType:
+    def __init__(self, name, required=("refText",), max_duration=90.0, sample_rates=(16000,),
+                 channels=(1,), sample_widths=(2,), single_word=False, max_text_length=None):
+        """Limits of one evaluation type.
+
+        Args:
+            name (str): Core type, e.g. "word.eval.kr"
+            required (tuple): Request fields that must be present and non-empty (default: refText)
+            max_duration (float): Longest accepted audio in seconds (default: 90)
+            sample_rates (tuple): Accepted sample rates in Hz (default: 16000 only)
+            channels (tuple): Accepted channel counts (default: mono only)
+            sample_widths (tuple): Accepted bytes per sample (default: 16-bit only)
+            single_word (bool): refText must be exactly one word (default: False)
+            max_text_length (int): Longest accepted refText in characters (default: no limit)
+        """
+        self.name = name
+        self.required = tuple(required)
+        self.max_duration = max_duration
+        self.sample_rates = tuple(sample_rates)
+        self.channels = tuple(channels)
+        self.sample_widths = tuple(sample_widths)
+        self.single_word = single_word
+        self.max_text_length = max_text_length
+
+    def check_request(self, request):
+        """Raise PreflightError if the request fields cannot be accepted."""
+        for field in self.required:
+            value = request.get(field)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                raise PreflightError(f"{self.name} requires a non-empty {field}")
+        ref_text = request.get("refText")
+        if isinstance(ref_text, str):
+            if self.single_word and len(ref_text.split()) > 1:
+                raise PreflightError(f"{self.name} evaluates a single word, got {len(ref_text.split())} "
+                                     f"words in refText {ref_text!r}; use a sentence core type")
+            if self.max_text_length is not None and len(ref_text) > self.max_text_length:
+                raise PreflightError(f"{self.name} accepts a refText of at most {self.max_text_length} "
+                                     f"characters, got {len(ref_text)}")
+
+    def check_audio(self, sample_rate, info=None, convert=False):
+        """Raise PreflightError if the declared rate or the WAV header cannot be accepted.
+
+        Args:
+            sample_rate (int): Sample rate declared in the request
+            info (WavInfo): Parsed WAV header, if the audio is a readable WAV (optional)
+            convert (bool): The WAV will be converted to 16 kHz 16-bit mono before upload,
+                so only its duration is checked (default: False)
+        """
+        if convert and info is not None:
+            self._check_duration(info)
+            return
+        if sample_rate not in self.sample_rates:
+            raise PreflightError(f"{self.name} accepts sample rates {_join(self.sample_rates)} Hz, "
+                                 f"got {sample_rate} Hz")
+        if info is None:
+            return
+        if info.sample_rate != sample_rate:
+            raise PreflightError(f"Audio is recorded at {info.sample_rate} Hz but the request "
+                                 f"declares {sample_rate} Hz")
+        if info.channels not in self.channels:
+            raise PreflightError(f"{self.name} accepts {_join(self.channels)}-channel audio, "
+                                 f"got {info.channels} channels")
+        if info.sample_width not in self.sample_widths:
+            raise PreflightError(f"{self.name} accepts {_join(w * 8 for w in self.sample_widths)}-bit "
+                                 f"audio, got {info.sample_width * 8}-bit")
+        self._check_duration(info)
+
+    def _check_duration(self, info):
+        if self.max_duration is not None and info.duration > self.max_duration:
+            raise PreflightError(f"{self.name} accepts at most {self.max_duration:g} seconds of audio, "
+                                 f"got {info.duration:.1f} seconds")
+
+    def __repr__(self):
+        return f"CoreType({self.name!r})"
+
+
+def _join(values):
+    return "/".join(str(value) for value in values)
+
+
+CORE_TYPES = {}
+
+
+def register(core_type):
+    """Add or replace a core type in the registry."""
+    CORE_TYPES[core_type.name] = core_type
+    return core_type
+
+
+def get_core_type(name):
+    """Return the registered CoreType for a name, or None if it is not described."""
+    return CORE_TYPES.get(name)
+
+
+register(CoreType("word.eval.kr", single_word=True))
+register(CoreType("sent.eval.kr"))
+register(CoreType("word.eval.promax", single_word=True))
+register(CoreType("sent.eval.promax"))
+register(CoreType("speak.eval.pro", required=("questionPrompt", "testType")))
+
+
+def preflight(request, source=None, audio_type="wav", sample_rate=16000, convert=False):
+    """Check a request and its audio against the registry without uploading anything.
+
+    Only the WAV header of the audio is read, so the check is meant to run before
+    any conversion. Core types missing from the registry, and audio whose header
+    cannot be parsed, are let through for the API to judge.
+
+    Args:
+        request (dict): The "request" section (coreType, refText, ...)
+        source (AudioSource): The audio to be uploaded (optional)
+        audio_type (str): Audio format declared to the API (default: wav)
+        sample_rate (int): Sample rate declared to the API (default: 16000)
+        convert (bool): WAV audio will be converted to 16 kHz 16-bit mono before upload,
+            so its own rate, channels and sample format do not matter (default: False)
+
+    Raises:
+        PreflightError: If the API would reject the request
+    """
+    core_type = get_core_type(request.get("coreType"))
+    if core_type is None:
+        return
+    core_type.check_request(request)
+    info = None
+    if source is not None and audio_type == "wav":
+        try:
+            info = source.wav_info()
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug("Skipping the audio preflight, WAV header unreadable: %s", e)
+    core_type.check_audio(sample_rate, info, convert)
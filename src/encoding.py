@@ -0,0 +1,149 @@
+# Compressed uploads for SuperSpeech
+# Encodes 16-bit mono WAV recordings to a compressed format the API accepts
+# (OGG Vorbis or MP3) before upload, so fewer bytes go over the wire.
+
+import io
+import logging
+import shutil
+import subprocess
+
+try:
+    import numpy as np
+    import soundfile
+except ImportError:  # optional dependency, one of the two encoder backends
+    soundfile = None
+
+from .audio_source import AudioSource, WAVE_FORMAT_PCM, read_wav_header
+
+logger = logging.getLogger(__name__)
+
+# Compressed formats the API accepts, most preferred first. FLAC is not accepted.
+ACCEPTED_FORMATS = ("ogg", "mp3")
+
+
+class Encoder:
+    """Turns 16-bit mono PCM into one compressed audio format.
+
+    Subclasses set audio_type (the value declared to the API) and implement
+    available() and encode().
+    """
+
+    audio_type = None
+
+    def available(self):
+        """True if the encoder can run in this environment."""
+        raise NotImplementedError
+
+    def encode(self, pcm, sample_rate):
+        """Encode little-endian 16-bit mono samples.
+
+        Args:
+            pcm (bytes-like): Samples
+            sample_rate (int): Sample rate in Hz
+
+        Returns:
+            bytes: The encoded file
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.audio_type!r})"
+
+
+class SoundFileEncoder(Encoder):
+    _FORMATS = {"ogg": ("OGG", "VORBIS"), "mp3": ("MP3", "MPEG_LAYER_III")}
+
+    def __init__(self, audio_type="ogg"):
+        """In-process encoder on libsndfile (the soundfile package).
+
+        Args:
+            audio_type (str): "ogg" or "mp3"; MP3 needs libsndfile 1.1 or later (default: ogg)
+        """
+        if audio_type not in self._FORMATS:
+            raise ValueError(f"SoundFileEncoder cannot write {audio_type!r}")
+        self.audio_type = audio_type
+
+    def available(self):
+        if soundfile is None:
+            return False
+        container, subtype = self._FORMATS[self.audio_type]
+        return container in soundfile.available_formats() and subtype in soundfile.available_subtypes(container)
+
+    def encode(self, pcm, sample_rate):
+        container, subtype = self._FORMATS[self.audio_type]
+        output = io.BytesIO()
+        soundfile.write(output, np.frombuffer(pcm, dtype="<i2"), sample_rate,
+                        format=container, subtype=subtype)
+        return output.getvalue()
+
+
+class FFmpegEncoder(Encoder):
+    _ARGS = {"ogg": ["-c:a", "libvorbis", "-q:a", "4", "-f", "ogg"],
+             "mp3": ["-c:a", "libmp3lame", "-b:a", "48k", "-f", "mp3"]}
+
+    def __init__(self, audio_type="ogg", executable="ffmpeg"):
+        """Encoder that pipes the samples through an ffmpeg process.
+
+        Args:
+            audio_type (str): "ogg" or "mp3" (default: ogg)
+            executable (str): ffmpeg command or path (default: ffmpeg)
+        """
+        if audio_type not in self._ARGS:
+            raise ValueError(f"FFmpegEncoder cannot write {audio_type!r}")
+        self.audio_type = audio_type
+        self.executable = executable
+
+    def available(self):
+        return shutil.which(self.executable) is not None
+
+    def encode(self, pcm, sample_rate):
+        command = [self.executable, "-hide_banner", "-loglevel", "error", "-f", "s16le",
+                   "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"] + self._ARGS[self.audio_type] + ["pipe:1"]
+        process = subprocess.run(command, input=bytes(pcm), capture_output=True, check=False)
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {process.stderr.decode('utf-8', 'replace').strip()}")
+        return process.stdout
+
+
+def pick_encoder(compress="auto"):
+    """Return an available Encoder for a compress setting.
+
+    Args:
+        compress: An Encoder, one of ACCEPTED_FORMATS, or "auto" for the first
+            format some backend can write (default: auto)
+
+    Raises:
+        ImportError: If no backend can write the requested format
+        ValueError: If the format is not one the API accepts
+    """
+    if isinstance(compress, Encoder):
+        return compress
+    if compress != "auto" and compress not in ACCEPTED_FORMATS:
+        raise ValueError(f"Cannot upload {compress!r}: the API accepts {', '.join(ACCEPTED_FORMATS)} "
+                         "as compressed formats")
+    for audio_type in (ACCEPTED_FORMATS if compress == "auto" else (compress,)):
+        for encoder in (SoundFileEncoder(audio_type), FFmpegEncoder(audio_type)):
+            if encoder.available():
+                return encoder
+    raise ImportError("Compressed uploads need the soundfile package or ffmpeg on the PATH. "
+                      "Install it with: pip install soundfile")
+
+
+def encode_source(encoder, source):
+    """Encode 16-bit mono WAV audio.
+
+    Args:
+        encoder (Encoder): Encoder to use
+        source (AudioSource): The audio
+
+    Returns:
+        AudioSource: The encoded audio, or None if the audio is not 16-bit mono PCM WAV
+    """
+    with source.open() as audio_file:
+        info = read_wav_header(audio_file, source.size)
+        if info is None or info.format != WAVE_FORMAT_PCM or info.channels != 1 or info.sample_width != 2:
+            return None
+        pcm = audio_file.read(info.data_size)
+    encoded = encoder.encode(pcm, info.sample_rate)
+    logger.debug("Encoded %d bytes of PCM to %d bytes of %s", len(pcm), len(encoded), encoder.audio_type)
+    return AudioSource(encoded, encoder.audio_type)
@@ -9,7 +9,8 @@ from src.speech_api import SuperSpeech
 
 # Create a SuperSpeech instance with default API keys
 # You can also provide your own keys: SuperSpeech(app_key="your_key", secret_key="your_secret")
-api = SuperSpeech()
+# typed_results=True returns EvaluationResult objects with attribute access
+api = SuperSpeech(typed_results=True)
 
 def evaluate_word():
     """Example of evaluating a single word pronunciation"""
@@ -31,23 +32,19 @@ def evaluate_word():
     print("===== Word Pronunciation Evaluation =====")
     print(f"Word: {ref_text}")
     
-    if "result" in result:
-        overall_score = result["result"]["overall"]
-        pronunciation_score = result["result"]["pronunciation"]
-        print(f"Overall Score: {overall_score}")
-        print(f"Pronunciation Score: {pronunciation_score}")
+    if result.ok:
+        print(f"Overall Score: {result.overall}")
+        print(f"Pronunciation Score: {result.pronunciation}")
         
         # Print phoneme details
         print("\nPhoneme Details:")
-        if "words" in result["result"] and result["result"]["words"]:
-            word = result["result"]["words"][0]
-            if "phonics" in word:
-                for phoneme_data in word["phonics"][0]:
-                    print(f"  Phoneme: {phoneme_data['phoneme']}, " 
-                          f"Spell: {phoneme_data['spell']}, "
-                          f"Score: {phoneme_data['overall']}")
+        if result.words:
+            for phonic in result.words[0].phonics:
+                print(f"  Phoneme: {phonic.phoneme}, " 
+                      f"Spell: {phonic.spell}, "
+                      f"Score: {phonic.score}")
     else:
-        print("Error in evaluation:", result.get("error", "Unknown error"))
+        print("Error in evaluation:", result.error)
 
 def evaluate_sentence():
     """Example of evaluating a sentence pronunciation"""
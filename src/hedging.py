@@ -0,0 +1,65 @@
+# Hedged requests for SuperSpeech
+# When a call runs longer than most recent calls did, a duplicate is sent and
+# whichever answers first wins, trading a little extra load for a shorter tail.
+
+import threading
+from collections import deque
+
+
+class HedgePolicy:
+    def __init__(self, percentile=0.95, min_samples=20, window=200, max_extra_ratio=0.1,
+                 min_delay=0.05):
+        """Decide when to send a duplicate request, within a load budget.
+
+        Args:
+            percentile (float): Send the duplicate once a call has run longer than this
+                percentile of recent latencies (default: 0.95)
+            min_samples (int): Recent latencies needed before hedging starts (default: 20)
+            window (int): Number of recent latencies considered (default: 200)
+            max_extra_ratio (float): Maximum duplicates as a fraction of all calls (default: 0.1)
+            min_delay (float): Never hedge earlier than this many seconds (default: 0.05)
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_extra_ratio = max_extra_ratio
+        self.min_delay = min_delay
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """Seconds to wait before hedging a new call, or None while there is too little history."""
+        with self._lock:
+            self.calls += 1
+            if not self._latencies or len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def try_hedge(self):
+        """Reserve budget for one duplicate request; False if it would exceed the cap."""
+        with self._lock:
+            if self.hedges + 1 > self.max_extra_ratio * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def record(self, latency):
+        """Record how long an original (non-duplicate) request took."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def record_win(self):
+        """Count a call answered by its duplicate request."""
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self):
+        """Return call, hedge and win counters."""
+        with self._lock:
+            return {"calls": self.calls, "hedges": self.hedges, "hedge_wins": self.hedge_wins,
+                    "extra_load": self.hedges / self.calls if self.calls else 0.0}
@@ -0,0 +1,243 @@
+# Multi-credential key pool for SuperSpeech
+# Spreads requests over several app key/secret key pairs by remaining quota and
+# recent error rate, and rests keys that are rejected until a probe succeeds.
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# The resting key this thread or task is probing; only the probe's own release
+# ends the probe, not requests that were already in flight when the key was rested
+_probing_key = contextvars.ContextVar("probing_key", default=None)
+
+
+def key_outcome(status_code, text, auth_err_ids=(), quota_err_ids=()):
+    """Classify one response (str or bytes body) from the point of view of the key that signed it.
+
+    Only the HTTP status and known errIds reject a key. Error messages are not
+    matched, so an input error ("audio length exceeds limit") never rests a key.
+
+    Args:
+        status_code (int): HTTP status of the response
+        text (str or bytes): Response body
+        auth_err_ids (iterable): errIds meaning the credentials were rejected
+        quota_err_ids (iterable): errIds meaning the key is throttled or out of quota
+
+    Returns:
+        str: "auth" (credentials rejected), "quota" (key throttled or out of quota),
+            "error" (server or transport failure) or "ok"
+    """
+    if status_code in (401, 403):
+        return "auth"
+    if status_code == 429:
+        return "quota"
+    if not isinstance(status_code, int) or status_code >= 500 or not text.strip():
+        return "error"
+    if not (auth_err_ids or quota_err_ids):
+        return "ok"
+    if (b'"errId"' if isinstance(text, bytes) else '"errId"') not in text:
+        return "ok"
+    try:
+        err_id = json.loads(text).get("errId")
+    except (ValueError, AttributeError):
+        return "ok"
+    if err_id in auth_err_ids:
+        return "auth"
+    if err_id in quota_err_ids:
+        return "quota"
+    return "ok"
+
+
+class ApiKey:
+    def __init__(self, app_key, secret_key, quota=None, error_window=50):
+        """One SpeechSuper credential pair and its usage.
+
+        Args:
+            app_key (str): SpeechSuper application key
+            secret_key (str): SpeechSuper secret key
+            quota (int): Requests this key may make per quota window (default: unknown)
+            error_window (int): Number of recent outcomes used for the error rate (default: 50)
+        """
+        self.app_key = app_key
+        self.secret_key = secret_key
+        self.quota = quota
+        self.used = 0
+        self.total = 0
+        self.in_flight = 0
+        self.disabled_until = None
+        self.disabled_reason = None
+
+        self._outcomes = deque(maxlen=error_window)
+        self._window_start = time.monotonic()
+        self._probing = False
+
+    @property
+    def error_rate(self):
+        """Fraction of recent requests that failed."""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @property
+    def remaining(self):
+        """Requests left in the current quota window (None if the quota is unknown)."""
+        if self.quota is None:
+            return None
+        return max(0, self.quota - self.used)
+
+    def __repr__(self):
+        return f"ApiKey({self.app_key[:4]}..., used={self.used}, quota={self.quota})"
+
+
+class KeyPool:
+    def __init__(self, keys, window=24 * 3600.0, cooldown=60.0, error_window=50, auth_err_ids=(),
+                 quota_err_ids=()):
+        """Share requests between several SpeechSuper credentials.
+
+        Args:
+            keys (iterable): (app_key, secret_key[, quota]) tuples, dicts with "app_key",
+                "secret_key" and optional "quota", or ApiKey objects
+            window (float): Seconds after which each key's quota is renewed (default: one day)
+            cooldown (float): Seconds a rejected key rests before one probe request may use it
+                again (default: 60)
+            error_window (int): Number of recent outcomes used for each key's error rate (default: 50)
+            auth_err_ids (iterable): errIds that reject a key's credentials, in addition to
+                HTTP 401/403 (default: none)
+            quota_err_ids (iterable): errIds that mean a key is throttled or out of quota, in
+                addition to HTTP 429 (default: none)
+        """
+        self.keys = []
+        for key in keys:
+            if isinstance(key, dict):
+                key = ApiKey(key["app_key"], key["secret_key"], key.get("quota"), error_window)
+            elif not isinstance(key, ApiKey):
+                key = ApiKey(*key, error_window=error_window)
+            self.keys.append(key)
+        if not self.keys:
+            raise ValueError("KeyPool needs at least one app_key/secret_key pair")
+
+        self.window = window
+        self.cooldown = cooldown
+        self.auth_err_ids = frozenset(auth_err_ids)
+        self.quota_err_ids = frozenset(quota_err_ids)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix="SPEECHSUPER", **kwargs):
+        """Build a pool from environment variables.
+
+        Reads PREFIX_APP_KEY/PREFIX_SECRET_KEY, then PREFIX_APP_KEY_1/PREFIX_SECRET_KEY_1,
+        PREFIX_APP_KEY_2/... until a number is missing. An optional PREFIX_QUOTA or
+        PREFIX_QUOTA_<n> sets the quota of the matching key.
+        """
+        keys = []
+        suffixes = [""] + [f"_{n}" for n in range(1, 1000)]
+        for index, suffix in enumerate(suffixes):
+            app_key = os.getenv(f"{prefix}_APP_KEY{suffix}")
+            secret_key = os.getenv(f"{prefix}_SECRET_KEY{suffix}")
+            if not app_key or not secret_key:
+                if index > 0:
+                    break
+                continue
+            quota = os.getenv(f"{prefix}_QUOTA{suffix}")
+            keys.append((app_key, secret_key, int(quota) if quota else None))
+        return cls(keys, **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Build a pool from a JSON file holding a list of {"app_key", "secret_key", "quota"} objects."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def _available(self, key, now):
+        if now - key._window_start >= self.window:
+            key._window_start = now
+            key.used = 0
+        if key.disabled_until is not None:
+            return now >= key.disabled_until and not key._probing
+        return key.quota is None or key.used < key.quota
+
+    def _score(self, key, largest_quota):
+        # Remaining quota relative to the largest key, so big keys take more of
+        # the load and all keys run dry at about the same time
+        remaining = 1.0 if key.quota is None else key.remaining / largest_quota
+        return remaining * (1.0 - key.error_rate) / (1 + key.in_flight)
+
+    def acquire(self):
+        """Pick the key for the next request.
+
+        Returns:
+            ApiKey: The healthiest key with quota left, or None if every key is out
+                of quota or resting. Pass it to release() once the request is done.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [key for key in self.keys if self._available(key, now)]
+            if not candidates:
+                return None
+            largest_quota = max((k.quota for k in self.keys if k.quota), default=1)
+            key = max(candidates, key=lambda k: (self._score(k, largest_quota), -k.total))
+            if key.disabled_until is not None:
+                key._probing = True
+                _probing_key.set(key)
+            key.used += 1
+            key.total += 1
+            key.in_flight += 1
+            return key
+
+    def outcome(self, status_code, text):
+        """Classify a response with key_outcome() and this pool's errIds."""
+        return key_outcome(status_code, text, self.auth_err_ids, self.quota_err_ids)
+
+    def release(self, key, outcome="ok"):
+        """Report how a request signed with key went.
+
+        Args:
+            key (ApiKey): Key returned by acquire()
+            outcome (str): "ok", "error", "auth" or "quota", see key_outcome()
+        """
+        with self._lock:
+            key.in_flight -= 1
+            probe = _probing_key.get() is key
+            if probe:
+                key._probing = False
+                _probing_key.set(None)
+            if outcome in ("auth", "quota"):
+                key.disabled_until = time.monotonic() + self.cooldown
+                key.disabled_reason = outcome
+                logger.warning("API key %s... rejected (%s), resting for %ss", key.app_key[:4],
+                               outcome, self.cooldown)
+                return
+            key._outcomes.append(outcome == "error")
+            if probe:
+                key.disabled_until = None
+                key.disabled_reason = None
+
+    def retry_after(self):
+        """Seconds until some key may be used again (0 if one is available now)."""
+        now = time.monotonic()
+        with self._lock:
+            waits = []
+            for key in self.keys:
+                if self._available(key, now):
+                    return 0.0
+                if key.disabled_until is not None:
+                    waits.append(max(0.0, key.disabled_until - now))
+                else:
+                    waits.append(max(0.0, self.window - (now - key._window_start)))
+            return min(waits)
+
+    def stats(self):
+        """Return usage and health of every key, with app keys shortened."""
+        now = time.monotonic()
+        with self._lock:
+            return [{"app_key": key.app_key[:4] + "...", "used": key.used, "remaining": key.remaining,
+                     "total": key.total, "in_flight": key.in_flight, "error_rate": key.error_rate,
+                     "available": self._available(key, now), "disabled_reason": key.disabled_reason}
+                    for key in self.keys]
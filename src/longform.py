@@ -0,0 +1,202 @@
+# Long-form evaluation for SuperSpeech
+# Splits recordings longer than the API accepts at pauses found by the VAD, and
+# merges the scores of the segments back into one report on the original timeline.
+
+import logging
+import mmap
+import os
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed to split audio
+    np = None
+
+from .audio_source import AudioSource, read_wav_header
+from .preprocess import TARGET_RATE, needs_conversion, to_mono16
+from .vad import as_samples, speech_frames
+
+logger = logging.getLogger(__name__)
+
+# Longest segment sent, safely under the API's 90-second limit
+MAX_SEGMENT_SECONDS = 85.0
+
+# Word timings ("span" start/end) are reported in units of 10 ms
+SPAN_UNIT = 0.01
+
+# Scores averaged over the segments, weighted by segment duration
+WEIGHTED_SCORES = ("overall", "pronunciation", "fluency")
+
+# Starts of compressed formats, which cannot be split without decoding: MP3 with
+# an ID3 tag, OGG and FLAC (bare MPEG frames are recognized by their sync word)
+_COMPRESSED_SIGNATURES = (b"ID3", b"OggS", b"fLaC")
+
+# samples: int16 view of the recording from start to end (sample offsets)
+Segment = namedtuple("Segment", ["samples", "start", "end", "sample_rate"])
+
+
+def load_samples(audio, sample_rate=16000):
+    """Get 16-bit mono samples of a recording, without copying them when possible.
+
+    WAV files in the target format are memory-mapped, and WAV or raw PCM buffers
+    and int16 arrays are viewed in place. Anything else is converted to 16 kHz
+    mono first, which makes a copy.
+
+    Args:
+        audio: A file path, WAV or raw PCM bytes/buffer, a binary file-like object
+            or an int16 NumPy array
+        sample_rate (int): Sample rate of raw PCM and arrays (default: 16000)
+
+    Returns:
+        tuple: (samples, sample_rate), samples being a 1-D int16 NumPy array
+
+    Raises:
+        ValueError: If the audio is compressed (MP3, OGG, FLAC) or not WAV
+    """
+    if np is None:
+        raise ImportError("Long-form evaluation requires numpy. Install it with: pip install numpy")
+    if isinstance(audio, np.ndarray):
+        return as_samples(audio), sample_rate
+    if isinstance(audio, (str, os.PathLike)):
+        with open(audio, "rb") as audio_file:
+            info = read_wav_header(audio_file, os.fstat(audio_file.fileno()).st_size)
+            if info is not None and not needs_conversion(info):
+                # The array keeps the mapping alive; it is unmapped once no slice is left
+                mapped = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+                count = min(info.data_size, len(mapped) - info.data_offset) // 2
+                return np.frombuffer(mapped, dtype="<i2", count=count, offset=info.data_offset), info.sample_rate
+    elif not hasattr(audio, "read"):
+        view = memoryview(audio).cast("B")
+        if not (len(view) >= 12 and view[:4] == b"RIFF" and view[8:12] == b"WAVE"):
+            head = bytes(view[:4])
+            if head.startswith(_COMPRESSED_SIGNATURES + (b"RIFF",)) or (
+                    len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+                raise ValueError("Long-form evaluation needs WAV or raw 16-bit PCM audio, "
+                                 "not compressed audio")
+            return as_samples(view), sample_rate
+        info = AudioSource(view).wav_info()
+        if not needs_conversion(info):
+            return as_samples(view[info.data_offset:info.data_offset + info.data_size]), info.sample_rate
+    return to_mono16(AudioSource(audio, "wav", sample_rate)), TARGET_RATE
+
+
+def split_at_pauses(samples, sample_rate=16000, max_seconds=MAX_SEGMENT_SECONDS, min_pause_ms=300,
+                    frame_ms=20):
+    """Split a recording into segments no longer than max_seconds.
+
+    Each segment ends in the middle of the last pause of at least min_pause_ms
+    that keeps it under max_seconds; without such a pause it is cut at
+    max_seconds. Segments without speech are left out.
+
+    Args:
+        samples (numpy.ndarray): int16 mono samples
+        sample_rate (int): Sample rate in Hz (default: 16000)
+        max_seconds (float): Longest segment (default: 85.0)
+        min_pause_ms (int): Shortest silence to cut at (default: 300)
+        frame_ms (int): VAD frame length in milliseconds (default: 20)
+
+    Returns:
+        list: Segment tuples in order, each a view of samples
+    """
+    speech = speech_frames(samples, sample_rate, frame_ms)
+    frame = max(1, sample_rate * frame_ms // 1000)
+    max_frames = int(max_seconds * 1000 // frame_ms)
+
+    # Middle frames of the pauses long enough to cut at
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], speech.astype(np.int8), [1]))))
+    starts, ends = edges[0::2], edges[1::2]
+    long_enough = ends - starts >= max(1, min_pause_ms // frame_ms)
+    cuts = (starts[long_enough] + ends[long_enough]) // 2
+
+    bounds = []
+    first = 0
+    while len(samples) - first * frame > max_frames * frame:
+        candidates = cuts[(cuts > first) & (cuts <= first + max_frames)]
+        if len(candidates):
+            cut = int(candidates[-1])
+        else:
+            cut = first + max_frames
+            logger.debug("No pause within %.0fs of %.2fs, cutting mid-speech", max_seconds,
+                         first * frame / sample_rate)
+        bounds.append((first, cut))
+        first = cut
+    bounds.append((first, len(speech)))
+
+    segments = []
+    for index, (first, last) in enumerate(bounds):
+        if not speech[first:last].any():
+            continue
+        start = first * frame
+        end = len(samples) if index == len(bounds) - 1 else last * frame
+        segments.append(Segment(samples[start:end], start, end, sample_rate))
+    logger.debug("Split %.1fs of audio into %d segment(s)", len(samples) / sample_rate, len(segments))
+    return segments
+
+
+def _shift_word(word, offset):
+    """Copy of a word result with its timings moved offset span units later."""
+    span = word.get("span")
+    if not isinstance(span, dict):
+        return word
+    word = dict(word)
+    word["span"] = {key: value + offset if isinstance(value, (int, float)) else value
+                    for key, value in span.items()}
+    return word
+
+
+def merge_results(segments, results):
+    """Merge the results of consecutive segments into one response.
+
+    Args:
+        segments (list): The Segment tuples that were evaluated
+        results (list): One response dict per segment, in the same order
+
+    Returns:
+        dict: A response shaped like a single evaluation. overall, pronunciation
+            and fluency are averaged over the successful segments weighted by
+            their duration, words are concatenated with their timings on the
+            timeline of the whole recording, and result["segments"] lists the
+            start, end (seconds) and scores or error of every segment. The
+            response is an error only if no segment succeeded.
+    """
+    merged = {}
+    totals = {}
+    weights = {}
+    words = []
+    transcriptions = []
+    summary = []
+    duration = 0.0
+    for segment, response in zip(segments, results):
+        start = segment.start / segment.sample_rate
+        length = (segment.end - segment.start) / segment.sample_rate
+        entry = {"start": round(start, 3), "end": round(start + length, 3)}
+        result = response.get("result") if not response.get("error") else None
+        if not isinstance(result, dict):
+            entry["error"] = response.get("error") or "No result"
+            summary.append(entry)
+            continue
+        duration += length
+        for name in WEIGHTED_SCORES:
+            value = result.get(name)
+            if isinstance(value, (int, float)):
+                entry[name] = value
+                totals[name] = totals.get(name, 0.0) + value * length
+                weights[name] = weights.get(name, 0.0) + length
+        offset = round(start / SPAN_UNIT)
+        words.extend(_shift_word(word, offset) for word in result.get("words") or ())
+        if result.get("transcription"):
+            transcriptions.append(result["transcription"])
+        summary.append(entry)
+
+    if not duration:
+        errors = [entry["error"] for entry in summary if "error" in entry]
+        return {"error": errors[0] if errors else "No speech detected",
+                "result": {"segments": summary}}
+    for name, total in totals.items():
+        merged[name] = round(total / weights[name], 1)
+    merged["duration"] = f"{duration:.2f}"
+    merged["words"] = words
+    if transcriptions:
+        merged["transcription"] = " ".join(transcriptions)
+    merged["segments"] = summary
+    return {"result": merged}
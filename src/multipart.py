@@ -0,0 +1,79 @@
+# Streaming multipart/form-data encoder
+# Produces the same upload as requests' files= argument, but reads the audio
+# in fixed-size chunks while sending instead of building the body in memory.
+
+import json
+import uuid
+
+
+class MultipartEncoder:
+    def __init__(self, fields, file_field, source, chunk_size=64 * 1024):
+        """Prepare a streaming multipart body.
+
+        Args:
+            fields (dict): Plain form fields (name -> str)
+            file_field (str): Form field name for the audio
+            source (AudioSource): The audio to upload
+            chunk_size (int): Bytes read from the audio per chunk (default: 64 KiB)
+        """
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        head = []
+        for name, value in fields.items():
+            head.append(self._part_header(name) + b"\r\n" + value.encode("utf-8") + b"\r\n")
+        head.append(self._part_header(file_field, source.name) + b"\r\n")
+
+        self._head = b"".join(head)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        self._source = source
+        self._length = len(self._head) + source.size + len(self._tail)
+
+        self._stage = 0     # 0: head, 1: audio, 2: tail, 3: done
+        self._audio_context = None
+        self._audio_file = None
+
+    def _part_header(self, name, filename=None):
+        disposition = f'form-data; name={json.dumps(name)}'
+        if filename is not None:
+            disposition += f'; filename={json.dumps(filename, ensure_ascii=False)}'
+        return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n".encode("utf-8")
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        """Return the next piece of the body; b'' once everything has been sent."""
+        if size is None or size < 0:
+            size = self.chunk_size
+        while self._stage < 3:
+            if self._stage == 0:
+                self._stage = 1
+                self._audio_context = self._source.open()
+                self._audio_file = self._audio_context.__enter__()
+                return self._head
+            if self._stage == 1:
+                chunk = self._audio_file.read(size)
+                if chunk:
+                    return chunk
+                self.close()
+                self._stage = 2
+                continue
+            self._stage = 3
+            return self._tail
+        return b""
+
+    def close(self):
+        """Release the audio file if it is still open."""
+        if self._audio_context is not None:
+            self._audio_context.__exit__(None, None, None)
+            self._audio_context = None
+            self._audio_file = None
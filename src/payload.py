@@ -0,0 +1,47 @@
+# Pre-serialized request payloads for SuperSpeech
+# The connect/start payload is identical between calls except for a handful of
+# fields, so it is serialized once per request shape and only those are filled in.
+
+import json
+from json.encoder import encode_basestring_ascii
+
+
+class PayloadTemplate:
+    def __init__(self, params):
+        """Serialize a payload whose variable fields are slot() markers.
+
+        Args:
+            params (dict): The payload, with slot(name) in place of every variable value
+        """
+        text = json.dumps(params)
+        self.segments = []
+        self.names = []
+        start = 0
+        while True:
+            index = text.find(_MARKER_PREFIX, start)
+            if index < 0:
+                break
+            end = text.index('"', index + len(_MARKER_PREFIX))
+            self.segments.append(text[start:index])
+            self.names.append(text[index + len(_MARKER_PREFIX):end])
+            start = end + 1
+        self.segments.append(text[start:])
+
+    def render(self, values):
+        """Return the payload JSON with each slot replaced by json.dumps(values[name])."""
+        parts = [self.segments[0]]
+        for name, segment in zip(self.names, self.segments[1:]):
+            value = values[name]
+            # Same output as json.dumps for strings, without its per-call setup
+            parts.append(encode_basestring_ascii(value) if isinstance(value, str) else json.dumps(value))
+            parts.append(segment)
+        return "".join(parts)
+
+
+# Starts with a quote so it only matches a whole JSON string value
+_MARKER_PREFIX = '"\\u0000slot:'
+
+
+def slot(name):
+    """Marker for a variable field in a PayloadTemplate."""
+    return "\x00slot:" + name
@@ -0,0 +1,204 @@
+# Audio normalization for SuperSpeech
+# Converts WAV recordings of any rate, channel count and sample format to the
+# 16 kHz 16-bit mono the API scores, in fixed-size blocks with NumPy.
+
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed to convert audio
+    np = None
+
+from .audio_source import AudioSource, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, read_wav_header
+
+logger = logging.getLogger(__name__)
+
+TARGET_RATE = 16000
+
+# Filter length of the anti-aliasing low-pass applied before downsampling
+_TAPS = 31
+
+
+def needs_conversion(info, target_rate=TARGET_RATE):
+    """True if a WAV format differs from target_rate 16-bit mono PCM."""
+    return (info.sample_rate != target_rate or info.channels != 1 or info.sample_width != 2
+            or info.format != WAVE_FORMAT_PCM)
+
+
+def normalize(source, target_rate=TARGET_RATE, block_frames=65536):
+    """Return the audio as target_rate 16-bit mono, converting it only if needed.
+
+    Only the WAV header is read when the audio already has the target format.
+    Audio that is not WAV, or whose header cannot be parsed, is returned unchanged.
+
+    Args:
+        source (AudioSource): The audio
+        target_rate (int): Sample rate to convert to (default: 16000)
+        block_frames (int): Input frames converted per block (default: 65536)
+
+    Returns:
+        tuple: (AudioSource, sample_rate), where sample_rate is the real rate of the
+            returned audio, or None if it could not be read from a header
+    """
+    try:
+        info = source.wav_info()
+    except (OSError, ValueError, TypeError) as e:
+        logger.debug("Not normalizing, WAV header unreadable: %s", e)
+        return source, None
+    if info is None:
+        return source, None
+    if not needs_conversion(info, target_rate):
+        return source, info.sample_rate
+    samples = to_mono16(source, target_rate, block_frames)
+    logger.debug("Normalized %s Hz %s-channel %s-bit audio to %s Hz mono 16-bit",
+                 info.sample_rate, info.channels, info.sample_width * 8, target_rate)
+    return AudioSource(samples, "wav", target_rate), target_rate
+
+
+def to_mono16(source, target_rate=TARGET_RATE, block_frames=65536):
+    """Decode, downmix, resample and requantize WAV audio.
+
+    The input is read block by block into one reused buffer, so memory use does
+    not depend on the length of the input beyond the (much smaller) output.
+
+    Args:
+        source (AudioSource): WAV audio (PCM 8/16/24/32-bit or 32/64-bit float)
+        target_rate (int): Output sample rate (default: 16000)
+        block_frames (int): Input frames converted per block (default: 65536)
+
+    Returns:
+        numpy.ndarray: int16 mono samples at target_rate
+    """
+    if np is None:
+        raise ImportError("Audio normalization requires numpy. Install it with: pip install numpy")
+    with source.open() as audio_file:
+        info = read_wav_header(audio_file, source.size)
+        if info is None:
+            raise ValueError("Audio is not a WAV file")
+        decode = _decoder(info)
+        frame_size = info.channels * info.sample_width
+        total_frames = info.data_size // frame_size
+        expected = int(round(total_frames * target_rate / info.sample_rate))
+
+        resampler = _Resampler(info.sample_rate, target_rate)
+        output = np.zeros(expected, dtype=np.int16)
+        written = 0
+        buffer = bytearray(block_frames * frame_size)
+        remaining = total_frames * frame_size
+        while remaining > 0:
+            view = memoryview(buffer)[:min(len(buffer), remaining)]
+            count = audio_file.readinto(view) if hasattr(audio_file, "readinto") else None
+            if count is None:
+                chunk = audio_file.read(len(view))
+                count = len(chunk)
+                view[:count] = chunk
+            count -= count % frame_size
+            if count <= 0:
+                break
+            remaining -= count
+            mono = _downmix(decode(view[:count]), info.channels)
+            written = _store(output, written, resampler.process(mono))
+        written = _store(output, written, resampler.flush())
+    return output
+
+
+def _store(output, written, block):
+    """Requantize a float block into output at written; returns the new position."""
+    count = min(len(block), len(output) - written)
+    if count > 0:
+        np.clip(np.rint(block[:count]), -32768, 32767, out=block[:count])
+        output[written:written + count] = block[:count]
+    return written + max(count, 0)
+
+
+def _downmix(samples, channels):
+    """Average interleaved channels into one."""
+    if channels == 1:
+        return samples
+    frames = samples.reshape(-1, channels)
+    # Adding columns is much faster than mean(axis=1) over a short axis
+    mono = frames[:, 0].copy()
+    for channel in range(1, channels):
+        mono += frames[:, channel]
+    mono *= 1.0 / channels
+    return mono
+
+
+def _decoder(info):
+    """Return a function turning raw sample bytes into float32 samples on the int16 scale."""
+    width = info.sample_width
+    if info.format == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        dtype = np.float32 if width == 4 else np.float64
+        return lambda raw: np.frombuffer(raw, dtype=dtype).astype(np.float32) * 32768.0
+    if info.format != WAVE_FORMAT_PCM:
+        raise ValueError(f"Unsupported WAV format code {info.format}")
+    if width == 1:
+        return lambda raw: (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) * 256.0
+    if width == 2:
+        return lambda raw: np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    if width == 3:
+        def decode24(raw):
+            triples = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            value = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+            value -= (value & 0x800000) << 1
+            return value.astype(np.float32) / 256.0
+        return decode24
+    if width == 4:
+        return lambda raw: np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 65536.0
+    raise ValueError(f"Unsupported sample width of {width} bytes")
+
+
+class _Resampler:
+    def __init__(self, in_rate, out_rate, taps=_TAPS):
+        """Streaming linear-interpolation resampler, low-pass filtered when downsampling."""
+        self.step = in_rate / out_rate
+        self.passthrough = in_rate == out_rate
+        self._kernel = None
+        self._history = None
+        delay = 0.0
+        if in_rate > out_rate:
+            # Windowed-sinc low-pass just below the output Nyquist frequency
+            cutoff = 0.9 * 0.5 * out_rate / in_rate
+            n = np.arange(taps) - (taps - 1) / 2
+            kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+            self._kernel = (kernel / kernel.sum()).astype(np.float32)
+            self._history = np.zeros(taps - 1, dtype=np.float32)
+            # Start late by the filter's group delay so the output lines up with the input
+            delay = (taps - 1) / 2
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._time = delay
+        self._delay = delay
+
+    def process(self, block):
+        """Resample one block of float32 samples; returns the output produced so far."""
+        if self.passthrough:
+            return block
+        if self._kernel is not None:
+            padded = np.concatenate((self._history, block))
+            self._history = padded[len(padded) - len(self._history):]
+            # The kernel is symmetric, so this is a convolution; a multiply-add per tap is
+            # several times faster than np.convolve on long blocks
+            size = len(block)
+            block = padded[:size] * self._kernel[0]
+            for tap in range(1, len(self._kernel)):
+                block += self._kernel[tap] * padded[tap:tap + size]
+        buffer = np.concatenate((self._tail, block)) if len(self._tail) else block
+        last = len(buffer) - 1
+        count = int(np.ceil((last - self._time) / self.step)) if last > self._time else 0
+        times = self._time + self.step * np.arange(count)
+        index = times.astype(np.int64)
+        fraction = (times - index).astype(np.float32)
+        left = buffer[index]
+        result = left + (buffer[index + 1] - left) * fraction
+        self._time += count * self.step
+        # Keep the sample the next output starts from (the next output may lie past it)
+        keep = min(int(self._time), last) if last >= 0 else 0
+        self._tail = buffer[keep:]
+        self._time -= keep
+        return result
+
+    def flush(self):
+        """Push the filter delay and the last sample through; returns the final output."""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros(int(np.ceil(self._delay)) + 2, dtype=np.float32))
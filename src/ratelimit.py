@@ -0,0 +1,97 @@
+# Client-side rate limiting for SuperSpeech
+# A token bucket (requests per second) plus a cap on concurrent requests,
+# shared by priority lanes so interactive calls go ahead of bulk work.
+
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    def __init__(self, rate=10.0, burst=None, max_concurrent=None, lanes=("interactive", "bulk")):
+        """Limit request rate and concurrency across all threads using one API key.
+
+        Args:
+            rate (float): Sustained requests per second (default: 10)
+            burst (int): Requests that may start back to back after an idle period (default: rate, at least 1)
+            max_concurrent (int): Maximum requests in flight at once (default: no limit)
+            lanes (tuple): Lane names from highest to lowest priority (default: ("interactive", "bulk")).
+                A waiting request only starts when no higher-priority lane has requests waiting.
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_concurrent = max_concurrent
+        self.lanes = tuple(lanes)
+        self.granted = {lane: 0 for lane in self.lanes}
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._active = 0
+        self._queues = {lane: deque() for lane in self.lanes}
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _is_next(self, ticket, lane):
+        for name in self.lanes:
+            queue = self._queues[name]
+            if name == lane:
+                return queue[0] is ticket
+            if queue:
+                return False
+        return False
+
+    def acquire(self, lane="bulk", timeout=None):
+        """Wait for a token and a concurrency slot.
+
+        Args:
+            lane (str): Priority lane of the request (default: bulk)
+            timeout (float): Seconds to wait at most (default: forever)
+
+        Returns:
+            bool: True once the request may start, False if the timeout expired first.
+                Call release() when a True acquire's request has finished.
+        """
+        if lane not in self._queues:
+            raise ValueError(f"Unknown lane {lane!r}, expected one of {self.lanes}")
+        expires = time.monotonic() + timeout if timeout is not None else None
+        ticket = object()
+
+        with self._cond:
+            queue = self._queues[lane]
+            queue.append(ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._is_next(ticket, lane) and (self.max_concurrent is None
+                                                        or self._active < self.max_concurrent):
+                        self._refill()
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            self._active += 1
+                            self.granted[lane] += 1
+                            return True
+                        wait = (1 - self._tokens) / self.rate
+                    if expires is not None:
+                        remaining = expires - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                queue.remove(ticket)
+                self._cond.notify_all()
+
+    def release(self):
+        """Free the concurrency slot taken by a successful acquire()."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def waiting(self):
+        """Number of requests waiting in each lane."""
+        with self._cond:
+            return {lane: len(queue) for lane, queue in self._queues.items()}
@@ -0,0 +1,219 @@
+# Microphone recording for SuperSpeech
+# Captures 16-bit PCM with PyAudio in callback mode into a buffer allocated once,
+# so recording neither blocks the caller nor allocates per chunk.
+
+import logging
+import threading
+
+try:
+    import pyaudio
+except ImportError:  # optional dependency, only needed to record from a microphone
+    pyaudio = None
+
+logger = logging.getLogger(__name__)
+
+# PortAudio constants, also used by FakePyAudio when pyaudio is not installed
+PA_INT16 = 8
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
+
+
+class Recorder:
+    def __init__(self, sample_rate=16000, channels=1, chunk=1024, max_seconds=90.0,
+                 overwrite=False, on_chunk=None, audio=None):
+        """Record 16-bit PCM from the default input device.
+
+        PortAudio calls back on its own thread with each chunk, which is copied
+        into a buffer of max_seconds allocated up front. Once the buffer is full,
+        further frames are dropped, or with overwrite=True the oldest ones are
+        overwritten so the buffer keeps the last max_seconds.
+
+        Args:
+            sample_rate (int): Sample rate in Hz (default: 16000)
+            channels (int): Number of channels (default: 1)
+            chunk (int): Frames per callback (default: 1024)
+            max_seconds (float): Longest capture kept (default: 90.0, the API limit)
+            overwrite (bool): Keep the latest audio instead of the earliest when the
+                capture is longer than max_seconds (default: False)
+            on_chunk (callable): Called on the audio thread with each chunk as bytes,
+                e.g. StreamingSession.send; it must not block (optional)
+            audio: A pyaudio.PyAudio instance or stand-in such as FakePyAudio
+                (default: a new pyaudio.PyAudio)
+        """
+        if audio is None:
+            if pyaudio is None:
+                raise ImportError("Recording requires pyaudio. Install it with: pip install pyaudio")
+            audio = pyaudio.PyAudio()
+            self._owns_audio = True
+        else:
+            self._owns_audio = False
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk = chunk
+        self.overwrite = overwrite
+        self.on_chunk = on_chunk
+        self.frame_bytes = 2 * channels
+        self.capacity = int(max_seconds * sample_rate) * self.frame_bytes
+        self._audio = audio
+        self._buffer = bytearray(self.capacity)
+        self._lock = threading.Lock()
+        self._stream = None
+        self._written = 0
+        self._dropped = 0
+        self.overflows = 0
+
+    def start(self):
+        """Start a new capture, reusing the buffer of the previous one."""
+        if self._stream is not None:
+            raise RuntimeError("Recorder is already recording")
+        with self._lock:
+            self._written = 0
+            self._dropped = 0
+            self.overflows = 0
+        self._stream = self._audio.open(format=PA_INT16, channels=self.channels, rate=self.sample_rate,
+                                        input=True, frames_per_buffer=self.chunk,
+                                        stream_callback=self._callback)
+        return self
+
+    def stop(self):
+        """Stop capturing.
+
+        Returns:
+            The capture, as returned by data()
+        """
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop_stream()
+            stream.close()
+        if self.overflows or self.dropped_frames:
+            logger.debug("Capture had %d input overflow(s) and %d dropped frame(s)",
+                         self.overflows, self.dropped_frames)
+        return self.data()
+
+    def close(self):
+        """Stop capturing and release the audio device."""
+        self.stop()
+        if self._owns_audio:
+            self._audio.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def recording(self):
+        return self._stream is not None
+
+    @property
+    def frames(self):
+        """Frames held in the buffer."""
+        return min(self._written, self.capacity) // self.frame_bytes
+
+    @property
+    def duration(self):
+        """Seconds of audio held in the buffer."""
+        return self.frames / self.sample_rate
+
+    @property
+    def dropped_frames(self):
+        """Frames lost because the capture was longer than max_seconds."""
+        return self._dropped // self.frame_bytes
+
+    def data(self):
+        """The capture as one contiguous buffer of 16-bit PCM.
+
+        Unless overwrite=True and the buffer wrapped around, this is a view of the
+        recorder's buffer, not a copy; it stays valid until the next start().
+
+        Returns:
+            memoryview or bytearray: The captured samples
+        """
+        with self._lock:
+            if self._written <= self.capacity:
+                return memoryview(self._buffer)[:self._written]
+            # Wrapped: the oldest sample is at the write position
+            position = self._written % self.capacity
+            view = memoryview(self._buffer)
+            output = bytearray(self.capacity)
+            output[:self.capacity - position] = view[position:]
+            output[self.capacity - position:] = view[:position]
+            return output
+
+    def feed(self, data, status_flags=0):
+        """Add one chunk of captured samples; this is what the audio callback does.
+
+        Args:
+            data (bytes-like): Interleaved 16-bit samples
+            status_flags (int): PortAudio status flags of the chunk (default: 0)
+        """
+        if status_flags & PA_INPUT_OVERFLOW:
+            self.overflows += 1
+        view = memoryview(data).cast("B")
+        size = len(view) - len(view) % self.frame_bytes
+        with self._lock:
+            if not self.overwrite:
+                count = min(size, self.capacity - self._written)
+                self._buffer[self._written:self._written + count] = view[:count]
+                self._written += count
+                self._dropped += size - count
+            elif size:
+                if size > self.capacity:
+                    view = view[size - self.capacity:size]
+                    self._written += size - self.capacity
+                    size = self.capacity
+                position = self._written % self.capacity
+                first = min(size, self.capacity - position)
+                self._buffer[position:position + first] = view[:first]
+                self._buffer[:size - first] = view[first:size]
+                self._written += size
+                self._dropped = max(0, self._written - self.capacity)
+        if self.on_chunk is not None:
+            self.on_chunk(data)
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        self.feed(in_data, status_flags)
+        return None, PA_CONTINUE
+
+
+class FakeStream:
+    def __init__(self, callback):
+        """Input stream of FakePyAudio; push() delivers chunks like the audio thread."""
+        self.callback = callback
+        self.active = True
+
+    def push(self, data, status_flags=0):
+        """Deliver one chunk to the stream callback, as PortAudio would."""
+        if self.active:
+            self.callback(data, len(data) // 2, {}, status_flags)
+
+    def stop_stream(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+
+
+class FakePyAudio:
+    def __init__(self):
+        """Stand-in for pyaudio.PyAudio in tests: no device, chunks are pushed by hand."""
+        self.streams = []
+        self.terminated = False
+
+    def open(self, format=PA_INT16, channels=1, rate=16000, input=True, frames_per_buffer=1024,
+             stream_callback=None):
+        stream = FakeStream(stream_callback)
+        self.streams.append(stream)
+        return stream
+
+    def get_sample_size(self, format):
+        return 2
+
+    def terminate(self):
+        self.terminated = True
+
+    @property
+    def stream(self):
+        """The most recently opened stream."""
+        return self.streams[-1]
@@ -0,0 +1,115 @@
+# Retry and circuit-breaker policies for SuperSpeech
+# Keeps a stuck or failing upstream from hanging or flooding the client.
+
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.25, max_delay=4.0, jitter=True):
+        """Exponential backoff between attempts of one evaluation.
+
+        Args:
+            max_attempts (int): Total attempts including the first one (default: 3)
+            base_delay (float): Backoff before the first retry, in seconds (default: 0.25)
+            max_delay (float): Upper bound for any single backoff (default: 4.0)
+            jitter (bool): Randomize each backoff between 0 and its cap ("full jitter")
+                so that many clients retrying together spread out (default: True)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def backoff(self, retry):
+        """Seconds to wait before the given retry (1 for the first retry)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (retry - 1)))
+        return random.uniform(0, cap) if self.jitter else cap
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """Stop calling an upstream that keeps failing, and probe it again later.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit (default: 5)
+            reset_timeout (float): Seconds to stay open before letting one probe through (default: 30)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_after(self):
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def release(self):
+        """End a request that was allowed but produced no outcome to record.
+
+        A half-open probe that gave up (deadline, no key, unexpected error) lets
+        the next request probe instead, rather than holding the circuit half open.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit breaker opened after %d failure(s)", self.failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self):
+        """Return the state and counters, e.g. for a health endpoint."""
+        with self._lock:
+            return {"state": self._current_state(), "failures": self.failures, "rejected": self.rejected}
@@ -0,0 +1,240 @@
+# Typed evaluation results for SuperSpeech
+# Compact, read-only views of an API response that keep the response bytes and
+# decode them only when a field is first read.
+
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:  # optional dependency, only makes decoding faster
+    orjson = None
+
+
+def json_loads(data):
+    """Decode JSON from str or bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value):
+    """Encode a value to compact UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _intern(text):
+    # Phonemes, spellings and words repeat across results; share one copy of each
+    return sys.intern(text) if isinstance(text, str) else text
+
+
+class Phonic:
+    __slots__ = ("phoneme", "spell", "score")
+
+    def __init__(self, phoneme, spell, score):
+        """Score of one phoneme within a word.
+
+        Args:
+            phoneme (str): Phoneme as reported by the API
+            spell (str): Letters of the word the phoneme was read from
+            score (float): Phoneme score (0-100)
+        """
+        self.phoneme = phoneme
+        self.spell = spell
+        self.score = score
+
+    def __repr__(self):
+        return f"Phonic(phoneme={self.phoneme!r}, spell={self.spell!r}, score={self.score})"
+
+
+class Word:
+    __slots__ = ("word", "overall", "pronunciation", "start", "end", "phonics")
+
+    def __init__(self, word, overall=None, pronunciation=None, start=None, end=None, phonics=()):
+        """Scores of one word of the reference text.
+
+        Args:
+            word (str): The word
+            overall (float): Overall word score (0-100)
+            pronunciation (float): Pronunciation score (0-100)
+            start (float): Start of the word in the audio, as reported by the API (optional)
+            end (float): End of the word in the audio, as reported by the API (optional)
+            phonics (tuple): Phonic scores of the word
+        """
+        self.word = word
+        self.overall = overall
+        self.pronunciation = pronunciation
+        self.start = start
+        self.end = end
+        self.phonics = phonics
+
+    @classmethod
+    def from_dict(cls, data):
+        scores = data.get("scores") or {}
+        span = data.get("span") or {}
+        phonics = []
+        for entry in data.get("phonics") or ():
+            # Phonics come either as a flat list or grouped per syllable
+            for phonic in (entry if isinstance(entry, list) else (entry,)):
+                phoneme = phonic.get("phoneme")
+                if isinstance(phoneme, list):
+                    phoneme = " ".join(phoneme)
+                phonics.append(Phonic(_intern(phoneme), _intern(phonic.get("spell")),
+                                      phonic.get("overall", phonic.get("score"))))
+        return cls(_intern(data.get("word")), scores.get("overall"), scores.get("pronunciation"),
+                   span.get("start"), span.get("end"), tuple(phonics))
+
+    def __repr__(self):
+        return f"Word(word={self.word!r}, overall={self.overall}, pronunciation={self.pronunciation})"
+
+
+class EvaluationResult:
+    __slots__ = ("_body", "_parsed", "_error", "_err_id", "_overall", "_pronunciation",
+                 "_fluency", "_rhythm", "_speed", "_integrity", "_duration", "_words")
+
+    def __init__(self, body):
+        """Wrap one API response body; nothing is decoded until a field is read.
+
+        Args:
+            body (bytes or str): JSON response body
+
+        Scores are None when the response does not contain them. The result can
+        also be read like the plain dict the API returned (result["result"],
+        result.get("error"), "error" in result), and .raw decodes that dict.
+        """
+        self._body = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+        self._parsed = False
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a result from an already decoded response dict."""
+        return cls(json_dumps(data))
+
+    def _parse(self):
+        try:
+            data = json_loads(self._body)
+        except ValueError as e:
+            data = {"error": f"JSON decode error: {e}. Raw response: {self._body.decode('utf-8', 'replace')}"}
+        if not isinstance(data, dict):
+            data = {}
+        result = data.get("result")
+        if not isinstance(result, dict):
+            result = {}
+
+        self._error = data.get("error")
+        self._err_id = data.get("errId")
+        self._overall = result.get("overall")
+        self._pronunciation = result.get("pronunciation")
+        self._fluency = result.get("fluency")
+        self._rhythm = result.get("rhythm")
+        self._speed = result.get("speed")
+        self._integrity = result.get("integrity")
+        duration = result.get("duration")
+        self._duration = float(duration) if duration not in (None, "") else None
+        self._words = tuple(Word.from_dict(word) for word in result.get("words") or ())
+        self._parsed = True
+
+    def _field(self, name):
+        if not self._parsed:
+            self._parse()
+        return getattr(self, name)
+
+    @property
+    def error(self):
+        """Error message, or None for a successful evaluation."""
+        return self._field("_error")
+
+    @property
+    def err_id(self):
+        """API error id, or None."""
+        return self._field("_err_id")
+
+    @property
+    def ok(self):
+        """True if the response holds an evaluation rather than an error."""
+        return self.error is None
+
+    @property
+    def overall(self):
+        return self._field("_overall")
+
+    @property
+    def pronunciation(self):
+        return self._field("_pronunciation")
+
+    @property
+    def fluency(self):
+        return self._field("_fluency")
+
+    @property
+    def rhythm(self):
+        return self._field("_rhythm")
+
+    @property
+    def speed(self):
+        """Speaking speed in words per minute."""
+        return self._field("_speed")
+
+    @property
+    def integrity(self):
+        return self._field("_integrity")
+
+    @property
+    def duration(self):
+        """Audio duration in seconds."""
+        return self._field("_duration")
+
+    @property
+    def words(self):
+        """Tuple of Word scores, in reference text order."""
+        return self._field("_words")
+
+    @property
+    def body(self):
+        """The response bytes this result was read from."""
+        return self._body
+
+    @property
+    def raw(self):
+        """The response as a plain dict, decoded afresh on every access."""
+        try:
+            return json_loads(self._body)
+        except ValueError:
+            return {"error": self.error}
+
+    # Read-only dict interface, so code written against the raw dicts keeps working
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def __contains__(self, key):
+        if key == "error":
+            return self.error is not None
+        if key == "errId":
+            return self.err_id is not None
+        return key in self.raw
+
+    def get(self, key, default=None):
+        if key == "error":
+            return default if self.error is None else self.error
+        if key == "errId":
+            return default if self.err_id is None else self.err_id
+        return self.raw.get(key, default)
+
+    def __deepcopy__(self, memo):
+        # Immutable, so copies can share the instance
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, EvaluationResult):
+            return self.raw == other.raw
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"EvaluationResult(error={self.error!r})"
+        return f"EvaluationResult(overall={self.overall}, pronunciation={self.pronunciation}, words={len(self.words)})"
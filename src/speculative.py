@@ -0,0 +1,44 @@
+# Speculative evaluation for SuperSpeech
+# Sends every candidate (core_type, ref_text) variant at once and keeps the first
+# successful answer, so a wrong guess costs an extra request instead of a round-trip.
+
+import threading
+from collections import Counter
+
+
+class SpeculationStats:
+    def __init__(self):
+        """Counters for SuperSpeech.evaluate_speculative calls."""
+        self.calls = 0
+        self.requests = 0
+        self.cancelled = 0
+        self.failures = 0
+        self.wins = Counter()
+        self.position_wins = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, variant, position, requests, cancelled):
+        """Record one speculative call.
+
+        Args:
+            variant (tuple): Winning (core_type, ref_text), or None if every variant failed
+            position (int): Index of the winner among the variants, or None
+            requests (int): Variants that were sent to the API
+            cancelled (int): Variants stopped before they were sent
+        """
+        with self._lock:
+            self.calls += 1
+            self.requests += requests
+            self.cancelled += cancelled
+            if variant is None:
+                self.failures += 1
+            else:
+                self.wins[variant[0]] += 1
+                self.position_wins[position] += 1
+
+    def stats(self):
+        """Return call, request and win counters; extra_requests were sent but not used."""
+        with self._lock:
+            return {"calls": self.calls, "requests": self.requests, "cancelled": self.cancelled,
+                    "extra_requests": self.requests - (self.calls - self.failures), "failures": self.failures,
+                    "wins": dict(self.wins), "position_wins": dict(self.position_wins)}
@@ -7,69 +7,127 @@ import hashlib
 import requests
 import json
 import os
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
+from .audio_source import AudioSource
+from .cache import ResultCache, cache_key
+from .transport import make_transport
+from .resilience import RetryPolicy, CircuitBreaker
+from .adaptive import is_rate_limited
+from .keypool import KeyPool
+from .results import EvaluationResult, json_loads
+from .payload import PayloadTemplate, slot
+from .singleflight import SingleFlight
+from .streaming import StreamingSession
+from .coretypes import preflight, PreflightError
+from .speculative import SpeculationStats
+from .preprocess import normalize
+from .encoding import encode_source, pick_encoder
+from .longform import MAX_SEGMENT_SECONDS, load_samples, merge_results, split_at_pauses
+
 # Load environment variables from .env file
 load_dotenv()
 
-class SuperSpeech:
-    def __init__(self, app_key=None, secret_key=None):
-        """Initialize SuperSpeech with your API credentials.
+# Diagnostics go through logging; enable them with e.g.
+# logging.getLogger("src.speech_api").setLevel(logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Error of a call stopped because a hedged or speculative duplicate answered first
+CANCELLED_ERROR = "Cancelled: another request answered first"
+
+class BaseSpeechClient:
+    """Credentials, signatures and request payloads shared by the sync and async clients."""
+    
+    def __init__(self, app_key=None, secret_key=None, base_url=None, keys=None, typed_results=False,
+                 preflight=True, normalize_audio=True, compress=None):
+        """Initialize the client with your API credentials.
         
         Args:
             app_key (str): Your SpeechSuper application key (optional, defaults to environment variable)
             secret_key (str): Your SpeechSuper secret key (optional, defaults to environment variable)
+            base_url (str): API base URL (optional, defaults to https://api.speechsuper.com/)
+            keys (KeyPool or list): Several credentials to spread requests over, as a KeyPool or
+                a list of (app_key, secret_key[, quota]) tuples; replaces app_key/secret_key (optional)
+            typed_results (bool): Return EvaluationResult objects instead of dicts (default: False)
+            preflight (bool): Check requests against the core type registry before sending
+                them (default: True)
+            normalize_audio (bool): Convert WAV audio to 16 kHz 16-bit mono before sending it
+                (default: True)
+            compress (str or Encoder): Encode WAV audio before upload: "ogg", "mp3", "auto"
+                or an Encoder (default: None, upload WAV)
         """
+        self.keys = KeyPool(keys) if keys is not None and not isinstance(keys, KeyPool) else keys
+        if self.keys is not None:
+            app_key, secret_key = self.keys.keys[0].app_key, self.keys.keys[0].secret_key
+        
         self.app_key = app_key or os.getenv('SPEECHSUPER_APP_KEY')
         self.secret_key = secret_key or os.getenv('SPEECHSUPER_SECRET_KEY')
         
         if not self.app_key or not self.secret_key:
             raise ValueError("API credentials not found. Please set SPEECHSUPER_APP_KEY and SPEECHSUPER_SECRET_KEY environment variables or create a .env file.")
         
-        self.base_url = "https://api.speechsuper.com/"
+        self.base_url = base_url or "https://api.speechsuper.com/"
         self.user_id = "guest"
+        self.typed_results = typed_results
+        self.preflight = preflight
+        self.normalize_audio = normalize_audio
+        self.encoder = pick_encoder(compress) if compress else None
+        self._templates = {}
     
     def _generate_timestamp(self):
         """Generate current timestamp for API requests (in milliseconds to match WebSocket)."""
         return str(int(time.time() * 1000))
     
-    def _generate_signatures(self, timestamp):
+    def _generate_signatures(self, timestamp, key=None):
         """Generate required signatures for API authentication.
         
         Args:
             timestamp (str): Current timestamp
+            key (ApiKey): Credentials to sign with (default: the client's own)
             
         Returns:
             tuple: (connect_sig, start_sig) signature pair
         """
-        connect_str = (self.app_key + timestamp + self.secret_key).encode("utf-8")
+        key = key or self
+        connect_str = (key.app_key + timestamp + key.secret_key).encode("utf-8")
         connect_sig = hashlib.sha1(connect_str).hexdigest()
         
-        start_str = (self.app_key + timestamp + self.user_id + self.secret_key).encode("utf-8")
+        start_str = (key.app_key + timestamp + self.user_id + key.secret_key).encode("utf-8")
         start_sig = hashlib.sha1(start_str).hexdigest()
         
         return connect_sig, start_sig
     
-    def evaluate_pronunciation(self, audio_path, ref_text, core_type="word.eval.promax", 
-                              audio_type="wav", audio_sample_rate=16000):
-        """Evaluate pronunciation using SpeechSuper API.
+    def _build_params(self, request, audio_type="wav", audio_sample_rate=16000, key=None,
+                      token_id=None):
+        """Build the signed connect/start payload sent alongside the audio.
         
         Args:
-            audio_path (str): Path to the audio file
-            ref_text (str): Reference text for evaluation
-            core_type (str): API evaluation type (default: word.eval.promax)
+            request (dict): The "request" section (coreType, refText, ...)
             audio_type (str): Audio file format (default: wav)
             audio_sample_rate (int): Audio sample rate (default: 16000)
+            key (ApiKey): Credentials to sign with (default: the client's own)
+            token_id (str): Identifier of this request (default: a new random one)
             
         Returns:
-            dict: Evaluation results from the API
+            dict: Parameters for the "text" form field
         """
         timestamp = self._generate_timestamp()
-        connect_sig, start_sig = self._generate_signatures(timestamp)
-        
-        url = self.base_url + core_type
-        
-        params = {
+        connect_sig, start_sig = self._generate_signatures(timestamp, key)
+        return self._payload(request, self._audio_params(audio_type, audio_sample_rate),
+                             (key or self).app_key, timestamp, connect_sig, start_sig,
+                             token_id or self._generate_token_id())
+    
+    def _generate_token_id(self):
+        """Generate a unique tokenId, so every request can be told apart in API logs."""
+        return uuid.uuid4().hex
+    
+    def _payload(self, request, audio, app_key, timestamp, connect_sig, start_sig, token_id):
+        """Assemble the connect/start payload from its parts."""
+        return {
             "connect": {
                 "cmd": "connect",
                 "param": {
@@ -79,7 +137,7 @@ class SuperSpeech:
                         "protocol": 2
                     },
                     "app": {
-                        "applicationId": self.app_key,
+                        "applicationId": app_key,
                         "sig": connect_sig,
                         "timestamp": timestamp
                     }
@@ -90,118 +148,926 @@ class SuperSpeech:
                 "param": {
                     "app": {
                         "userId": self.user_id,
-                        "applicationId": self.app_key,
+                        "applicationId": app_key,
                         "timestamp": timestamp,
                         "sig": start_sig
                     },
-                    "audio": {
-                        "audioType": audio_type,
-                        "channel": 1,
-                        "sampleBytes": 2,
-                        "sampleRate": audio_sample_rate
-                    },
-                    "request": {
-                        "coreType": core_type,
-                        "refText": ref_text,
-                        "tokenId": "tokenId"
-                    }
+                    "audio": audio,
+                    "request": dict(request, tokenId=token_id)
                 }
             }
         }
+    
+    def _serialize_params(self, request, audio_type="wav", audio_sample_rate=16000, key=None,
+                          token_id=None):
+        """Build the signed payload as JSON text, the same as json.dumps(_build_params(...)).
+        
+        The payload is serialized once per request shape (core type, request fields
+        and audio format); later calls only fill in the credentials, timestamp,
+        signatures, tokenId and request values.
+        
+        Returns:
+            str: Value of the "text" form field
+        """
+        shape = (request["coreType"], tuple(request), audio_type, audio_sample_rate)
+        template = self._templates.get(shape)
+        if template is None:
+            variable = {name: slot(name) for name in request if name != "coreType"}
+            template = PayloadTemplate(self._payload(
+                dict(request, **variable), self._audio_params(audio_type, audio_sample_rate),
+                slot("app_key"), slot("timestamp"), slot("connect_sig"), slot("start_sig"),
+                slot("tokenId")))
+            self._templates[shape] = template
+        
+        timestamp = self._generate_timestamp()
+        connect_sig, start_sig = self._generate_signatures(timestamp, key)
+        return template.render(dict(request, app_key=(key or self).app_key, timestamp=timestamp,
+                                    connect_sig=connect_sig, start_sig=start_sig,
+                                    tokenId=token_id or self._generate_token_id()))
+    
+    def _audio_params(self, audio_type="wav", audio_sample_rate=16000):
+        """Build the "audio" section describing the uploaded recording."""
+        return {
+            "audioType": audio_type,
+            "channel": 1,
+            "sampleBytes": 2,
+            "sampleRate": audio_sample_rate
+        }
+    
+    def _pronunciation_request(self, ref_text, core_type="word.eval.promax"):
+        """Build the "request" section for a word/sentence pronunciation evaluation."""
+        return {
+            "coreType": core_type,
+            "refText": ref_text
+        }
+    
+    def _spontaneous_request(self, question_prompt, test_type="ielts", model="non_native",
+                             penalize_offtopic=1):
+        """Build the "request" section for a spontaneous speech (speak.eval.pro) evaluation."""
+        return {
+            "coreType": "speak.eval.pro",
+            "testType": test_type,
+            "questionPrompt": question_prompt,
+            "model": model,
+            "penalizeOfftopic": penalize_offtopic
+        }
+    
+    def _build_pronunciation_params(self, ref_text, core_type="word.eval.promax",
+                                    audio_type="wav", audio_sample_rate=16000):
+        """Build the payload for a word/sentence pronunciation evaluation."""
+        request = self._pronunciation_request(ref_text, core_type)
+        return self._build_params(request, audio_type, audio_sample_rate)
+    
+    def _build_spontaneous_params(self, question_prompt, test_type="ielts", model="non_native",
+                                  penalize_offtopic=1, audio_type="wav", audio_sample_rate=16000):
+        """Build the payload for a spontaneous speech (speak.eval.pro) evaluation."""
+        request = self._spontaneous_request(question_prompt, test_type, model, penalize_offtopic)
+        return self._build_params(request, audio_type, audio_sample_rate)
+    
+    def _prepare_audio(self, source, audio_type="wav", audio_sample_rate=16000):
+        """With normalize_audio, convert WAV input to 16 kHz 16-bit mono.
         
-        data = {'text': json.dumps(params)}
-        headers = {"Request-Index": "0"}
+        Call it after _preflight(), so a request that would be rejected is not converted.
         
+        Returns:
+            tuple: (AudioSource, sample rate to declare), the rate taken from the audio
+                itself whenever its header can be read
+        """
+        if not self.normalize_audio or audio_type != "wav":
+            return source, audio_sample_rate
+        source, sample_rate = normalize(source)
+        return source, sample_rate or audio_sample_rate
+    
+    def _encode(self, source, audio_type="wav"):
+        """Compress WAV audio with the client's encoder, falling back to the WAV on failure.
+        
+        Returns:
+            tuple: (AudioSource, audio type to declare)
+        """
+        if self.encoder is None or audio_type != "wav":
+            return source, audio_type
         try:
-            with open(audio_path, 'rb') as audio_file:
-                files = {"audio": audio_file}
-                response = requests.post(url, data=data, headers=headers, files=files)
-                
-                print(f"Response status code: {response.status_code}")
-                print(f"Response text: {response.text}")
-                
-                if response.text.strip():
-                    return json.loads(response.text)
-                else:
-                    return {"error": f"Empty response from API. Status code: {response.status_code}"}
-        except json.JSONDecodeError as e:
-            return {"error": f"JSON decode error: {str(e)}. Raw response: {response.text}"}
+            encoded = encode_source(self.encoder, source)
         except Exception as e:
-            return {"error": str(e)}
+            logger.warning("Compressing the upload to %s failed, sending WAV: %s", self.encoder.audio_type, e)
+            return source, audio_type
+        if encoded is None:
+            return source, audio_type
+        return encoded, self.encoder.audio_type
+    
+    def _preflight(self, request, source=None, audio_type="wav", audio_sample_rate=16000):
+        """Raise PreflightError for a request the API would reject, if preflight is enabled.
+        
+        Runs on the audio as given; with normalize_audio, WAV audio is checked only for
+        the properties conversion does not change.
+        """
+        if self.preflight:
+            preflight(request, source, audio_type, audio_sample_rate, convert=self.normalize_audio)
+    
+    def _decode_response(self, status_code, text, report_empty=True):
+        """Turn the raw response body into the result dict handed back to callers.
+        
+        Args:
+            status_code (int): HTTP status code
+            text (str): Response body
+            report_empty (bool): Return error dicts for empty or malformed bodies
+                instead of raising (default: True)
+            
+        Returns:
+            dict: Evaluation results from the API (an EvaluationResult with typed_results)
+        """
+        if self.typed_results:
+            if report_empty and not text.strip():
+                return self._as_result({"error": f"Empty response from API. Status code: {status_code}"})
+            # Decoded lazily, when the caller first reads a field
+            return EvaluationResult(text)
+        if not report_empty:
+            return json_loads(text)
+        if not text.strip():
+            return {"error": f"Empty response from API. Status code: {status_code}"}
+        try:
+            return json_loads(text)
+        except json.JSONDecodeError as e:
+            return {"error": f"JSON decode error: {str(e)}. Raw response: {text}"}
+    
+    def _as_result(self, result):
+        """Convert a result dict to an EvaluationResult when typed_results is on."""
+        if self.typed_results and isinstance(result, dict):
+            return EvaluationResult.from_dict(result)
+        return result
+
+
+class SuperSpeech(BaseSpeechClient):
+    def __init__(self, app_key=None, secret_key=None, pool_size=10, keep_alive=True,
+                 warm_up=False, base_url=None, cache=None, coalesce=False,
+                 streaming_threshold=1024 * 1024, timeout=(5, 30), deadline=None,
+                 retry=None, breaker=None, rate_limiter=None, adaptive=None, hedge=None,
+                 keys=None, typed_results=False, transport=None, preflight=True,
+                 normalize_audio=True, compress=None):
+        """Initialize SuperSpeech with your API credentials.
+        
+        Args:
+            app_key (str): Your SpeechSuper application key (optional, defaults to environment variable)
+            secret_key (str): Your SpeechSuper secret key (optional, defaults to environment variable)
+            pool_size (int): Maximum number of pooled connections to the API host (default: 10)
+            keep_alive (bool): Reuse connections between requests (default: True)
+            warm_up (bool): Open a connection to the API host right away (default: False)
+            base_url (str): API base URL (optional, defaults to https://api.speechsuper.com/)
+            cache (ResultCache or str): Result cache, or a path to open one at (default: no caching)
+            coalesce (bool): Share one API call between concurrent identical evaluations (default: False)
+            streaming_threshold (int): Stream uploads of at least this many bytes from disk in
+                chunks instead of building the request in memory; None disables (default: 1 MiB)
+            timeout (tuple): (connect, read) timeouts in seconds for each attempt (default: (5, 30))
+            deadline (float): Seconds one evaluation may take across all its retries (default: no limit)
+            retry (RetryPolicy): Retry policy for connection errors, timeouts, 5xx responses and
+                empty bodies (default: RetryPolicy(), 3 attempts with jittered backoff)
+            breaker (CircuitBreaker): Circuit breaker that fails fast while the API is down
+                (default: CircuitBreaker(), opens after 5 consecutive failures for 30 seconds)
+            rate_limiter (RateLimiter): Requests/second and concurrency limits shared by all calls,
+                with "interactive" calls served before "bulk" ones (default: no limit)
+            adaptive (AIMDLimiter): Adaptive limit on concurrent evaluate_batch/evaluate_stream
+                jobs, driven by latency, timeouts and rate-limit errors (default: fixed worker count)
+            hedge (HedgePolicy): Send a duplicate request when a call runs past a percentile of
+                recent latency and keep the first successful answer (default: no hedging)
+            keys (KeyPool or list): Several credentials to spread requests over by remaining
+                quota and error rate; rejected keys rest until a probe succeeds (default: one key)
+            typed_results (bool): Return EvaluationResult objects, decoded lazily from the
+                response bytes, instead of dicts (default: False)
+            transport (Transport or str): HTTP transport: "requests", "httpx", "http2", "fake"
+                or a Transport instance (default: "requests", a pooled requests session)
+            preflight (bool): Reject requests the API is known to refuse (audio too long, wrong
+                sample rate, several words for a word core type, missing fields) locally,
+                reading only the WAV header (default: True)
+            normalize_audio (bool): Downmix, resample and requantize WAV audio that is not
+                16 kHz 16-bit mono before uploading it, and declare the audio's real format;
+                requires numpy for audio that needs converting (default: True)
+            compress (str or Encoder): Encode WAV audio to a compressed format the API accepts
+                before upload, on a background thread: "ogg", "mp3", "auto" (the first one
+                available) or an Encoder; needs soundfile or ffmpeg (default: None, upload WAV)
+        """
+        super().__init__(app_key, secret_key, base_url, keys, typed_results, preflight,
+                         normalize_audio, compress)
+        
+        # Optional on-disk cache of successful results
+        self.cache = ResultCache(cache) if isinstance(cache, str) else cache
+        self._flights = SingleFlight() if coalesce else None
+        self.streaming_threshold = streaming_threshold
+        
+        # Failure handling
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter
+        self.adaptive = adaptive
+        self.hedge = hedge
+        self.speculation = SpeculationStats()
+        self._hedge_executor = None
+        self._encode_executor = None
+        self._local = threading.local()
+        
+        # Connection pool shared by every thread using this client
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.transport = make_transport(transport, pool_size, keep_alive)
+        self._lock = threading.Lock()
+        
+        if warm_up:
+            self.warm_up()
+    
+    def warm_up(self, timeout=5):
+        """Open a pooled connection to the API host ahead of the first evaluation.
+        
+        Args:
+            timeout (float): Seconds to wait for the host (default: 5)
+            
+        Returns:
+            bool: True if the host could be reached
+        """
+        try:
+            self.transport.head(self.base_url, timeout=timeout)
+            return True
+        except requests.RequestException:
+            return False
+    
+    def close(self):
+        """Close all pooled connections. The client reopens them if used again."""
+        with self._lock:
+            executors = (self._hedge_executor, self._encode_executor)
+            self._hedge_executor = self._encode_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.transport.close()
+    
+    @property
+    def coalesced_calls(self):
+        """Number of API calls saved by sharing an identical in-flight evaluation."""
+        return self._flights.saved if self._flights is not None else 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def evaluate_pronunciation(self, audio_path, ref_text, core_type="word.eval.promax", 
+                              audio_type="wav", audio_sample_rate=16000, use_cache=True,
+                              deadline=None, priority="interactive"):
+        """Evaluate pronunciation using SpeechSuper API.
+        
+        Args:
+            audio_path: Path to the audio file, or the audio itself as WAV/PCM bytes,
+                a buffer, a binary file-like object or an int16 NumPy array
+            ref_text (str): Reference text for evaluation
+            core_type (str): API evaluation type (default: word.eval.promax)
+            audio_type (str): Audio file format (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+            use_cache (bool): Set to False to bypass the result cache for this call (default: True)
+            deadline (float): Seconds this call may take across retries (default: the client's deadline)
+            priority (str): Rate limiter lane, "interactive" or "bulk" (default: interactive)
+            
+        Returns:
+            dict: Evaluation results from the API
+        """
+        request = self._pronunciation_request(ref_text, core_type)
+        return self._evaluate(audio_path, request, audio_type, audio_sample_rate,
+                              use_cache=use_cache, deadline=deadline, priority=priority)
     
     def evaluate_spontaneous_speech(self, audio_path, question_prompt, 
                                    test_type="ielts", model="non_native", 
                                    penalize_offtopic=1, audio_type="wav", 
-                                   audio_sample_rate=16000):
+                                   audio_sample_rate=16000, use_cache=True, deadline=None,
+                                   priority="interactive"):
         """Evaluate spontaneous speech using SpeechSuper API.
         
         Args:
-            audio_path (str): Path to the audio file
+            audio_path: Path to the audio file, or the audio itself (see evaluate_pronunciation)
             question_prompt (str): Question prompt for scoring relevance
             test_type (str): Test type (default: ielts)
             model (str): Transcription model (default: non_native)
             penalize_offtopic (int): Whether to penalize off-topic responses (default: 1)
             audio_type (str): Audio file format (default: wav)
             audio_sample_rate (int): Audio sample rate (default: 16000)
+            use_cache (bool): Set to False to bypass the result cache for this call (default: True)
+            deadline (float): Seconds this call may take across retries (default: the client's deadline)
+            priority (str): Rate limiter lane, "interactive" or "bulk" (default: interactive)
             
         Returns:
             dict: Evaluation results from the API
         """
-        timestamp = self._generate_timestamp()
-        connect_sig, start_sig = self._generate_signatures(timestamp)
+        request = self._spontaneous_request(question_prompt, test_type, model, penalize_offtopic)
+        return self._evaluate(audio_path, request, audio_type, audio_sample_rate,
+                              report_empty=False, use_cache=use_cache, deadline=deadline,
+                              priority=priority)
+    
+    def evaluate_long_speech(self, audio_path, question_prompt, test_type="ielts", model="non_native",
+                             penalize_offtopic=1, audio_sample_rate=16000,
+                             max_segment_seconds=MAX_SEGMENT_SECONDS, max_workers=None,
+                             use_cache=True, priority="interactive"):
+        """Evaluate spontaneous speech longer than the API accepts in one request.
         
-        url = self.base_url + "speak.eval.pro"
+        The recording is split at pauses into segments of at most max_segment_seconds,
+        taken as views of the (memory-mapped) audio rather than copies. The segments
+        are evaluated concurrently and their results merged by merge_results().
         
-        params = {
-            "connect": {
-                "cmd": "connect",
-                "param": {
-                    "sdk": {
-                        "version": 16777472,
-                        "source": 9,
-                        "protocol": 2
-                    },
-                    "app": {
-                        "applicationId": self.app_key,
-                        "sig": connect_sig,
-                        "timestamp": timestamp
-                    }
-                }
-            },
-            "start": {
-                "cmd": "start",
-                "param": {
-                    "app": {
-                        "userId": self.user_id,
-                        "applicationId": self.app_key,
-                        "timestamp": timestamp,
-                        "sig": start_sig
-                    },
-                    "audio": {
-                        "audioType": audio_type,
-                        "channel": 1,
-                        "sampleBytes": 2,
-                        "sampleRate": audio_sample_rate
-                    },
-                    "request": {
-                        "coreType": "speak.eval.pro",
-                        "testType": test_type,
-                        "questionPrompt": question_prompt,
-                        "model": model,
-                        "penalizeOfftopic": penalize_offtopic,
-                        "tokenId": "tokenId"
-                    }
-                }
-            }
-        }
+        Args:
+            audio_path: Path to a WAV file, or WAV or raw 16-bit PCM audio in memory;
+                compressed audio (MP3, OGG, FLAC) is refused
+            question_prompt (str): Question prompt for scoring relevance
+            test_type (str): Test type (default: ielts)
+            model (str): Transcription model (default: non_native)
+            penalize_offtopic (int): Whether to penalize off-topic responses (default: 1)
+            audio_sample_rate (int): Sample rate of raw PCM input (default: 16000)
+            max_segment_seconds (float): Longest segment sent (default: 85.0)
+            max_workers (int): Segments evaluated at once (default: as for evaluate_batch)
+            use_cache (bool): Set to False to bypass the result cache (default: True)
+            priority (str): Rate limiter lane, "interactive" or "bulk" (default: interactive)
+            
+        Returns:
+            dict: One merged result, with duration-weighted scores, word timings on the
+                timeline of the whole recording and a result["segments"] breakdown, or
+                {"error": ...} if the audio cannot be read or split
+        """
+        try:
+            samples, rate = load_samples(audio_path, audio_sample_rate)
+            segments = split_at_pauses(samples, rate, max_segment_seconds)
+        except Exception as e:
+            return self._as_result({"error": str(e)})
+        if not segments:
+            return self._as_result({"error": "No speech detected in the audio"})
+        items = [{"audio_path": segment.samples, "question_prompt": question_prompt,
+                  "test_type": test_type, "model": model, "penalize_offtopic": penalize_offtopic,
+                  "audio_sample_rate": rate, "use_cache": use_cache, "priority": priority}
+                 for segment in segments]
+        records = self.evaluate_batch(items, max_workers=max_workers)
+        results = [record["result"].raw if isinstance(record["result"], EvaluationResult)
+                   else record["result"] for record in records]
+        return self._as_result(merge_results(segments, results))
+    
+    def stream_pronunciation(self, ref_text, core_type="word.eval.promax", audio_type="wav",
+                             audio_sample_rate=16000, ws_url=None, result_timeout=30):
+        """Start a pronunciation evaluation that uploads audio while it is recorded.
+        
+        Call send() on the returned session with each recorded chunk of 16-bit
+        mono PCM, then finish() to get the result once the learner stops.
+        
+        Args:
+            ref_text (str): Reference text for evaluation
+            core_type (str): API evaluation type (default: word.eval.promax)
+            audio_type (str): Audio format of the frames (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+            ws_url (str): WebSocket base URL (default: base_url with ws:// or wss://)
+            result_timeout (float): Seconds finish() waits for the result (default: 30)
+            
+        Returns:
+            StreamingSession: The open session
+            
+        Raises:
+            PreflightError: If the request is one the API would reject
+        """
+        request = self._pronunciation_request(ref_text, core_type)
+        self._preflight(request, None, audio_type, audio_sample_rate)
+        return StreamingSession(self, request, self._websocket_url(core_type, ws_url),
+                                audio_type, audio_sample_rate, result_timeout=result_timeout)
+    
+    def stream_spontaneous_speech(self, question_prompt, test_type="ielts", model="non_native",
+                                  penalize_offtopic=1, audio_type="wav", audio_sample_rate=16000,
+                                  ws_url=None, result_timeout=30):
+        """Start a spontaneous speech evaluation that uploads audio while it is recorded.
+        
+        Args:
+            question_prompt (str): Question prompt for evaluation
+            test_type (str): Type of test (default: ielts)
+            model (str): Evaluation model (default: non_native)
+            penalize_offtopic (int): Whether to penalize off-topic responses (default: 1)
+            audio_type (str): Audio format of the frames (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+            ws_url (str): WebSocket base URL (default: base_url with ws:// or wss://)
+            result_timeout (float): Seconds finish() waits for the result (default: 30)
+            
+        Returns:
+            StreamingSession: The open session
+            
+        Raises:
+            PreflightError: If the request is one the API would reject
+        """
+        request = self._spontaneous_request(question_prompt, test_type, model, penalize_offtopic)
+        self._preflight(request, None, audio_type, audio_sample_rate)
+        return StreamingSession(self, request, self._websocket_url(request["coreType"], ws_url),
+                                audio_type, audio_sample_rate, result_timeout=result_timeout)
+    
+    def _websocket_url(self, core_type, ws_url=None):
+        """WebSocket endpoint of a core type, derived from base_url unless given."""
+        if ws_url is None:
+            ws_url = self.base_url
+            if ws_url.startswith("https://"):
+                ws_url = "wss://" + ws_url[len("https://"):]
+            elif ws_url.startswith("http://"):
+                ws_url = "ws://" + ws_url[len("http://"):]
+        if not ws_url.endswith("/"):
+            ws_url += "/"
+        return ws_url + core_type
+    
+    def evaluate_speculative(self, audio_path, variants, audio_type="wav", audio_sample_rate=16000,
+                             deadline=None):
+        """Evaluate several (core_type, ref_text) variants at once and keep the first success.
         
-        data = {'text': json.dumps(params)}
-        headers = {"Request-Index": "0"}
+        Use it instead of trying variants one after another (e.g. word.eval.kr and
+        sent.eval.kr, or romanized and Hangul text). Variants the preflight check
+        rejects are never sent. Once one variant succeeds the others stop retrying
+        and those still queued are cancelled; uploads already under way cannot be
+        interrupted and their answers are discarded. Counters are kept in self.speculation.
+        
+        Args:
+            audio_path: The audio, in any form evaluate_pronunciation accepts
+            variants (list): (core_type, ref_text) tuples, most likely first
+            audio_type (str): Audio file format (default: wav)
+            audio_sample_rate (int): Audio sample rate (default: 16000)
+            deadline (float): Seconds each variant may take across retries (default: the client's deadline)
+            
+        Returns:
+            dict: "result" (the first successful result, or the first variant's error if
+                none succeeded), "variant" (the winning (core_type, ref_text), or None),
+                "requests" (variants sent to the API), "cancelled" (variants stopped before
+                being sent) and "elapsed" (seconds)
+        """
+        start = time.monotonic()
+        variants = [tuple(variant) for variant in variants]
+        if not variants:
+            raise ValueError("evaluate_speculative needs at least one variant")
+        if hasattr(audio_path, "read"):
+            # Every variant uploads the audio, so a caller's stream is read only once
+            audio_path = audio_path.read()
         
+        executor = self._background_executor()
+        cancelled = threading.Event()
+        results = {}
+        futures = {}
+        started = set()
+        lock = threading.Lock()
+        
+        def run(position, request):
+            with lock:
+                if cancelled.is_set():
+                    return self._as_result({"error": CANCELLED_ERROR})
+                started.add(position)
+            result = self._evaluate(audio_path, request, audio_type, audio_sample_rate,
+                                    deadline=deadline, cancelled=cancelled)
+            if "error" not in result:
+                # Stop the others right away: a worker freed by this variant must not
+                # pick up a queued one before the waiting thread gets to cancel it
+                cancelled.set()
+            return result
+        
+        for position, (core_type, ref_text) in enumerate(variants):
+            request = self._pronunciation_request(ref_text, core_type)
+            try:
+                self._preflight(request, None, audio_type, audio_sample_rate)
+            except PreflightError as e:
+                results[position] = self._as_result({"error": str(e)})
+                continue
+            future = executor.submit(run, position, request)
+            futures[future] = position
+        
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = futures[future]
+                results[position] = future.result()
+                if "error" not in results[position] and (winner is None or position < winner):
+                    winner = position
+        with lock:
+            cancelled.set()
+            # Variants that began before this count as sent unless they are known to have stopped
+            stopped = sum(1 for position in started
+                          if results.get(position, {}).get("error") == CANCELLED_ERROR)
+            requests = len(started) - stopped
+        for future in pending:
+            future.cancel()
+        skipped = len(futures) - requests
+        
+        variant = variants[winner] if winner is not None else None
+        # Without a winner every variant has finished; report the most likely one's error
+        result = results[winner if winner is not None else min(results)]
+        self.speculation.record(variant, winner, requests, skipped)
+        logger.debug("Speculative evaluation: winner %s, %d request(s), %d cancelled",
+                     variant, requests, skipped)
+        return {"result": result, "variant": variant, "requests": requests,
+                "cancelled": skipped, "elapsed": time.monotonic() - start}
+    
+    def _evaluate(self, audio_path, request, audio_type="wav", audio_sample_rate=16000,
+                  report_empty=True, use_cache=True, deadline=None, priority="interactive",
+                  cancelled=None):
+        """Run one evaluation, answering from the result cache or a matching
+        in-flight call when possible. Setting the cancelled event stops its retries.
+        
+        Returns:
+            dict: Evaluation results, or {"error": ...} on failure
+        """
+        use_cache = use_cache and self.cache is not None
+        self._local.retries = 0
+        
+        def attempt(cancelled=cancelled):
+            upload, upload_type = encoding.result() if encoding is not None else (source, audio_type)
+            return self._call_with_retries(request, upload, upload_type, audio_sample_rate,
+                                           report_empty, deadline, priority, cancelled)
+        
+        def call():
+            # Bulk work is throughput-bound, so only interactive calls are hedged; speculative
+            # calls are redundant already
+            if (self.hedge is not None and priority == "interactive" and source.shareable
+                    and cancelled is None):
+                result = self._hedged(attempt)
+            else:
+                result = attempt()
+            if use_cache:
+                self.cache.put(key, result)
+            return result
+        
+        encoding = None
         try:
-            with open(audio_path, 'rb') as audio_file:
-                files = {"audio": audio_file}
-                response = requests.post(url, data=data, headers=headers, files=files)
-                return json.loads(response.text)
+            source = AudioSource(audio_path, audio_type, audio_sample_rate)
+            # Only the header is read here; the audio is converted once the request passes
+            self._preflight(request, source, audio_type, audio_sample_rate)
+            source, audio_sample_rate = self._prepare_audio(source, audio_type, audio_sample_rate)
+            if self.encoder is not None and audio_type == "wav":
+                # Compress in the background while the cache key is computed
+                encoding = self._encode_in_background(source, audio_type)
+            if not use_cache and self._flights is None:
+                return self._as_result(call())
+            
+            # Compressed uploads may score slightly differently, so they are cached apart
+            key_type = self.encoder.audio_type if encoding is not None else audio_type
+            key = cache_key(source, request, self._audio_params(key_type, audio_sample_rate))
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    if encoding is not None:
+                        encoding.cancel()
+                    return self._as_result(cached)
+            if self._flights is not None:
+                # report_empty changes the result format, so it is part of the identity
+                return self._as_result(self._flights.do((key, report_empty), call))
+            return self._as_result(call())
         except Exception as e:
-            return {"error": str(e)}
+            return self._as_result({"error": str(e)})
+    
+    def _hedged(self, attempt):
+        """Run attempt(), adding a duplicate if it is slow, and return the first success.
+        
+        The losing request cannot be interrupted mid-upload; it is told to stop
+        retrying and its answer is discarded.
+        """
+        executor = self._background_executor()
+        cancelled = threading.Event()
+        start = time.monotonic()
+        primary = executor.submit(attempt, cancelled)
+        primary.add_done_callback(lambda future: self.hedge.record(time.monotonic() - start))
+        
+        pending = {primary}
+        delay = self.hedge.delay()
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and self.hedge.try_hedge():
+                pending.add(executor.submit(attempt, cancelled))
+        
+        result = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": str(e)}
+                if "error" not in result:
+                    cancelled.set()
+                    if future is not primary:
+                        self.hedge.record_win()
+                    return result
+        return result
+    
+    def _encode_in_background(self, source, audio_type):
+        """Start compressing the upload; returns a Future of (AudioSource, audio type)."""
+        with self._lock:
+            if self._encode_executor is None:
+                self._encode_executor = ThreadPoolExecutor(
+                    max_workers=min(self.pool_size, os.cpu_count() or 1),
+                    thread_name_prefix="superspeech-encode")
+            executor = self._encode_executor
+        return executor.submit(self._encode, source, audio_type)
+    
+    def _background_executor(self):
+        """Thread pool for hedged and speculative requests, created on first use."""
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.pool_size)
+            return self._hedge_executor
+    
+    def _should_stream(self, source):
+        """Whether an upload is large enough to go through the streaming encoder."""
+        if self.streaming_threshold is None:
+            return False
+        try:
+            return source.size >= self.streaming_threshold
+        except OSError:
+            # Let the regular upload path report unreadable files
+            return False
+    
+    def _call_with_retries(self, request, source, audio_type, audio_sample_rate,
+                           report_empty=True, deadline=None, priority="interactive", cancelled=None):
+        """Send one evaluation, retrying transient failures within the deadline.
+        
+        Transport errors (requests.RequestException), 5xx responses and empty bodies are retried with
+        jittered exponential backoff. Every attempt is reported to the circuit breaker,
+        and no attempt is made while it is open. Each attempt also waits for the rate
+        limiter in the given priority lane. Setting the cancelled event stops further attempts.
+        
+        Returns:
+            dict: Evaluation results, or {"error": ...} on failure
+        """
+        deadline = deadline if deadline is not None else self.deadline
+        expires = time.monotonic() + deadline if deadline is not None else None
+        attempt = 0
+        
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                return {"error": CANCELLED_ERROR}
+            if not self.breaker.allow():
+                return {"error": "Circuit breaker open: SpeechSuper API is failing, "
+                                 f"retry in {self.breaker.retry_after():.1f}s"}
+            
+            reported = False
+            try:
+                if self.rate_limiter is not None:
+                    patience = None if expires is None else max(0.0, expires - time.monotonic())
+                    if not self.rate_limiter.acquire(priority, timeout=patience):
+                        return {"error": f"Deadline of {deadline}s exceeded waiting for the rate limiter"}
+                key = None
+                outcome = "error"
+                try:
+                    timeout = self.timeout
+                    if expires is not None:
+                        remaining = expires - time.monotonic()
+                        if remaining <= 0:
+                            return {"error": f"Deadline of {deadline}s exceeded after {attempt} attempt(s)"}
+                        connect_timeout, read_timeout = timeout
+                        timeout = (min(connect_timeout, remaining), min(read_timeout, remaining))
+                
+                    if self.keys is not None:
+                        key = self.keys.acquire()
+                        if key is None:
+                            return {"error": "No API key available: every key is out of quota or "
+                                             f"rejected, retry in {self.keys.retry_after():.1f}s"}
+                
+                    # Signatures are tied to the timestamp, so every attempt is signed afresh
+                    params = self._serialize_params(request, audio_type, audio_sample_rate, key)
+                    error = None
+                    try:
+                        status_code, text = self._send(request["coreType"], params, source, timeout)
+                        retryable = (isinstance(status_code, int) and status_code >= 500) or not text.strip()
+                        if key is not None:
+                            outcome = self.keys.outcome(status_code, text)
+                        if status_code in (429, 503):
+                            self._local.congested = True
+                    except requests.RequestException as e:
+                        error = e
+                        retryable = True
+                        if isinstance(e, requests.Timeout):
+                            self._local.congested = True
+                finally:
+                    if key is not None:
+                        self.keys.release(key, outcome)
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.release()
+            
+                # A key rejected for its credentials or quota says nothing about the
+                # API's health, so it is not reported (a probe is released instead);
+                # the next attempt simply goes out with another key
+                key_rejected = key is not None and outcome in ("auth", "quota")
+                if not key_rejected:
+                    reported = True
+                    if retryable:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                        return self._decode_response(status_code, text, report_empty)
+            finally:
+                if not reported:
+                    # A probe that ends without an outcome must not keep the circuit half open
+                    self.breaker.release()
+            
+            attempt += 1
+            delay = 0.0 if key_rejected else self.retry.backoff(attempt)
+            out_of_time = expires is not None and time.monotonic() + delay >= expires
+            if attempt >= self.retry.max_attempts or out_of_time:
+                if error is not None:
+                    raise error
+                return self._decode_response(status_code, text, report_empty)
+            
+            self._local.retries = attempt
+            logger.info("Retrying %s (attempt %d of %d) in %.2fs", request["coreType"],
+                        attempt + 1, self.retry.max_attempts, delay)
+            time.sleep(delay)
+    
+    def _send(self, core_type, params, source, timeout=None):
+        """Upload the audio with its payload through the transport.
+        
+        Args:
+            core_type (str): API evaluation type, appended to the base URL
+            params (str): Serialized payload for the "text" form field
+            source (AudioSource): The audio to upload
+            timeout (tuple): (connect, read) timeouts in seconds (default: none)
+            
+        Returns:
+            tuple: (status_code, response text)
+        """
+        url = self.base_url + core_type
+        
+        # Large uploads are streamed chunk by chunk instead of built in memory
+        response = self.transport.post(url, {'text': params}, source, headers={"Request-Index": "0"},
+                                       timeout=timeout, stream=self._should_stream(source))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            # Sentence results can be large, so the body is only decoded when logged
+            logger.debug("%s answered %s: %s", core_type, response.status_code, response.text)
+        
+        # Typed results are decoded lazily from the raw bytes
+        return response.status_code, response.content if self.typed_results else response.text
+    
+    def evaluate_batch(self, items, max_workers=None, retries=0):
+        """Evaluate many recordings in parallel.
+        
+        Args:
+            items (iterable): (audio_path, ref_text[, core_type]) tuples, or dicts of
+                evaluate_pronunciation keyword arguments. Dicts with a "question_prompt"
+                key are sent to evaluate_spontaneous_speech instead. A malformed item
+                gets a record with its error; the other items still run.
+            max_workers (int): Number of worker threads (default: pool_size, or the adaptive
+                limiter's max_limit; the adaptive limit then decides how many actually run)
+            retries (int): Extra attempts for items that fail before reaching the API,
+                e.g. on connection errors (default: 0)
+            
+        Returns:
+            list: One record per item, in input order, with keys "index", "result",
+                "error" (None on success), "elapsed" (seconds) and "retries" (item retries
+                plus the client's own retries of transient failures)
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self._default_workers()) as executor:
+            futures = [executor.submit(self._run_job, index, item, retries)
+                       for index, item in enumerate(items)]
+            return [future.result() for future in futures]
+    
+    def evaluate_stream(self, items, max_workers=None, max_in_flight=None,
+                        max_in_flight_bytes=64 * 1024 * 1024, ordered=False, retries=0):
+        """Evaluate a (possibly endless) iterable of recordings, yielding results as they finish.
+        
+        Items are pulled from the iterable only when there is room in the in-flight
+        window, so memory stays flat however long the input is.
+        
+        Args:
+            items (iterable): Same item formats as evaluate_batch
+            max_workers (int): Number of worker threads (default: as for evaluate_batch)
+            max_in_flight (int): Maximum jobs submitted but not yet yielded (default: 2 * max_workers)
+            max_in_flight_bytes (int): Maximum total audio size of in-flight jobs (default: 64 MiB).
+                A single larger job is still run, on its own.
+            ordered (bool): Yield in input order instead of completion order (default: False)
+            retries (int): Extra attempts for items that fail before reaching the API (default: 0)
+            
+        Yields:
+            dict: Result records in the same format as evaluate_batch
+        """
+        max_workers = max_workers or self._default_workers()
+        max_in_flight = max_in_flight or 2 * max_workers
+        
+        source = enumerate(items)
+        held = None          # next (index, item, size) waiting for window space
+        pending = {}         # future -> audio size in bytes
+        finished = {}        # ordered mode: index -> record not yet yielded
+        next_index = 0
+        in_flight_bytes = 0
+        exhausted = False
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while True:
+                # Top up the window; completed-but-unyielded records still count
+                while not exhausted and len(pending) + len(finished) < max_in_flight:
+                    if held is None:
+                        try:
+                            index, item = next(source)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        held = (index, item, self._job_size(item))
+                    index, item, size = held
+                    if pending and in_flight_bytes + size > max_in_flight_bytes:
+                        break
+                    future = executor.submit(self._run_job, index, item, retries)
+                    pending[future] = size
+                    in_flight_bytes += size
+                    held = None
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight_bytes -= pending.pop(future)
+                    record = future.result()
+                    if ordered:
+                        finished[record["index"]] = record
+                    else:
+                        yield record
+                
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            # Runs on normal exit and when the consumer stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _default_workers(self):
+        """Worker threads for batch/stream when the caller does not choose."""
+        if self.adaptive is not None:
+            return self.adaptive.max_limit
+        return self.pool_size
+    
+    def _job_size(self, item):
+        """Size of the audio a batch item uploads, used for in-flight accounting."""
+        try:
+            audio = self._normalize_job(item)["audio_path"]
+            if isinstance(audio, (str, os.PathLike)):
+                return os.path.getsize(audio)
+            return AudioSource(audio).size
+        except (KeyError, TypeError, ValueError, OSError):
+            return 0
+    
+    def _normalize_job(self, item):
+        """Turn a batch item into keyword arguments for an evaluate method."""
+        if isinstance(item, dict):
+            job = dict(item)
+        else:
+            # A bare path or audio buffer would otherwise be unpacked byte by byte
+            if isinstance(item, (str, bytes, bytearray, memoryview)):
+                raise TypeError(f"Batch items must be tuples or dicts, got {type(item).__name__}")
+            try:
+                audio_path, ref_text, *rest = item
+            except (TypeError, ValueError):
+                raise TypeError("Batch items must be (audio_path, ref_text[, core_type]) tuples or dicts, "
+                                f"got {type(item).__name__}") from None
+            job = {"audio_path": audio_path, "ref_text": ref_text}
+            if rest:
+                job["core_type"] = rest[0]
+        # Bulk work yields to interactive callers in the rate limiter
+        job.setdefault("priority", "bulk")
+        return job
+    
+    def _run_job(self, index, item, retries=0):
+        """Evaluate one batch item and wrap the outcome in a result record."""
+        try:
+            job = self._normalize_job(item)
+        except TypeError as e:
+            # A malformed item fails on its own, without holding up the rest of the batch
+            return {"index": index, "result": {"error": str(e)}, "error": str(e), "elapsed": 0.0,
+                    "retries": 0}
+        if self.adaptive is not None:
+            self.adaptive.acquire()
+        start = time.perf_counter()
+        attempt = 0
+        transport_retries = 0
+        self._local.congested = False
+        while True:
+            self._local.retries = 0
+            try:
+                if "question_prompt" in job:
+                    result = self.evaluate_spontaneous_speech(**job)
+                else:
+                    result = self.evaluate_pronunciation(**job)
+            except Exception as e:
+                # Malformed items (missing or unknown keys) fail on their own
+                result = {"error": str(e)}
+            transport_retries += getattr(self._local, "retries", 0)
+            # Errors carrying an errId came from the API itself; retrying won't help
+            if not result.get("error") or "errId" in result or attempt >= retries:
+                break
+            attempt += 1
+        
+        elapsed = time.perf_counter() - start
+        if self.adaptive is not None:
+            congested = self._local.congested or is_rate_limited(result, self.adaptive.err_ids)
+            self.adaptive.release(elapsed, congested)
+        
+        return {
+            "index": index,
+            "result": result,
+            "error": result.get("error"),
+            "elapsed": elapsed,
+            "retries": attempt + transport_retries
+        }
@@ -0,0 +1,180 @@
+# Streaming evaluation sessions for SuperSpeech
+# Opens the WebSocket as soon as recording starts and uploads PCM frames while
+# the learner is speaking, so the result only waits for the last few frames.
+
+import json
+import logging
+import queue
+import threading
+import time
+
+from .audio_source import wav_header
+from .websocket import WebSocket, OP_TEXT
+
+logger = logging.getLogger(__name__)
+
+# Data size written into the WAV header of a stream whose length is not known yet
+_STREAMING_DATA_SIZE = 0xFFFFFFFF - 36
+
+_STOP = object()
+_CANCEL = object()
+
+
+class StreamingSession:
+    def __init__(self, client, request, url, audio_type="wav", audio_sample_rate=16000,
+                 connect_timeout=5.0, result_timeout=30.0, max_frame_bytes=64 * 1024):
+        """Evaluate audio while it is being recorded, over the SpeechSuper WebSocket API.
+
+        Use SuperSpeech.stream_pronunciation() or stream_spontaneous_speech() rather
+        than creating sessions directly.
+
+        Args:
+            client (SuperSpeech): Client that signs the session and formats the result
+            request (dict): The "request" section (coreType, refText, ...)
+            url (str): WebSocket URL of the core type
+            audio_type (str): "wav" sends a streaming WAV header before the first frame;
+                other types send the frames as they are (default: wav)
+            audio_sample_rate (int): Sample rate of the 16-bit mono PCM frames (default: 16000)
+            connect_timeout (float): Seconds to open the connection (default: 5)
+            result_timeout (float): Seconds finish() waits for the result (default: 30)
+            max_frame_bytes (int): Frames queued while the socket was busy are merged into
+                messages of up to this size (default: 64 KiB)
+        """
+        self.core_type = request["coreType"]
+        self.url = url
+        self.bytes_sent = 0
+        self.latency = None
+
+        self._client = client
+        self._request = request
+        self._audio_type = audio_type
+        self._audio_sample_rate = audio_sample_rate
+        self._connect_timeout = connect_timeout
+        self._result_timeout = result_timeout
+        self._max_frame_bytes = max_frame_bytes
+
+        self._queue = queue.Queue()
+        self._result = None
+        self._done = threading.Event()
+        self._finished_at = None
+        self._closed = False
+        self._socket = None
+
+        # Connecting happens on the worker so opening a session never blocks the caller
+        self._thread = threading.Thread(target=self._run, name="superspeech-stream", daemon=True)
+        self._thread.start()
+
+    def send(self, frame):
+        """Queue a chunk of 16-bit mono PCM for upload; returns immediately."""
+        if self._closed:
+            raise RuntimeError("Streaming session is already finished")
+        if frame:
+            self._queue.put(bytes(frame))
+
+    def finish(self, timeout=None):
+        """Mark the end of the audio and wait for the evaluation.
+
+        Args:
+            timeout (float): Seconds to wait for the result (default: result_timeout)
+
+        Returns:
+            dict: Evaluation results (an EvaluationResult with typed_results), or {"error": ...}
+        """
+        if not self._closed:
+            self._closed = True
+            self._finished_at = time.monotonic()
+            self._queue.put(_STOP)
+        if not self._done.wait(self._result_timeout if timeout is None else timeout):
+            self.cancel()
+            return self._client._as_result({"error": "Timed out waiting for the streaming result"})
+        return self._result
+
+    def cancel(self):
+        """Abandon the session without waiting for a result."""
+        self._closed = True
+        self._queue.put(_CANCEL)
+        sock = self._socket
+        if sock is not None:
+            sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._done.is_set():
+            self.cancel()
+
+    def _run(self):
+        keys = self._client.keys
+        key = None
+        outcome = "error"
+        try:
+            if keys is not None:
+                key = keys.acquire()
+                if key is None:
+                    raise RuntimeError("No API key available: every key is out of quota or rejected")
+            params = self._client._build_params(self._request, self._audio_type,
+                                                self._audio_sample_rate, key)
+            self._socket = ws = WebSocket.connect(self.url, timeout=self._connect_timeout)
+            ws.send_text(json.dumps(params["connect"]))
+            ws.send_text(json.dumps(params["start"]))
+            if self._audio_type == "wav":
+                ws.send_binary(wav_header(_STREAMING_DATA_SIZE, self._audio_sample_rate))
+            if not self._upload(ws):
+                return
+            # Stop: an empty binary message marks the end of the audio
+            ws.send_binary(b"")
+
+            text = self._receive_result(ws)
+            self.latency = time.monotonic() - self._finished_at
+            logger.debug("Streaming result for %s after %.3fs: %s", self.core_type, self.latency, text)
+            if key is not None:
+                outcome = keys.outcome(200, text)
+            self._result = self._client._decode_response(200, text)
+        except Exception as e:
+            self._result = self._client._as_result({"error": f"Streaming session failed: {e}"})
+        finally:
+            if key is not None:
+                keys.release(key, outcome)
+            if self._socket is not None:
+                self._socket.close()
+            self._done.set()
+
+    def _upload(self, ws):
+        """Send queued frames until stop; False if the session was cancelled."""
+        while True:
+            item = self._queue.get()
+            if item is _CANCEL:
+                return False
+            if item is _STOP:
+                return True
+            # Merge whatever piled up while the last send was in progress
+            pending = [item]
+            size = len(item)
+            stop = False
+            while size < self._max_frame_bytes:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _CANCEL:
+                    return False
+                if item is _STOP:
+                    stop = True
+                    break
+                pending.append(item)
+                size += len(item)
+            ws.send_binary(b"".join(pending) if len(pending) > 1 else pending[0])
+            self.bytes_sent += size
+            if stop:
+                return True
+
+    def _receive_result(self, ws):
+        """Wait for the message holding the final result, skipping interim ones."""
+        ws.settimeout(self._result_timeout)
+        while True:
+            opcode, message = ws.recv()
+            if opcode != OP_TEXT:
+                continue
+            if '"result"' in message or '"errId"' in message or '"error"' in message:
+                return message
@@ -0,0 +1,275 @@
+# HTTP transports for SuperSpeech
+# The client hands a transport the form fields and the audio; the transport owns
+# the connections. Swap them to compare HTTP stacks or to test without a network.
+
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # optional dependency, only needed for HTTPXTransport
+    httpx = None
+
+from .multipart import MultipartEncoder
+
+
+class Transport:
+    """Interface shared by all transports.
+
+    post() returns an object with status_code, text and content attributes, and
+    raises requests.ConnectionError or requests.Timeout for transport failures so
+    that the client's retry logic works with any implementation.
+    """
+
+    def post(self, url, fields, source, headers=None, timeout=None, stream=False):
+        """Upload a multipart form with the audio as its "audio" file field.
+
+        Args:
+            url (str): Endpoint URL
+            fields (dict): Plain form fields (name -> str)
+            source (AudioSource): The audio to upload
+            headers (dict): Extra request headers (optional)
+            timeout (tuple): (connect, read) timeouts in seconds (default: none)
+            stream (bool): Send the body in chunks instead of building it in memory
+        """
+        raise NotImplementedError
+
+    def head(self, url, timeout=None):
+        """Send a HEAD request, e.g. to open a connection ahead of time."""
+        raise NotImplementedError
+
+    def close(self):
+        """Close all connections. The transport reopens them if used again."""
+
+
+class RequestsTransport(Transport):
+    def __init__(self, pool_size=10, keep_alive=True):
+        """HTTP/1.1 transport on a pooled requests session.
+
+        Args:
+            pool_size (int): Maximum number of pooled connections to the API host (default: 10)
+            keep_alive (bool): Reuse connections between requests (default: True)
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        """Create a requests session backed by a bounded connection pool."""
+        session = requests.Session()
+        # pool_block makes extra threads wait for a free connection instead of
+        # opening throwaway ones that are discarded after a single request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+        return session
+
+    def _get_session(self):
+        """Return the pooled session, creating it on first use."""
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def post(self, url, fields, source, headers=None, timeout=None, stream=False):
+        headers = dict(headers or {})
+        if stream:
+            body = MultipartEncoder(fields, "audio", source)
+            headers["Content-Type"] = body.content_type
+            try:
+                return self._get_session().post(url, data=body, headers=headers, timeout=timeout)
+            finally:
+                body.close()
+        with source.open() as audio_file:
+            files = {"audio": (source.name, audio_file)}
+            return self._get_session().post(url, data=fields, headers=headers, files=files,
+                                            timeout=timeout)
+
+    def head(self, url, timeout=None):
+        return self._get_session().head(url, timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+class HTTPXTransport(Transport):
+    def __init__(self, http2=True, max_connections=4, keep_alive=True):
+        """httpx transport that can multiplex concurrent uploads over HTTP/2.
+
+        Args:
+            http2 (bool): Negotiate HTTP/2 with servers that support it, so concurrent
+                uploads share a few connections as separate streams (default: True,
+                requires the h2 package)
+            max_connections (int): Maximum open connections to the API host (default: 4)
+            keep_alive (bool): Reuse connections between requests (default: True)
+
+        HTTP/2 is negotiated over TLS; plain http:// URLs use HTTP/1.1.
+        """
+        if httpx is None:
+            raise ImportError("HTTPXTransport requires httpx. Install it with: pip install httpx[http2]")
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    limits = httpx.Limits(max_connections=self.max_connections,
+                                          max_keepalive_connections=self.max_connections if self.keep_alive else 0)
+                    self._client = httpx.Client(http2=self.http2, limits=limits)
+                client = self._client
+        return client
+
+    @staticmethod
+    def _timeout(timeout):
+        if timeout is None:
+            return None
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        # Waiting for a free connection or stream counts against the connect timeout
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+
+    def post(self, url, fields, source, headers=None, timeout=None, stream=False):
+        # Always streamed: httpx sends the encoder's chunks with a Content-Length
+        body = MultipartEncoder(fields, "audio", source)
+        headers = dict(headers or {}, **{"Content-Type": body.content_type,
+                                         "Content-Length": str(len(body))})
+        try:
+            return self._get_client().post(url, content=iter(body), headers=headers,
+                                           timeout=self._timeout(timeout))
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        finally:
+            body.close()
+
+    def head(self, url, timeout=None):
+        try:
+            return self._get_client().head(url, timeout=self._timeout(timeout))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+class FakeResponse:
+    __slots__ = ("status_code", "content")
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+
+class FakeRequest:
+    __slots__ = ("url", "params", "audio", "headers")
+
+    def __init__(self, url, params, audio, headers):
+        """One upload received by a FakeTransport.
+
+        Args:
+            url (str): Endpoint URL
+            params (dict): Decoded "text" form field (the connect/start payload)
+            audio (bytes): Uploaded audio
+            headers (dict): Request headers
+        """
+        self.url = url
+        self.params = params
+        self.audio = audio
+        self.headers = headers
+
+    @property
+    def core_type(self):
+        return self.url.rsplit("/", 1)[-1]
+
+
+FAKE_RESULT = {
+    "result": {
+        "overall": 90, "pronunciation": 90, "fluency": 90, "rhythm": 90,
+        "integrity": 100, "speed": 100, "duration": "1.0", "words": []
+    }
+}
+
+
+class FakeTransport(Transport):
+    def __init__(self, respond=None, delay=0.0):
+        """In-process transport for tests: no sockets, every upload is recorded.
+
+        Args:
+            respond (callable): respond(FakeRequest) -> (status, body), where body is a dict,
+                str or bytes; it may also raise requests.ConnectionError or requests.Timeout
+                (default: always (200, FAKE_RESULT))
+            delay (float): Seconds each request takes (default: 0)
+        """
+        self.respond = respond or (lambda request: (200, FAKE_RESULT))
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def post(self, url, fields, source, headers=None, timeout=None, stream=False):
+        with source.open() as audio_file:
+            audio = audio_file.read()
+        request = FakeRequest(url, json.loads(fields["text"]), audio, dict(headers or {}))
+        with self._lock:
+            self.requests.append(request)
+        if self.delay:
+            time.sleep(self.delay)
+        status, body = self.respond(request)
+        if isinstance(body, dict):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return FakeResponse(status, body)
+
+    def head(self, url, timeout=None):
+        return FakeResponse(200, b"")
+
+    @property
+    def request_count(self):
+        return len(self.requests)
+
+
+def make_transport(transport=None, pool_size=10, keep_alive=True):
+    """Return a Transport from an instance or a name.
+
+    Args:
+        transport (Transport or str): A Transport, or one of "requests", "httpx"
+            (HTTP/1.1), "http2" and "fake" (default: "requests")
+        pool_size (int): Connection pool size for the named transports (default: 10)
+        keep_alive (bool): Reuse connections between requests (default: True)
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport in (None, "requests"):
+        return RequestsTransport(pool_size, keep_alive)
+    if transport == "httpx":
+        return HTTPXTransport(http2=False, max_connections=pool_size, keep_alive=keep_alive)
+    if transport == "http2":
+        # A few connections are enough when every one carries many streams
+        return HTTPXTransport(http2=True, max_connections=max(1, pool_size // 4), keep_alive=keep_alive)
+    if transport == "fake":
+        return FakeTransport()
+    raise ValueError(f"Unknown transport {transport!r}, expected 'requests', 'httpx', 'http2' or 'fake'")
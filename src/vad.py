@@ -0,0 +1,131 @@
+# Voice activity detection for SuperSpeech
+# Finds the speech in 16-bit mono recordings from frame energy and zero-crossing
+# rate with NumPy, so silent takes are never uploaded and silence is trimmed.
+
+import logging
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed to detect speech
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# speech: the samples from start to end, a view of the input (int16 NumPy array)
+# start, end: sample offsets of the speech span, margins included
+# bytes_saved: PCM bytes outside the span, i.e. not uploaded
+SpeechSpan = namedtuple("SpeechSpan", ["speech", "start", "end", "sample_rate", "bytes_saved"])
+
+# Frames analysed per block, so the float copy stays small for long recordings
+_BLOCK_FRAMES = 1024
+
+
+def as_samples(pcm):
+    """View 16-bit mono PCM as an int16 NumPy array without copying it.
+
+    Args:
+        pcm: Raw little-endian 16-bit samples (any bytes-like object) or an int16 array
+
+    Returns:
+        numpy.ndarray: 1-D int16 samples sharing memory with pcm
+    """
+    if np is None:
+        raise ImportError("Voice activity detection requires numpy. Install it with: pip install numpy")
+    if isinstance(pcm, np.ndarray):
+        if pcm.dtype != np.int16:
+            raise TypeError(f"Expected int16 samples, got {pcm.dtype}")
+        return pcm.reshape(-1)
+    view = memoryview(pcm).cast("B")
+    return np.frombuffer(view[:len(view) - len(view) % 2], dtype="<i2")
+
+
+def frame_features(samples, sample_rate=16000, frame_ms=20):
+    """Energy and zero-crossing rate of consecutive frames.
+
+    Args:
+        samples (numpy.ndarray): int16 mono samples
+        sample_rate (int): Sample rate in Hz (default: 16000)
+        frame_ms (int): Frame length in milliseconds (default: 20)
+
+    Returns:
+        tuple: (energy_db, zcr) arrays with one value per whole frame: the mean
+            power in dB relative to full scale, and the fraction of sign changes
+    """
+    frame = max(1, sample_rate * frame_ms // 1000)
+    count = len(samples) // frame
+    frames = samples[:count * frame].reshape(count, frame)
+    energy = np.empty(count)
+    zcr = np.empty(count)
+    for first in range(0, count, _BLOCK_FRAMES):
+        block = frames[first:first + _BLOCK_FRAMES]
+        values = block.astype(np.float32)
+        energy[first:first + len(block)] = np.einsum("ij,ij->i", values, values) / frame
+        signs = np.signbit(block)
+        zcr[first:first + len(block)] = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame
+    energy_db = 10 * np.log10(energy / 32768.0 ** 2 + 1e-10)
+    return energy_db, zcr
+
+
+def speech_frames(samples, sample_rate=16000, frame_ms=20, threshold_db=12.0, floor_db=-50.0,
+                  zcr_threshold=0.25, max_noise_db=-45.0):
+    """Classify frames as speech or silence.
+
+    The noise floor is estimated as the 10th percentile of the frame energies,
+    but never above max_noise_db: a take with no silence in it (continuous
+    speech, loud audio throughout) would otherwise be its own noise floor. A frame is speech if it is threshold_db above the noise floor, or half that
+    and noisy like a fricative (zero-crossing rate of at least zcr_threshold).
+    Frames quieter than floor_db are never speech.
+
+    Args:
+        samples (numpy.ndarray): int16 mono samples
+        sample_rate (int): Sample rate in Hz (default: 16000)
+        frame_ms (int): Frame length in milliseconds (default: 20)
+        threshold_db (float): Level above the noise floor that counts as speech (default: 12.0)
+        floor_db (float): Absolute level below which a frame is silent, in dBFS (default: -50.0)
+        zcr_threshold (float): Zero-crossing rate of unvoiced speech (default: 0.25)
+        max_noise_db (float): Highest noise floor assumed, in dBFS (default: -45.0)
+
+    Returns:
+        numpy.ndarray: One bool per whole frame
+    """
+    energy_db, zcr = frame_features(samples, sample_rate, frame_ms)
+    if len(energy_db) == 0:
+        return np.zeros(0, dtype=bool)
+    noise_db = min(np.percentile(energy_db, 10), max_noise_db)
+    voiced = energy_db >= max(noise_db + threshold_db, floor_db)
+    unvoiced = (energy_db >= max(noise_db + threshold_db / 2, floor_db)) & (zcr >= zcr_threshold)
+    return voiced | unvoiced
+
+
+def detect_speech(pcm, sample_rate=16000, margin_ms=200, frame_ms=20, min_speech_ms=60,
+                  threshold_db=12.0, floor_db=-50.0):
+    """Find the speech in a recording and trim the silence around it.
+
+    Args:
+        pcm: Raw little-endian 16-bit mono samples (bytes-like) or an int16 array
+        sample_rate (int): Sample rate in Hz (default: 16000)
+        margin_ms (int): Silence kept before and after the speech (default: 200)
+        frame_ms (int): Analysis frame length in milliseconds (default: 20)
+        min_speech_ms (int): Speech needed for the take not to count as silent,
+            so clicks and bumps are ignored (default: 60)
+        threshold_db (float): Level above the noise floor that counts as speech (default: 12.0)
+        floor_db (float): Absolute level below which a frame is silent, in dBFS (default: -50.0)
+
+    Returns:
+        SpeechSpan: The speech span, or None if the take is silent
+    """
+    samples = as_samples(pcm)
+    speech = speech_frames(samples, sample_rate, frame_ms, threshold_db, floor_db)
+    if np.count_nonzero(speech) * frame_ms < min_speech_ms:
+        logger.debug("No speech in %d samples", len(samples))
+        return None
+    frame = max(1, sample_rate * frame_ms // 1000)
+    margin = sample_rate * margin_ms // 1000
+    indices = np.flatnonzero(speech)
+    start = max(0, int(indices[0]) * frame - margin)
+    end = min(len(samples), (int(indices[-1]) + 1) * frame + margin)
+    bytes_saved = (len(samples) - (end - start)) * 2
+    logger.debug("Speech from %.2fs to %.2fs, %d bytes of silence trimmed",
+                 start / sample_rate, end / sample_rate, bytes_saved)
+    return SpeechSpan(samples[start:end], start, end, sample_rate, bytes_saved)
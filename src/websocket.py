@@ -0,0 +1,202 @@
+# Minimal WebSocket (RFC 6455) client for SuperSpeech streaming sessions
+# Only what the SpeechSuper streaming protocol needs: text and binary messages,
+# ping/pong and close, over ws:// or wss://. No extensions or subprotocols.
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import threading
+from urllib.parse import urlsplit
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_ACCEPT_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketError(Exception):
+    """Handshake failure, protocol error or a connection closed by the server."""
+
+
+def accept_key(key):
+    """Sec-WebSocket-Accept value the server must answer for a Sec-WebSocket-Key."""
+    return base64.b64encode(hashlib.sha1(key.encode("ascii") + _ACCEPT_GUID).digest()).decode("ascii")
+
+
+def apply_mask(payload, mask):
+    """XOR payload with the 4-byte mask (masking and unmasking are the same operation)."""
+    if not payload:
+        return b""
+    size = len(payload)
+    # One big-integer XOR is much faster than a Python loop over the bytes
+    pattern = (mask * (size // 4 + 1))[:size]
+    return (int.from_bytes(payload, "little") ^ int.from_bytes(pattern, "little")).to_bytes(size, "little")
+
+
+def encode_frame(opcode, payload=b"", mask=True):
+    """Encode one final (unfragmented) frame. Clients must mask, servers must not."""
+    size = len(payload)
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if size < 126:
+        header.append(mask_bit | size)
+    elif size < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", size)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", size)
+    if not mask:
+        return bytes(header) + bytes(payload)
+    key = os.urandom(4)
+    return bytes(header) + key + apply_mask(bytes(payload), key)
+
+
+def read_frame(read_exactly):
+    """Read one frame.
+
+    Args:
+        read_exactly (callable): read_exactly(n) returns exactly n bytes or raises
+
+    Returns:
+        tuple: (fin, opcode, payload) with the payload unmasked
+    """
+    first, second = read_exactly(2)
+    size = second & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", read_exactly(2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", read_exactly(8))[0]
+    mask = read_exactly(4) if second & 0x80 else None
+    payload = read_exactly(size) if size else b""
+    if mask is not None:
+        payload = apply_mask(payload, mask)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+class WebSocket:
+    def __init__(self, sock, buffered=b""):
+        """An open client connection; use WebSocket.connect() to create one."""
+        self._sock = sock
+        self._buffer = bytearray(buffered)
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    @classmethod
+    def connect(cls, url, timeout=None, headers=None):
+        """Open a WebSocket connection.
+
+        Args:
+            url (str): ws:// or wss:// URL
+            timeout (float): Seconds for connecting and for each later read (default: none)
+            headers (dict): Extra handshake headers (optional)
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("ws", "wss"):
+            raise ValueError(f"Not a WebSocket URL: {url}")
+        secure = parts.scheme == "wss"
+        host = parts.hostname
+        port = parts.port or (443 if secure else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        sock = socket.create_connection((host, port), timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            lines = [f"GET {path} HTTP/1.1", f"Host: {parts.netloc}", "Upgrade: websocket",
+                     "Connection: Upgrade", f"Sec-WebSocket-Key: {key}", "Sec-WebSocket-Version: 13"]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+            response = b""
+            while b"\r\n\r\n" not in response:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise WebSocketError("Connection closed during the WebSocket handshake")
+                response += chunk
+            head, _, rest = response.partition(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            if status_line.split(" ", 2)[1:2] != ["101"]:
+                raise WebSocketError(f"WebSocket handshake refused: {status_line}")
+            received = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                received[name.strip().lower()] = value.strip()
+            if received.get("sec-websocket-accept") != accept_key(key):
+                raise WebSocketError("WebSocket handshake failed: bad Sec-WebSocket-Accept")
+        except BaseException:
+            sock.close()
+            raise
+        return cls(sock, rest)
+
+    def _read_exactly(self, size):
+        while len(self._buffer) < size:
+            chunk = self._sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise WebSocketError("Connection closed by the server")
+            self._buffer += chunk
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _send_frame(self, opcode, payload):
+        frame = encode_frame(opcode, payload)
+        with self._send_lock:
+            self._sock.sendall(frame)
+
+    def send_text(self, text):
+        self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    def send_binary(self, data):
+        self._send_frame(OP_BINARY, data)
+
+    def settimeout(self, timeout):
+        """Seconds each later read may block (None for no limit)."""
+        self._sock.settimeout(timeout)
+
+    def recv(self):
+        """Wait for the next message.
+
+        Returns:
+            tuple: (opcode, payload), with OP_TEXT payloads decoded to str
+        """
+        message_opcode = None
+        parts = []
+        while True:
+            fin, opcode, payload = read_frame(self._read_exactly)
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                code = struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else 1005
+                self.close()
+                raise WebSocketError(f"Connection closed by the server (code {code})")
+            if opcode != OP_CONTINUATION:
+                message_opcode = opcode
+            parts.append(payload)
+            if fin:
+                data = b"".join(parts)
+                return message_opcode, data.decode("utf-8") if message_opcode == OP_TEXT else data
+
+    def close(self, code=1000):
+        """Send a close frame (best effort) and close the socket."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._send_frame(OP_CLOSE, struct.pack("!H", code))
+        except OSError:
+            pass
+        self._sock.close()
@@ -1,13 +1,13 @@
 # Test sentence pronunciation with SuperSpeech API
 import os
 import wave
-import pyaudio
 import time
 from src.speech_api import SuperSpeech
+from src.recorder import Recorder
+from src.vad import detect_speech
 
 # Audio recording settings
 CHUNK = 1024
-FORMAT = pyaudio.paInt16  # 16-bit format
 CHANNELS = 1  # Mono
 RATE = 16000  # 16kHz sample rate
 RECORD_SECONDS = 6  # Adjust recording length for your sentence
@@ -21,14 +21,7 @@ REFERENCE_TEXT = "The successful warrior is the average man with laser-like focu
 def record_audio():
     """Record audio from microphone"""
     print("Recording Setup...")
-    p = pyaudio.PyAudio()
-    
-    # Open stream
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK)
+    recorder = Recorder(RATE, CHANNELS, CHUNK, max_seconds=RECORD_SECONDS)
     
     print(f"Say the following sentence after the countdown:")
     print(f"'{REFERENCE_TEXT}'")
@@ -39,27 +32,30 @@ def record_audio():
     
     print("Recording NOW!")
     
-    frames = []
-    
-    # Record audio in chunks
-    for i in range(0, int(RATE / CHUNK * RECORD_SECONDS)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    # PortAudio fills the recorder's buffer from its own thread while we wait
+    recorder.start()
+    time.sleep(RECORD_SECONDS)
+    pcm = recorder.stop()
+    recorder.close()
     
     print("Recording complete!")
+    if recorder.overflows:
+        print(f"Warning: the input overflowed {recorder.overflows} time(s), some audio was lost")
     
-    # Stop and close the stream
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+    # Reject a silent take and trim the silence around the sentence before saving
+    span = detect_speech(pcm, RATE)
+    if span is None:
+        print("No speech detected. Check that your microphone is working and not muted.")
+        return None
+    print(f"Trimmed {span.bytes_saved} bytes of silence")
     
     # Save the recorded data as a WAV file
     os.makedirs(os.path.dirname(WAVE_OUTPUT_FILENAME), exist_ok=True)
     wf = wave.open(WAVE_OUTPUT_FILENAME, 'wb')
     wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
+    wf.setsampwidth(2)
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(span.speech)
     wf.close()
     
     print(f"Audio saved to {WAVE_OUTPUT_FILENAME}")
@@ -111,6 +107,8 @@ def main():
     
     # Record audio
     audio_file = record_audio()
+    if audio_file is None:
+        return
     
     # Evaluate the recording
     evaluate_sentence(audio_file, REFERENCE_TEXT)
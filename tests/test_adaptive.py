@@ -0,0 +1,123 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.adaptive import AIMDLimiter, is_rate_limited
+from src.results import EvaluationResult
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def run_window(limiter, latency=0.1, congested=False):
+    """Fill the limiter to its limit, then release every slot with the given outcome"""
+    taken = 0
+    while limiter.try_acquire():
+        taken += 1
+    for _ in range(taken):
+        limiter.release(latency, congested)
+
+
+class TestAIMDLimiter(unittest.TestCase):
+
+    def test_additive_increase(self):
+        """Test that healthy saturated windows raise the limit by about one each"""
+        limiter = AIMDLimiter(initial=2, max_limit=5)
+        run_window(limiter)
+        self.assertEqual(limiter.limit, 2)
+        run_window(limiter)
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(10):
+            run_window(limiter)
+        self.assertEqual(limiter.limit, 5)
+        self.assertEqual([limit for _, limit, _ in limiter.history], [2, 3, 4, 5])
+
+    def test_no_increase_when_underused(self):
+        """Test that the limit does not grow while it is not the bottleneck"""
+        limiter = AIMDLimiter(initial=4)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(0.1)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_multiplicative_decrease(self):
+        """Test that congestion halves the limit once per round trip"""
+        limiter = AIMDLimiter(initial=16)
+        with patch('time.monotonic', return_value=100.0):
+            limiter.acquire()
+            limiter.release(1.0, congested=True)
+            self.assertEqual(limiter.limit, 8)
+            limiter.acquire()
+            limiter.release(1.0, congested=True)
+            self.assertEqual(limiter.limit, 8)
+        with patch('time.monotonic', return_value=102.0):
+            limiter.acquire()
+            limiter.release(1.0, congested=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_latency_spike(self):
+        """Test that a response far slower than usual cuts the limit"""
+        limiter = AIMDLimiter(initial=8, latency_tolerance=2.0)
+        limiter.acquire()
+        limiter.release(0.1)
+        limiter.acquire()
+        limiter.release(0.5)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.history[-1][2], "latency")
+
+    def test_is_rate_limited(self):
+        """Test rate-limit detection on API results"""
+        self.assertTrue(is_rate_limited({"errId": 42001, "error": "request frequency exceeded"}))
+        self.assertTrue(is_rate_limited({"errId": 1}, err_ids={1}))
+        self.assertFalse(is_rate_limited({"errId": 41030, "error": "invalid coreType"}))
+        self.assertFalse(is_rate_limited({"error": "timeout"}))
+        for message in ("sample rate not supported", "invalid sampleRate", "refText exceeds the word limit",
+                        "inaccurate audio header", "audio length exceeds limit"):
+            self.assertFalse(is_rate_limited({"errId": 41000, "error": message}), message)
+        self.assertTrue(is_rate_limited({"errId": 1, "error": "rate limit reached"}))
+        self.assertTrue(is_rate_limited({"errId": 1, "error": "Too many requests"}))
+        self.assertTrue(is_rate_limited(EvaluationResult.from_dict({"errId": 20009, "error": "quota exceeded"})))
+        self.assertFalse(is_rate_limited(EvaluationResult.from_dict(CANNED_RESULT)))
+
+
+class TestAdaptiveBatch(unittest.TestCase):
+
+    def run_throttled_batch(self, typed_results=False):
+        throttled = {"errId": 42001, "error": "too many requests"}
+        with StandInServer() as server:
+            server.respond = lambda handler: (200, throttled if server.request_count <= 4 else CANNED_RESULT)
+            limiter = AIMDLimiter(initial=8, max_limit=8)
+            api = SuperSpeech(app_key="test_key", secret_key="test_secret",
+                              base_url=server.url, adaptive=limiter, typed_results=typed_results)
+            results = api.evaluate_batch([(AUDIO_PATH, "supermarket")] * 12)
+            api.close()
+        self.assertEqual(len(results), 12)
+        self.assertLess(min(limit for _, limit, _ in limiter.history), 8)
+        self.assertIn("congestion", [reason for _, _, reason in limiter.history])
+
+    def test_throttling_lowers_the_limit(self):
+        """Test that rate-limit responses during a batch shrink the limit"""
+        self.run_throttled_batch()
+
+    def test_throttling_lowers_the_limit_with_typed_results(self):
+        """Test that rate-limit errors are seen through EvaluationResult objects too"""
+        self.run_throttled_batch(typed_results=True)
+
+    def test_known_err_ids_count_as_congestion(self):
+        """Test that a batch passes the limiter's errIds to the rate-limit check"""
+        with StandInServer() as server:
+            server.respond = lambda handler: (200, {"errId": 20009, "error": "busy"})
+            limiter = AIMDLimiter(initial=8, max_limit=8, err_ids={20009})
+            api = SuperSpeech(app_key="test_key", secret_key="test_secret",
+                              base_url=server.url, adaptive=limiter)
+            api.evaluate_batch([(AUDIO_PATH, "supermarket")] * 2)
+            api.close()
+        self.assertIn("congestion", [reason for _, _, reason in limiter.history])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.speech_api import SuperSpeech
+from src.adaptive import AIMDLimiter
+from src.async_api import AsyncSuperSpeech, aiohttp
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncSuperSpeech(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """Start a local stand-in for the API"""
+        self.server = StandInServer().start()
+        self.api = AsyncSuperSpeech(app_key="test_key", secret_key="test_secret",
+                                    max_concurrency=2, base_url=self.server.url)
+
+    async def asyncTearDown(self):
+        await self.api.close()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_payload_matches_sync_client(self):
+        """Test that both clients build identical signed payloads"""
+        sync_api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+        with patch.object(SuperSpeech, '_generate_timestamp', return_value="1234567890"), \
+                patch.object(AsyncSuperSpeech, '_generate_timestamp', return_value="1234567890"), \
+                patch.object(SuperSpeech, '_generate_token_id', return_value="token"), \
+                patch.object(AsyncSuperSpeech, '_generate_token_id', return_value="token"):
+            self.assertEqual(self.api._build_pronunciation_params("test", "word.eval.kr"),
+                             sync_api._build_pronunciation_params("test", "word.eval.kr"))
+            self.assertEqual(self.api._build_spontaneous_params("Why?"),
+                             sync_api._build_spontaneous_params("Why?"))
+
+    async def test_evaluate_pronunciation(self):
+        """Test that results match what the sync client returns"""
+        result = await self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(result, CANNED_RESULT)
+
+        sync_api = SuperSpeech(app_key="test_key", secret_key="test_secret", base_url=self.server.url)
+        self.assertEqual(sync_api.evaluate_pronunciation(AUDIO_PATH, "supermarket"), result)
+
+    async def test_empty_response_is_an_error(self):
+        """Test that an empty body maps to the same error dict as the sync client"""
+        self.server.respond = lambda handler: (200, b"")
+        result = await self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(result, {"error": "Empty response from API. Status code: 200"})
+
+    async def test_concurrency_limit(self):
+        """Test that no more than max_concurrency requests are in flight"""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def respond(handler):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return 200, CANNED_RESULT
+
+        self.server.respond = respond
+        results = await asyncio.gather(*[
+            self.api.evaluate_spontaneous_speech(AUDIO_PATH, "What's your favorite food?")
+            for _ in range(6)
+        ])
+        self.assertEqual(results, [CANNED_RESULT] * 6)
+        self.assertEqual(state["peak"], 2)
+
+    async def test_adaptive_limit_backs_off(self):
+        """Test that 429 responses shrink the adaptive limit"""
+        self.server.respond = lambda handler: (429, {"error": "slow down"})
+        self.api.adaptive = AIMDLimiter(initial=8)
+        results = await asyncio.gather(*[
+            self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket") for _ in range(4)
+        ])
+        self.assertEqual(results, [{"error": "slow down"}] * 4)
+        self.assertLess(self.api.adaptive.limit, 8)
+        self.assertEqual(self.api.adaptive.in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import json
+import os
+import sys
+import unittest
+import wave
+from unittest.mock import patch, MagicMock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.audio_source import AudioSource, wav_header
+from src.speech_api import SuperSpeech
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def read_source(source):
+    with source.open() as audio_file:
+        return audio_file.read()
+
+
+class TestAudioSource(unittest.TestCase):
+
+    def setUp(self):
+        """Load the sample recording"""
+        with open(AUDIO_PATH, 'rb') as audio_file:
+            self.wav_bytes = audio_file.read()
+
+    def test_wav_bytes_pass_through(self):
+        """Test that WAV bytes are uploaded unchanged"""
+        source = AudioSource(self.wav_bytes)
+        self.assertEqual(read_source(source), self.wav_bytes)
+        self.assertEqual(source.size, len(self.wav_bytes))
+        self.assertEqual(source.name, "audio.wav")
+
+    def test_raw_pcm_gets_wav_header(self):
+        """Test that raw PCM is wrapped in a valid WAV header"""
+        pcm = bytes(range(256)) * 8
+        source = AudioSource(bytearray(pcm), sample_rate=8000)
+        with wave.open(io.BytesIO(read_source(source))) as wav:
+            self.assertEqual(wav.getframerate(), 8000)
+            self.assertEqual(wav.getnchannels(), 1)
+            self.assertEqual(wav.getsampwidth(), 2)
+            self.assertEqual(wav.readframes(wav.getnframes()), pcm)
+        self.assertEqual(source.size, len(pcm) + 44)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_array_is_not_copied(self):
+        """Test that int16 arrays are uploaded through a view of their memory"""
+        samples = np.arange(-500, 500, dtype=np.int16)
+        source = AudioSource(samples)
+        self.assertIs(source._parts[1].obj, samples)
+        self.assertEqual(read_source(source), wav_header(samples.nbytes) + samples.tobytes())
+        with self.assertRaises(ValueError):
+            AudioSource(samples.astype(np.float32))
+        with self.assertRaises(ValueError):
+            AudioSource(np.zeros((100, 2), dtype=np.int16))
+
+    def test_file_like_is_rewound_and_left_open(self):
+        """Test that caller-owned streams are read from their start position"""
+        stream = io.BytesIO(b"junk" + self.wav_bytes)
+        stream.seek(4)
+        source = AudioSource(stream)
+        self.assertEqual(read_source(source), self.wav_bytes)
+        self.assertEqual(read_source(source), self.wav_bytes)
+        self.assertFalse(stream.closed)
+        self.assertEqual(b"".join(bytes(b) for b in source.blocks(1000)), self.wav_bytes)
+
+
+class TestInMemoryEvaluation(unittest.TestCase):
+
+    @patch('requests.Session.post')
+    def test_evaluate_from_buffer(self, mock_post):
+        """Test that in-memory audio is uploaded without touching the filesystem"""
+        uploads = []
+
+        def fake_post(url, data=None, headers=None, files=None, **kwargs):
+            name, audio_file = files["audio"]
+            uploads.append((name, audio_file.read()))
+            response = MagicMock()
+            response.status_code = 200
+            response.text = json.dumps({"result": {"overall": 70}})
+            return response
+        mock_post.side_effect = fake_post
+
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+        samples = bytearray(3200)
+        result = api.evaluate_pronunciation(memoryview(samples), "namja", core_type="word.eval.kr")
+        self.assertEqual(result["result"]["overall"], 70)
+        self.assertEqual(uploads[0], ("audio.wav", wav_header(3200) + bytes(3200)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cache import ResultCache, cache_key
+from src.speech_api import SuperSpeech
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+AUDIO = {"audioType": "wav", "channel": 1, "sampleBytes": 2, "sampleRate": 16000}
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up an in-memory cache"""
+        self.cache = ResultCache(":memory:")
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups count hits and misses"""
+        self.assertIsNone(self.cache.get("k"))
+        self.assertTrue(self.cache.put("k", {"result": {"overall": 90}}))
+        self.assertEqual(self.cache.get("k"), {"result": {"overall": 90}})
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_errors_are_not_cached(self):
+        """Test that error responses are never stored"""
+        self.assertFalse(self.cache.put("k", {"error": "timeout"}))
+        self.assertFalse(self.cache.put("k", {"errId": 41030, "error": "invalid coreType"}))
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResultCache(":memory:", max_entries=2)
+        cache.put("a", {"result": 1})
+        cache.put("b", {"result": 2})
+        with patch('time.time', return_value=1e12):
+            cache.get("a")
+        with patch('time.time', return_value=1e12 + 1):
+            cache.put("c", {"result": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_size_eviction(self):
+        """Test that the total stored size stays under max_bytes"""
+        cache = ResultCache(":memory:", max_bytes=100)
+        for i in range(10):
+            cache.put(str(i), {"result": "x" * 20, "i": i})
+        self.assertLessEqual(cache.stats()["bytes"], 100)
+        self.assertIsNotNone(cache.get("9"))
+
+    def test_ttl_expiry(self):
+        """Test that results older than the TTL are treated as misses"""
+        cache = ResultCache(":memory:", ttl=60)
+        with patch('time.time', return_value=1000.0):
+            cache.put("k", {"result": 1})
+        with patch('time.time', return_value=1030.0):
+            self.assertIsNotNone(cache.get("k"))
+        with patch('time.time', return_value=1061.0):
+            self.assertIsNone(cache.get("k"))
+
+    def test_cache_key(self):
+        """Test that the key covers audio content and request parameters"""
+        request = {"coreType": "word.eval.kr", "refText": "namja", "tokenId": "a"}
+        key = cache_key(AUDIO_PATH, request, AUDIO)
+        self.assertEqual(key, cache_key(AUDIO_PATH, dict(request, tokenId="b"), AUDIO))
+        self.assertNotEqual(key, cache_key(AUDIO_PATH, dict(request, refText="yeoja"), AUDIO))
+        self.assertNotEqual(key, cache_key(AUDIO_PATH, request, dict(AUDIO, sampleRate=8000)))
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as other:
+            other.write(b"RIFF other audio")
+        try:
+            self.assertNotEqual(key, cache_key(other.name, request, AUDIO))
+        finally:
+            os.remove(other.name)
+
+
+class TestSuperSpeechCache(unittest.TestCase):
+
+    @patch('requests.Session.post')
+    def test_repeat_evaluation_is_served_from_cache(self, mock_post):
+        """Test that a repeated evaluation skips the API unless bypassed"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"result": {"overall": 95}})
+        mock_post.return_value = mock_response
+
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", cache=ResultCache(":memory:"))
+        first = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        second = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(first, second)
+        self.assertEqual(mock_post.call_count, 1)
+
+        api.evaluate_pronunciation(AUDIO_PATH, "supermarket", use_cache=False)
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(api.cache.stats()["hits"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import time
+import unittest
+from array import array
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.capture import CaptureProcess, SyntheticSource
+
+
+def ramp(data):
+    """True if data holds consecutive sample numbers, as SyntheticSource writes them."""
+    samples = array("h", bytes(data))
+    return all((samples[i] - samples[0]) & 0xFFFF == i for i in range(len(samples)))
+
+
+class TestCaptureProcess(unittest.TestCase):
+
+    def test_take_is_read_in_place(self):
+        """Test that reads return views of the shared buffer that add up to the whole take"""
+        with CaptureProcess(SyntheticSource(), max_seconds=2) as capture:
+            capture.start()
+            pieces = []
+            for _ in range(10):
+                time.sleep(0.02)
+                view = capture.read()
+                pieces.append(bytes(view))
+                view.release()
+            data = capture.stop()
+            pieces.append(bytes(capture.read()))
+
+            self.assertIs(data.obj, capture._shared.buf.obj)
+            self.assertGreater(len(data), 0)
+            self.assertEqual(b"".join(pieces), bytes(data))
+            self.assertTrue(ramp(data))
+            self.assertEqual(array("h", bytes(data[:8])).tolist(), [0, 1, 2, 3])
+            self.assertIsNotNone(capture.stats()["latency"])
+            data.release()
+
+    def test_take_stops_at_the_limit(self):
+        """Test that audio past max_seconds is dropped and counted"""
+        with CaptureProcess(SyntheticSource(), max_seconds=0.1) as capture:
+            capture.start()
+            time.sleep(0.3)
+            data = capture.stop()
+            stats = capture.stats()
+
+            self.assertEqual(len(data), 3200)
+            self.assertEqual(stats["frames"], 1600)
+            self.assertGreater(stats["dropped_frames"], 0)
+            data.release()
+
+            # The next take starts over in the same buffer
+            capture.start()
+            time.sleep(0.05)
+            data = capture.stop()
+            self.assertEqual(array("h", bytes(data[:4])).tolist(), [0, 1])
+            self.assertEqual(capture.stats()["dropped_frames"], 0)
+            data.release()
+
+    def test_slow_reader_is_lapped(self):
+        """Test that with overwrite=True a reader that falls behind skips the lost audio"""
+        with CaptureProcess(SyntheticSource(), max_seconds=0.1, overwrite=True) as capture:
+            capture.start()
+            time.sleep(0.3)
+            view = capture.read()
+            self.assertGreater(capture.stats()["overrun_frames"], 0)
+            self.assertTrue(ramp(view))
+            view.release()
+            data = capture.stop()
+            self.assertIsInstance(data, bytearray)
+            self.assertEqual(len(data), 3200)
+            self.assertTrue(ramp(data))
+
+    def test_busy_main_process_does_not_stall_capture(self):
+        """Test that chunks keep arriving on time while the main process holds the GIL"""
+        payload = json.dumps({"result": {"words": [{"word": "a", "scores": {"overall": 90}}] * 200}})
+        with CaptureProcess(SyntheticSource(), max_seconds=2) as capture:
+            capture.start()
+            end = time.monotonic() + 0.5
+            while time.monotonic() < end:
+                json.loads(payload)
+            data = capture.stop()
+            stats = capture.stats()
+
+            self.assertGreaterEqual(stats["frames"], 0.4 * 16000)
+            self.assertLess(stats["max_gap"], 0.1)
+            self.assertTrue(ramp(data))
+            data.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import io
+import os
+import struct
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.audio_source import AudioSource, wav_header
+from src.coretypes import CoreType, PreflightError, get_core_type, preflight, register, CORE_TYPES
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class _HeaderOnly(io.RawIOBase):
+    """Stream of a WAV header followed by silence, counting how much is read."""
+
+    def __init__(self, header, size):
+        super().__init__()
+        self._header = header
+        self._size = size
+        self.position = 0
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self._size}[whence]
+        self.position = base + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), self._size - self.position))
+        data = (self._header[self.position:] + bytes(count))[:count]
+        buffer[:count] = data
+        self.position += count
+        self.bytes_read += count
+        return count
+
+
+class TestWavInfo(unittest.TestCase):
+
+    def test_reads_sample_file(self):
+        """Test that the header of the sample recording is parsed"""
+        info = AudioSource(AUDIO_PATH).wav_info()
+        self.assertEqual((info.sample_rate, info.channels, info.sample_width), (16000, 1, 2))
+        self.assertAlmostEqual(info.duration, 1.228, places=2)
+
+    def test_skips_extra_chunks(self):
+        """Test that chunks between fmt and data are skipped"""
+        pcm = bytes(32000)
+        header = wav_header(len(pcm))
+        extra = b"LIST" + struct.pack("<I", 5) + b"hello\x00"
+        wav = header[:36] + extra + header[36:] + pcm
+        info = AudioSource(wav).wav_info()
+        self.assertAlmostEqual(info.duration, 1.0)
+
+    def test_not_a_wav(self):
+        """Test that audio without a RIFF header gives no info"""
+        self.assertIsNone(AudioSource(b"ID3" + bytes(100), audio_type="mp3").wav_info())
+
+    def test_reads_only_the_header(self):
+        """Test that a long recording is measured without reading its samples"""
+        size = 44 + 16000 * 2 * 600
+        stream = _HeaderOnly(wav_header(size - 44), size)
+        info = AudioSource(stream).wav_info()
+        self.assertAlmostEqual(info.duration, 600.0)
+        self.assertLessEqual(stream.bytes_read, 44)
+
+    def test_placeholder_data_size(self):
+        """Test that a streamed header's placeholder size is bounded by the real audio"""
+        pcm = bytes(16000)
+        info = AudioSource(wav_header(0xFFFFFFFF - 36) + pcm).wav_info()
+        self.assertAlmostEqual(info.duration, 0.5)
+
+
+class TestPreflight(unittest.TestCase):
+
+    def test_accepts_valid_requests(self):
+        """Test that well-formed requests for every registered core type pass"""
+        source = AudioSource(AUDIO_PATH)
+        preflight({"coreType": "word.eval.kr", "refText": "namja"}, source)
+        preflight({"coreType": "sent.eval.kr", "refText": "namja keoyo"}, source)
+        preflight({"coreType": "word.eval.promax", "refText": "supermarket"}, source)
+        preflight({"coreType": "sent.eval.promax", "refText": "I like apples"}, source)
+        preflight({"coreType": "speak.eval.pro", "questionPrompt": "Why?", "testType": "ielts"}, source)
+
+    def test_rejects_long_audio(self):
+        """Test that audio over the 90-second limit is rejected"""
+        size = 44 + 16000 * 2 * 91
+        source = AudioSource(_HeaderOnly(wav_header(size - 44), size))
+        with self.assertRaisesRegex(PreflightError, "at most 90 seconds"):
+            preflight({"coreType": "sent.eval.kr", "refText": "namja keoyo"}, source)
+
+    def test_rejects_wrong_sample_rate(self):
+        """Test that a declared rate the API does not accept, or one that disagrees with the header, is rejected"""
+        request = {"coreType": "word.eval.kr", "refText": "namja"}
+        with self.assertRaisesRegex(PreflightError, "sample rates 16000"):
+            preflight(request, None, sample_rate=44100)
+        source = AudioSource(wav_header(32000, sample_rate=44100) + bytes(32000))
+        with self.assertRaisesRegex(PreflightError, "44100 Hz"):
+            preflight(request, source)
+
+    def test_rejects_stereo(self):
+        """Test that stereo audio is rejected"""
+        source = AudioSource(wav_header(3200, channels=2) + bytes(3200))
+        with self.assertRaisesRegex(PreflightError, "2 channels"):
+            preflight({"coreType": "word.eval.kr", "refText": "namja"}, source)
+
+    def test_converted_audio_is_checked_for_duration_only(self):
+        """Test that audio to be converted may have any format but not any length"""
+        request = {"coreType": "word.eval.kr", "refText": "namja"}
+        source = AudioSource(wav_header(3200, sample_rate=44100, channels=2) + bytes(3200))
+        preflight(request, source, convert=True)
+        size = 44 + 48000 * 4 * 91
+        source = AudioSource(_HeaderOnly(wav_header(size - 44, sample_rate=48000, channels=2), size))
+        with self.assertRaisesRegex(PreflightError, "at most 90 seconds"):
+            preflight(request, source, convert=True)
+
+    def test_rejects_several_words_for_word_core_type(self):
+        """Test that word.eval.kr only takes a single word"""
+        with self.assertRaisesRegex(PreflightError, "single word"):
+            preflight({"coreType": "word.eval.kr", "refText": "namja keoyo"})
+
+    def test_requires_question_prompt(self):
+        """Test that speak.eval.pro needs a question prompt"""
+        with self.assertRaisesRegex(PreflightError, "questionPrompt"):
+            preflight({"coreType": "speak.eval.pro", "questionPrompt": " ", "testType": "ielts"})
+
+    def test_unknown_core_type_passes(self):
+        """Test that core types missing from the registry are left to the API"""
+        preflight({"coreType": "para.eval.promax", "refText": "anything at all"}, None, sample_rate=8000)
+
+    def test_unreadable_header_passes(self):
+        """Test that audio whose header cannot be parsed is left to the API"""
+        preflight({"coreType": "word.eval.kr", "refText": "namja"}, AudioSource(b"RIFF"))
+
+    def test_register_custom_core_type(self):
+        """Test that new core types can be described"""
+        register(CoreType("word.eval.test", max_duration=1.0))
+        try:
+            self.assertEqual(get_core_type("word.eval.test").max_duration, 1.0)
+            with self.assertRaises(PreflightError):
+                preflight({"coreType": "word.eval.test", "refText": "x"}, AudioSource(AUDIO_PATH))
+        finally:
+            del CORE_TYPES["word.eval.test"]
+
+
+class TestClientPreflight(unittest.TestCase):
+
+    def test_rejected_before_upload(self):
+        """Test that the client reports a preflight failure without sending anything"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        result = api.evaluate_pronunciation(AUDIO_PATH, "namja keoyo", core_type="word.eval.kr")
+        self.assertIn("single word", result["error"])
+        result = api.evaluate_spontaneous_speech(AUDIO_PATH, "")
+        self.assertIn("questionPrompt", result["error"])
+        self.assertEqual(transport.request_count, 0)
+
+    def test_rejected_before_conversion(self):
+        """Test that audio needing conversion is not converted for a request that fails preflight"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        size = 44 + 48000 * 4 * 600  # ten minutes of 48 kHz stereo
+        for ref_text, error in (("namja keoyo", "single word"), ("namja", "at most 90 seconds")):
+            audio = _HeaderOnly(wav_header(size - 44, sample_rate=48000, channels=2), size)
+            result = api.evaluate_pronunciation(audio, ref_text, core_type="word.eval.kr")
+            self.assertIn(error, result["error"])
+            self.assertLess(audio.bytes_read, 4096)
+        self.assertEqual(transport.request_count, 0)
+
+    def test_preflight_can_be_disabled(self):
+        """Test that preflight=False sends every request to the API"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          preflight=False)
+        result = api.evaluate_pronunciation(AUDIO_PATH, "namja keoyo", core_type="word.eval.kr")
+        self.assertNotIn("error", result)
+        self.assertEqual(transport.request_count, 1)
+
+    def test_streaming_session_is_checked(self):
+        """Test that streaming sessions are checked before the socket is opened"""
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+        with self.assertRaises(PreflightError):
+            api.stream_pronunciation("namja keoyo", core_type="word.eval.kr")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import unittest
+import zlib
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import encoding
+from src.audio_source import AudioSource, wav_header
+from src.encoding import Encoder, FFmpegEncoder, SoundFileEncoder, encode_source, pick_encoder
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class ZlibEncoder(Encoder):
+    """Stand-in codec: compresses, but declares ogg like a real encoder would."""
+
+    audio_type = "ogg"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def encode(self, pcm, sample_rate):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("encoder crashed")
+        return b"OggS" + zlib.compress(bytes(pcm))
+
+
+class TestEncodeSource(unittest.TestCase):
+
+    def test_encodes_samples_only(self):
+        """Test that the PCM after the WAV header is what gets encoded"""
+        pcm = bytes(range(256)) * 10
+        encoded = encode_source(ZlibEncoder(), AudioSource(wav_header(len(pcm)) + pcm))
+        with encoded.open() as audio_file:
+            data = audio_file.read()
+        self.assertEqual(zlib.decompress(data[4:]), pcm)
+        self.assertEqual(encoded.audio_type, "ogg")
+        self.assertEqual(encoded.name, "audio.ogg")
+
+    def test_skips_audio_it_cannot_encode(self):
+        """Test that stereo WAV and non-WAV audio are left alone"""
+        stereo = wav_header(400, channels=2) + bytes(400)
+        self.assertIsNone(encode_source(ZlibEncoder(), AudioSource(stereo)))
+        self.assertIsNone(encode_source(ZlibEncoder(), AudioSource(b"ID3" + bytes(64), "mp3")))
+
+
+class TestPickEncoder(unittest.TestCase):
+
+    def test_rejects_formats_the_api_does_not_accept(self):
+        """Test that FLAC is refused, since the API does not take it"""
+        with self.assertRaises(ValueError):
+            pick_encoder("flac")
+
+    def test_no_backend(self):
+        """Test that asking for compression without soundfile or ffmpeg raises ImportError"""
+        with patch.object(encoding, "soundfile", None), patch("shutil.which", return_value=None):
+            with self.assertRaises(ImportError):
+                pick_encoder("auto")
+
+    def test_ffmpeg_backend_is_found(self):
+        """Test that ffmpeg is used when soundfile is missing"""
+        with patch.object(encoding, "soundfile", None), patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+            encoder = pick_encoder("mp3")
+        self.assertIsInstance(encoder, FFmpegEncoder)
+        self.assertEqual(encoder.audio_type, "mp3")
+
+    def test_instance_is_used_as_is(self):
+        """Test that an Encoder instance is returned unchanged"""
+        encoder = ZlibEncoder()
+        self.assertIs(pick_encoder(encoder), encoder)
+
+
+class TestCompressedUpload(unittest.TestCase):
+
+    def test_upload_is_compressed_and_declared(self):
+        """Test that the client uploads the encoded audio and declares its type"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          compress=ZlibEncoder())
+        result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+
+        self.assertNotIn("error", result)
+        request = transport.requests[0]
+        self.assertTrue(request.audio.startswith(b"OggS"))
+        self.assertEqual(request.params["start"]["param"]["audio"]["audioType"], "ogg")
+        self.assertLess(len(request.audio), os.path.getsize(AUDIO_PATH))
+        api.close()
+
+    def test_encoder_failure_falls_back_to_wav(self):
+        """Test that a failing encoder does not fail the evaluation"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          compress=ZlibEncoder(fail=True))
+        result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+
+        self.assertNotIn("error", result)
+        request = transport.requests[0]
+        self.assertEqual(request.params["start"]["param"]["audio"]["audioType"], "wav")
+        with open(AUDIO_PATH, 'rb') as f:
+            self.assertEqual(request.audio, f.read())
+        api.close()
+
+    def test_compression_is_opt_in(self):
+        """Test that WAV is uploaded unless compression is asked for"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertIsNone(api.encoder)
+        self.assertEqual(transport.requests[0].params["start"]["param"]["audio"]["audioType"], "wav")
+
+
+class TestBackends(unittest.TestCase):
+
+    @unittest.skipUnless(SoundFileEncoder("ogg").available(), "soundfile with OGG support is not installed")
+    def test_soundfile_ogg(self):
+        """Test that soundfile writes an OGG stream"""
+        encoded = encode_source(SoundFileEncoder("ogg"), AudioSource(AUDIO_PATH))
+        with encoded.open() as audio_file:
+            self.assertEqual(audio_file.read(4), b"OggS")
+
+    @unittest.skipUnless(FFmpegEncoder("mp3").available(), "ffmpeg is not installed")
+    def test_ffmpeg_mp3(self):
+        """Test that ffmpeg writes a smaller MP3 stream"""
+        encoded = encode_source(FFmpegEncoder("mp3"), AudioSource(AUDIO_PATH))
+        self.assertLess(encoded.size, os.path.getsize(AUDIO_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
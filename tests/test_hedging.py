@@ -0,0 +1,99 @@
+import itertools
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.hedging import HedgePolicy
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class TestHedgePolicy(unittest.TestCase):
+
+    def test_no_hedging_without_history(self):
+        """Test that no delay is offered until enough latencies were recorded"""
+        policy = HedgePolicy(min_samples=3, min_delay=0.0)
+        self.assertIsNone(policy.delay())
+        for latency in (0.1, 0.2, 0.3):
+            policy.record(latency)
+        self.assertEqual(policy.delay(), 0.3)
+
+    def test_delay_uses_percentile_and_floor(self):
+        """Test that the delay follows the latency percentile but never drops below min_delay"""
+        policy = HedgePolicy(percentile=0.5, min_samples=1, min_delay=0.0)
+        for latency in range(1, 11):
+            policy.record(latency / 100)
+        self.assertAlmostEqual(policy.delay(), 0.06)
+        policy.min_delay = 0.5
+        self.assertEqual(policy.delay(), 0.5)
+
+    def test_extra_load_budget(self):
+        """Test that duplicates never exceed max_extra_ratio of calls"""
+        policy = HedgePolicy(max_extra_ratio=0.1)
+        for _ in range(10):
+            policy.delay()
+        self.assertTrue(policy.try_hedge())
+        self.assertFalse(policy.try_hedge())
+        self.assertEqual(policy.stats()["extra_load"], 0.1)
+
+
+class TestHedgedRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.counter = itertools.count(1)
+        self.slow = set()
+
+        def respond(handler):
+            if next(self.counter) in self.slow:
+                time.sleep(1.5)
+            return 200, CANNED_RESULT
+        self.server.respond = respond
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_api(self, policy):
+        return SuperSpeech(app_key="test_key", secret_key="test_secret",
+                           base_url=self.server.url, hedge=policy)
+
+    def test_duplicate_answers_slow_call(self):
+        """Test that a stalled interactive call is answered by its duplicate"""
+        policy = HedgePolicy(min_samples=5, max_extra_ratio=0.5)
+        api = self.make_api(policy)
+        for _ in range(5):
+            api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+
+        self.slow.add(6)
+        start = time.monotonic()
+        result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        elapsed = time.monotonic() - start
+        api.close()
+
+        self.assertEqual(result["result"]["overall"], CANNED_RESULT["result"]["overall"])
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(policy.stats()["hedges"], 1)
+        self.assertEqual(policy.hedge_wins, 1)
+
+    def test_bulk_calls_are_not_hedged(self):
+        """Test that batch jobs wait for their own request instead of hedging"""
+        policy = HedgePolicy(min_samples=1, max_extra_ratio=1.0)
+        api = self.make_api(policy)
+        api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+
+        self.slow.add(2)
+        records = api.evaluate_batch([(AUDIO_PATH, "supermarket")])
+        api.close()
+
+        self.assertIsNone(records[0]["error"])
+        self.assertEqual(policy.stats()["hedges"], 0)
+        self.assertEqual(self.server.request_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
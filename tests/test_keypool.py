@@ -0,0 +1,176 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.keypool import KeyPool, key_outcome
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class TestKeyPool(unittest.TestCase):
+
+    def test_spreads_requests_over_keys(self):
+        """Test that idle keys of equal health take turns"""
+        pool = KeyPool([("key_a", "secret_a"), ("key_b", "secret_b")])
+        used = []
+        for _ in range(4):
+            key = pool.acquire()
+            used.append(key.app_key)
+            pool.release(key)
+        self.assertEqual(sorted(used), ["key_a", "key_a", "key_b", "key_b"])
+
+    def test_prefers_remaining_quota_and_low_error_rate(self):
+        """Test that keys with more quota left and fewer errors are chosen first"""
+        pool = KeyPool([("key_a", "secret_a", 10), ("key_b", "secret_b", 100)])
+        self.assertEqual(pool.acquire().app_key, "key_b")
+
+        pool = KeyPool([("key_a", "secret_a"), ("key_b", "secret_b")])
+        for _ in range(2):
+            key = pool.acquire()
+            pool.release(key, "error" if key.app_key == "key_a" else "ok")
+        self.assertEqual(pool.stats()[0]["error_rate"], 1.0)
+        self.assertEqual(pool.acquire().app_key, "key_b")
+
+    def test_quota_exhaustion(self):
+        """Test that a key is skipped once its quota is used up and renewed after the window"""
+        pool = KeyPool([("key_a", "secret_a", 1)], window=0.2)
+        key = pool.acquire()
+        pool.release(key)
+        self.assertIsNone(pool.acquire())
+        self.assertGreater(pool.retry_after(), 0)
+        time.sleep(0.25)
+        self.assertIs(pool.acquire(), key)
+
+    def test_rejected_key_is_probed_back(self):
+        """Test that an auth failure rests the key, then one probe may restore it"""
+        pool = KeyPool([("key_a", "secret_a")], cooldown=0.1)
+        key = pool.acquire()
+        pool.release(key, "auth")
+        self.assertIsNone(pool.acquire())
+        self.assertEqual(pool.stats()[0]["disabled_reason"], "auth")
+
+        time.sleep(0.15)
+        probe = pool.acquire()
+        self.assertIs(probe, key)
+        self.assertIsNone(pool.acquire())  # only one probe at a time
+        pool.release(probe, "ok")
+        self.assertIsNone(pool.stats()[0]["disabled_reason"])
+        self.assertIs(pool.acquire(), key)
+
+    def test_only_the_probe_ends_the_rest(self):
+        """Test that a request already in flight when the key was rested does not end the probe"""
+        pool = KeyPool([("key_a", "secret_a")], cooldown=0.1)
+        stale = pool.acquire()
+        pool.release(pool.acquire(), "auth")
+        time.sleep(0.15)
+        probe = pool.acquire()
+        self.assertIs(probe, stale)
+
+        # The stale request finishes on another thread while the probe is still out
+        thread = threading.Thread(target=pool.release, args=(stale, "ok"))
+        thread.start()
+        thread.join()
+        self.assertIsNone(pool.acquire())
+        self.assertEqual(pool.stats()[0]["disabled_reason"], "auth")
+
+        pool.release(probe, "ok")
+        self.assertIs(pool.acquire(), probe)
+
+    def test_key_outcome(self):
+        """Test the classification of responses into key outcomes"""
+        self.assertEqual(key_outcome(401, ""), "auth")
+        self.assertEqual(key_outcome(429, "{}"), "quota")
+        self.assertEqual(key_outcome(502, "bad gateway"), "error")
+        self.assertEqual(key_outcome(200, '{"errId": 1, "error": "invalid sig"}', auth_err_ids={1}), "auth")
+        self.assertEqual(key_outcome(200, '{"errId": 2, "error": "busy"}', quota_err_ids={2}), "quota")
+        self.assertEqual(key_outcome(200, '{"errId": 3, "error": "audio too short"}', {1}, {2}), "ok")
+        self.assertEqual(key_outcome(200, '{"result": {}}', {1}, {2}), "ok")
+        # Messages alone never reject a key
+        for message in ("invalid sig", "quota exceeded", "audio length exceeds limit",
+                        "sample rate not supported"):
+            self.assertEqual(key_outcome(200, json.dumps({"errId": 9, "error": message})), "ok", message)
+
+    def test_from_env(self):
+        """Test reading numbered credentials and quotas from the environment"""
+        env = {"SPEECHSUPER_APP_KEY": "key_a", "SPEECHSUPER_SECRET_KEY": "secret_a",
+               "SPEECHSUPER_APP_KEY_1": "key_b", "SPEECHSUPER_SECRET_KEY_1": "secret_b",
+               "SPEECHSUPER_QUOTA_1": "500"}
+        with patch.dict(os.environ, env, clear=True):
+            pool = KeyPool.from_env()
+        self.assertEqual([key.app_key for key in pool.keys], ["key_a", "key_b"])
+        self.assertEqual([key.quota for key in pool.keys], [None, 500])
+
+
+class TestSuperSpeechKeyPool(unittest.TestCase):
+
+    def fake_post(self, url, data=None, **kwargs):
+        params = json.loads(data["text"])
+        app_key = params["connect"]["param"]["app"]["applicationId"]
+        self.app_keys.append(app_key)
+        response = MagicMock()
+        if app_key == "bad_key":
+            response.status_code = 401
+            response.text = '{"errId": 41001, "error": "invalid appkey"}'
+        else:
+            response.status_code = 200
+            response.text = '{"result": {"overall": 88}}'
+        return response
+
+    @patch('requests.Session.post')
+    def test_rejected_key_is_taken_out_of_rotation(self, mock_post):
+        """Test that a rejected key's call is retried on another key and the key is rested"""
+        self.app_keys = []
+        mock_post.side_effect = self.fake_post
+        api = SuperSpeech(keys=[("bad_key", "secret_a"), ("good_key", "secret_b")])
+        with patch('builtins.open', MagicMock()):
+            results = [api.evaluate_pronunciation("fake_path.wav", "test") for _ in range(4)]
+
+        self.assertTrue(all(result["result"]["overall"] == 88 for result in results))
+        self.assertEqual(self.app_keys.count("bad_key"), 1)
+        self.assertEqual(self.app_keys.count("good_key"), 4)
+        self.assertEqual(api.breaker.failures, 0)
+
+        params = json.loads(mock_post.call_args.kwargs["data"]["text"])
+        timestamp = params["connect"]["param"]["app"]["timestamp"]
+        good_key = api.keys.keys[1]
+        self.assertEqual(params["connect"]["param"]["app"]["sig"],
+                         api._generate_signatures(timestamp, good_key)[0])
+
+    def test_input_error_leaves_the_pool_usable(self):
+        """Test that a bad request is answered once and rests no key"""
+        error = {"errId": 41030, "error": "audio length exceeds limit"}
+        transport = FakeTransport(lambda request: (200, error))
+        api = SuperSpeech(keys=[("key_a", "secret_a"), ("key_b", "secret_b"), ("key_c", "secret_c")],
+                          transport=transport)
+        self.assertEqual(api.evaluate_pronunciation(AUDIO_PATH, "test"), error)
+        self.assertEqual(transport.request_count, 1)
+        self.assertTrue(all(stat["available"] for stat in api.keys.stats()))
+
+        transport.respond = lambda request: (200, {"result": {"overall": 88}})
+        self.assertEqual(api.evaluate_pronunciation(AUDIO_PATH, "test")["result"]["overall"], 88)
+        api.close()
+
+    def test_known_err_ids_rest_the_key(self):
+        """Test that an errId configured as quota moves the call to another key"""
+        def respond(request):
+            app_key = request.params["connect"]["param"]["app"]["applicationId"]
+            return (200, {"errId": 20009, "error": "busy"} if app_key == "key_a" else {"result": {}})
+        keys = KeyPool([("key_a", "secret_a", 100), ("key_b", "secret_b", 10)], quota_err_ids={20009})
+        transport = FakeTransport(respond)
+        api = SuperSpeech(keys=keys, transport=transport)
+        self.assertEqual(api.evaluate_pronunciation(AUDIO_PATH, "test"), {"result": {}})
+        self.assertEqual(transport.request_count, 2)
+        self.assertEqual(keys.stats()[0]["disabled_reason"], "quota")
+        api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
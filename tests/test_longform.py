@@ -0,0 +1,181 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import wave
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport
+
+if np is not None:
+    from src.longform import Segment, load_samples, merge_results, split_at_pauses
+
+
+def speech(phrases, rate=16000, phrase_seconds=3.0, pause_seconds=0.5):
+    """int16 recording of tone bursts separated by quiet pauses."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * phrase_seconds)) / rate
+    phrase = 8000 * np.sin(2 * np.pi * 220 * t)
+    parts = []
+    for _ in range(phrases):
+        parts.append(phrase)
+        parts.append(rng.standard_normal(int(rate * pause_seconds)) * 30)
+    return np.concatenate(parts).astype(np.int16)
+
+
+def write_wav(path, samples, rate=16000):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSplitAtPauses(unittest.TestCase):
+
+    def test_cuts_in_pauses(self):
+        """Test that segments stay under the limit and end in the middle of a pause"""
+        samples = speech(6)  # phrases start every 3.5 s
+        segments = split_at_pauses(samples, max_seconds=8)
+        self.assertEqual([segment.start for segment in segments], [0, 337 * 320, 687 * 320])
+        self.assertEqual(segments[-1].end, len(samples))
+        for segment in segments:
+            self.assertLessEqual(segment.end - segment.start, 8 * 16000)
+            self.assertTrue(np.shares_memory(segment.samples, samples))
+
+    def test_cuts_speech_without_pauses(self):
+        """Test that speech with no pause is cut at the limit"""
+        t = np.arange(16000 * 10) / 16000
+        # Four syllables a second with short dips between them
+        samples = (8000 * np.sin(2 * np.pi * 220 * t) * np.abs(np.sin(2 * np.pi * 2 * t))).astype(np.int16)
+        segments = split_at_pauses(samples, max_seconds=4)
+        self.assertEqual([segment.end - segment.start for segment in segments], [64000, 64000, 32000])
+
+    def test_silent_segments_are_dropped(self):
+        """Test that a stretch without speech is not sent"""
+        samples = np.concatenate([speech(1), np.zeros(16000 * 10, dtype=np.int16), speech(1)])
+        segments = split_at_pauses(samples, max_seconds=5)
+        self.assertEqual(len(segments), 2)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestLoadSamples(unittest.TestCase):
+
+    def test_wav_file_is_memory_mapped(self):
+        """Test that a 16 kHz mono WAV file is mapped instead of read"""
+        samples = speech(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "long.wav")
+            write_wav(path, samples)
+            loaded, rate = load_samples(path)
+            self.assertEqual(rate, 16000)
+            self.assertTrue(np.array_equal(loaded, samples))
+            self.assertFalse(loaded.flags.writeable)
+            del loaded
+
+    def test_wav_bytes_are_viewed(self):
+        """Test that WAV bytes in memory are viewed in place"""
+        data = bytearray(b"RIFF" + (36 + 8).to_bytes(4, "little") + b"WAVE" + b"fmt " + (16).to_bytes(4, "little")
+                         + bytes.fromhex("0100 0100 803e0000 007d0000 0200 1000") + b"data"
+                         + (8).to_bytes(4, "little") + bytes(range(8)))
+        loaded, rate = load_samples(data)
+        self.assertEqual(len(loaded), 4)
+        self.assertTrue(np.shares_memory(loaded, np.frombuffer(data, dtype=np.uint8)))
+
+    def test_compressed_bytes_are_refused(self):
+        """Test that MP3, OGG and FLAC data is not mistaken for raw PCM"""
+        for data in (b"ID3\x04" + bytes(64), b"\xff\xfb\x90\x64" + bytes(64), b"OggS" + bytes(64),
+                     b"fLaC" + bytes(64)):
+            with self.assertRaises(ValueError):
+                load_samples(data)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMergeResults(unittest.TestCase):
+
+    def test_scores_are_weighted_by_duration(self):
+        """Test that a longer segment counts for more, and failed segments not at all"""
+        segments = [Segment(None, 0, 48000, 16000), Segment(None, 48000, 64000, 16000),
+                    Segment(None, 64000, 80000, 16000)]
+        results = [{"result": {"overall": 80, "fluency": 70, "pronunciation": 90}},
+                   {"result": {"overall": 40, "fluency": 50, "pronunciation": 30}},
+                   {"error": "timed out"}]
+        merged = merge_results(segments, results)["result"]
+        self.assertEqual((merged["overall"], merged["fluency"], merged["pronunciation"]), (70.0, 65.0, 75.0))
+        self.assertEqual(merged["duration"], "4.00")
+        self.assertEqual(merged["segments"][2], {"start": 4.0, "end": 5.0, "error": "timed out"})
+
+    def test_word_timings_are_shifted(self):
+        """Test that word spans are moved to the timeline of the whole recording"""
+        segments = [Segment(None, 0, 32000, 16000), Segment(None, 32000, 64000, 16000)]
+        word = {"word": "hello", "scores": {"overall": 90}, "span": {"start": 10, "end": 60}}
+        merged = merge_results(segments, [{"result": {"words": [word]}}] * 2)["result"]
+        self.assertEqual([w["span"] for w in merged["words"]],
+                         [{"start": 10, "end": 60}, {"start": 210, "end": 260}])
+        self.assertEqual(word["span"], {"start": 10, "end": 60})
+
+    def test_all_segments_failed(self):
+        """Test that the merged response is an error when no segment succeeded"""
+        merged = merge_results([Segment(None, 0, 16000, 16000)], [{"error": "bad key"}])
+        self.assertEqual(merged["error"], "bad key")
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestEvaluateLongSpeech(unittest.TestCase):
+
+    def test_segments_are_evaluated_concurrently(self):
+        """Test that every segment is sent, at the same time, and the results merged"""
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def respond(request):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            return 200, {"result": {"overall": 80, "fluency": 80, "pronunciation": 80,
+                                    "words": [{"word": "a", "span": {"start": 0, "end": 50}}]}}
+        transport = FakeTransport(respond)
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        samples = speech(6)
+        result = api.evaluate_long_speech(samples, "Describe your town", max_segment_seconds=8)
+
+        self.assertEqual(transport.request_count, 3)
+        self.assertEqual(active[1], 3)
+        self.assertEqual(result["result"]["overall"], 80.0)
+        self.assertEqual([word["span"]["start"] for word in result["result"]["words"]], [0, 674, 1374])
+        api.close()
+
+    def test_silence_is_not_sent(self):
+        """Test that a silent recording is reported without any request"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        result = api.evaluate_long_speech(np.zeros(16000, dtype=np.int16), "Describe your town")
+        self.assertIn("error", result)
+        self.assertEqual(transport.request_count, 0)
+
+    def test_unreadable_audio_is_an_error(self):
+        """Test that a missing file or compressed audio is reported like other failures"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        missing = api.evaluate_long_speech(os.path.join(tempfile.gettempdir(), "missing.wav"), "Describe your town")
+        self.assertIn("No such file", missing["error"])
+        compressed = api.evaluate_long_speech(b"ID3\x04" + bytes(64000), "Describe your town")
+        self.assertIn("compressed", compressed["error"])
+        self.assertEqual(transport.request_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
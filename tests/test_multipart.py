@@ -0,0 +1,60 @@
+import io
+import json
+import os
+import sys
+import unittest
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.audio_source import AudioSource
+from src.multipart import MultipartEncoder
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class TestMultipartEncoder(unittest.TestCase):
+
+    def test_body_matches_requests_encoding(self):
+        """Test that the streamed body is byte-for-byte what requests would send"""
+        fields = {"text": json.dumps({"refText": "남자"})}
+        encoder = MultipartEncoder(fields, "audio", AudioSource(AUDIO_PATH), chunk_size=1000)
+        streamed = b"".join(encoder)
+
+        with open(AUDIO_PATH, 'rb') as audio_file:
+            prepared = requests.Request("POST", "http://localhost/", data=fields,
+                                        files={"audio": ("supermarket.wav", audio_file)}).prepare()
+        boundary = prepared.headers["Content-Type"].split("boundary=")[1]
+        expected = prepared.body.replace(boundary.encode("ascii"), encoder.boundary.encode("ascii"))
+
+        self.assertEqual(streamed, expected)
+        self.assertEqual(len(encoder), len(expected))
+
+    def test_reads_audio_in_chunks(self):
+        """Test that no single read returns more than one chunk of audio"""
+        audio = bytes(10000)
+        encoder = MultipartEncoder({"text": "{}"}, "audio", AudioSource(io.BytesIO(audio)),
+                                   chunk_size=512)
+        chunks = list(encoder)
+        self.assertTrue(all(len(chunk) <= 512 for chunk in chunks[1:-1]))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(encoder))
+
+
+class TestStreamingUpload(unittest.TestCase):
+
+    def test_large_upload_is_streamed(self):
+        """Test that uploads above the threshold go out with a matching Content-Length"""
+        with StandInServer() as server:
+            api = SuperSpeech(app_key="test_key", secret_key="test_secret",
+                              base_url=server.url, streaming_threshold=0)
+            result = api.evaluate_spontaneous_speech(AUDIO_PATH, "What's your favorite food?")
+            api.close()
+        self.assertEqual(result, CANNED_RESULT)
+        self.assertGreater(server.bytes_received, os.path.getsize(AUDIO_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.payload import PayloadTemplate, slot
+from src.keypool import ApiKey
+from src.speech_api import SuperSpeech
+
+
+class TestPayloadTemplate(unittest.TestCase):
+
+    def test_render(self):
+        """Test that slots are filled with JSON-encoded values of any type"""
+        template = PayloadTemplate({"a": slot("a"), "b": [1, slot("b")], "c": "fixed"})
+        self.assertEqual(template.names, ["a", "b"])
+        values = {"a": 'quote " and 한국어', "b": 3}
+        self.assertEqual(template.render(values),
+                         json.dumps({"a": values["a"], "b": [1, 3], "c": "fixed"}))
+
+
+class TestSerializeParams(unittest.TestCase):
+
+    def setUp(self):
+        self.api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+
+    def test_matches_build_params(self):
+        """Test that the cached template produces exactly json.dumps of the payload dict"""
+        key = ApiKey("other_key", "other_secret")
+        requests = [self.api._pronunciation_request("안녕하세요", "sent.eval.kr"),
+                    self.api._pronunciation_request('say "hi"'),
+                    self.api._spontaneous_request("Why?", penalize_offtopic=0)]
+        with patch.object(self.api, "_generate_timestamp", return_value="1700000000000"):
+            for request in requests:
+                for signer in (None, key):
+                    self.assertEqual(self.api._serialize_params(request, "wav", 8000, signer, "t1"),
+                                     json.dumps(self.api._build_params(request, "wav", 8000, signer, "t1")))
+
+    def test_template_per_shape(self):
+        """Test that one template is built per core type and reused across values"""
+        for word in ("one", "two", "three"):
+            self.api._serialize_params(self.api._pronunciation_request(word, "word.eval.kr"))
+        self.api._serialize_params(self.api._pronunciation_request("one two", "sent.eval.kr"))
+        self.assertEqual(len(self.api._templates), 2)
+
+    def test_unique_token_ids(self):
+        """Test that every request gets its own tokenId"""
+        request = self.api._pronunciation_request("test")
+        token_ids = {json.loads(self.api._serialize_params(request))["start"]["param"]["request"]["tokenId"]
+                     for _ in range(50)}
+        self.assertEqual(len(token_ids), 50)
+
+    @patch('builtins.print')
+    @patch('requests.Session.post')
+    def test_no_printing(self, mock_post, mock_print):
+        """Test that responses are logged at debug level instead of printed"""
+        mock_post.return_value = MagicMock(status_code=200, text='{"result": {"overall": 80}}')
+        with patch('builtins.open', MagicMock()), \
+             self.assertLogs("src.speech_api", level="DEBUG") as logs:
+            self.api.evaluate_pronunciation("fake_path.wav", "test")
+        mock_print.assert_not_called()
+        self.assertIn('"overall": 80', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
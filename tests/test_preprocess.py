@@ -0,0 +1,160 @@
+import io
+import os
+import struct
+import sys
+import unittest
+import wave
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.audio_source import AudioSource
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport
+
+if np is not None:
+    from src.preprocess import normalize, to_mono16
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def tone(rate, seconds, frequency=440.0, channels=1, amplitude=0.5):
+    """Float samples of a sine tone, one column per channel."""
+    t = np.arange(int(rate * seconds)) / rate
+    samples = amplitude * np.sin(2 * np.pi * frequency * t)
+    return np.repeat(samples[:, None], channels, axis=1)
+
+
+def wav_bytes(samples, rate, sample_width=2):
+    """Encode float samples (frames x channels) as a PCM WAV file."""
+    if sample_width == 1:
+        data = (samples * 127 + 128).astype(np.uint8).tobytes()
+    elif sample_width == 3:
+        ints = (samples * 8388607).astype(np.int32).reshape(-1)
+        data = np.stack([ints & 0xFF, (ints >> 8) & 0xFF, (ints >> 16) & 0xFF], axis=1).astype(np.uint8).tobytes()
+    else:
+        data = (samples * 32767).astype(np.int16).tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(sample_width)
+        wav.setframerate(rate)
+        wav.writeframes(data)
+    return buffer.getvalue()
+
+
+def float_wav_bytes(samples, rate):
+    """Encode float samples (frames x channels) as a 32-bit IEEE float WAV file."""
+    data = samples.astype(np.float32).tobytes()
+    channels = samples.shape[1]
+    header = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + len(data), b"WAVE", b"fmt ", 16, 3,
+                         channels, rate, rate * channels * 4, channels * 4, 32, b"data", len(data))
+    return header + data
+
+
+def peak_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.argmax(spectrum) * rate / len(samples)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestToMono16(unittest.TestCase):
+
+    def assert_tone(self, samples, frequency=440.0, amplitude=0.5, tolerance=0.01):
+        """The output is a 16 kHz tone of the expected length, pitch and level"""
+        self.assertEqual(samples.dtype, np.int16)
+        self.assertAlmostEqual(peak_frequency(samples, 16000), frequency, delta=2)
+        expected = tone(16000, len(samples) / 16000, frequency, amplitude=amplitude)[:, 0] * 32767
+        self.assertLess(np.abs(samples[64:-64] - expected[64:-64]).max(), tolerance * 32767)
+
+    def test_downmix_and_downsample(self):
+        """Test that 44.1 and 48 kHz stereo becomes an aligned 16 kHz mono tone"""
+        for rate in (44100, 48000):
+            samples = to_mono16(AudioSource(wav_bytes(tone(rate, 2.0, channels=2), rate)))
+            self.assertEqual(len(samples), 32000)
+            self.assert_tone(samples)
+
+    def test_block_size_does_not_change_output(self):
+        """Test that streaming in small blocks gives the same samples as one big block"""
+        source = AudioSource(wav_bytes(tone(44100, 1.0, channels=2), 44100))
+        self.assertTrue(np.array_equal(to_mono16(source, block_frames=777),
+                                       to_mono16(source, block_frames=1 << 20)))
+
+    def test_upsample(self):
+        """Test that 8 kHz audio is upsampled"""
+        samples = to_mono16(AudioSource(wav_bytes(tone(8000, 1.0), 8000)))
+        self.assertEqual(len(samples), 16000)
+        self.assert_tone(samples, tolerance=0.02)
+
+    def test_removes_frequencies_above_nyquist(self):
+        """Test that content the 16 kHz output cannot represent is filtered instead of aliased"""
+        samples = to_mono16(AudioSource(wav_bytes(tone(48000, 1.0, frequency=12000), 48000)))
+        self.assertLess(np.abs(samples[64:-64]).max(), 0.01 * 32767)
+
+    def test_sample_formats(self):
+        """Test that 8-bit, 24-bit and float input is requantized to 16-bit"""
+        for data in (wav_bytes(tone(16000, 1.0), 16000, sample_width=1),
+                     wav_bytes(tone(16000, 1.0), 16000, sample_width=3),
+                     float_wav_bytes(tone(16000, 1.0), 16000)):
+            self.assert_tone(to_mono16(AudioSource(data)), tolerance=0.02)
+
+    def test_clips_instead_of_wrapping(self):
+        """Test that float samples beyond full scale are clipped"""
+        samples = to_mono16(AudioSource(float_wav_bytes(tone(16000, 0.1, amplitude=2.0), 16000)))
+        self.assertEqual(samples.max(), 32767)
+        self.assertEqual(samples.min(), -32768)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestNormalize(unittest.TestCase):
+
+    def test_target_format_is_passed_through(self):
+        """Test that 16 kHz 16-bit mono audio is not converted"""
+        source = AudioSource(AUDIO_PATH)
+        normalized, rate = normalize(source)
+        self.assertIs(normalized, source)
+        self.assertEqual(rate, 16000)
+
+    def test_not_wav_is_passed_through(self):
+        """Test that audio without a WAV header is left alone"""
+        source = AudioSource(b"ID3" + bytes(64), audio_type="mp3")
+        self.assertEqual(normalize(source), (source, None))
+
+    def test_client_uploads_and_declares_converted_audio(self):
+        """Test that the client sends 16 kHz mono and declares it, whatever rate the caller passed"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        data = wav_bytes(tone(48000, 1.0, channels=2), 48000)
+        result = api.evaluate_pronunciation(data, "supermarket", audio_sample_rate=48000)
+
+        self.assertNotIn("error", result)
+        request = transport.requests[0]
+        self.assertEqual(request.params["start"]["param"]["audio"]["sampleRate"], 16000)
+        with wave.open(io.BytesIO(request.audio)) as wav:
+            self.assertEqual((wav.getframerate(), wav.getnchannels(), wav.getsampwidth()), (16000, 1, 2))
+        self.assertLess(len(request.audio), len(data) / 5)
+
+    def test_declared_rate_comes_from_the_header(self):
+        """Test that a 16 kHz file is declared as 16 kHz even if the caller says otherwise"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          preflight=False)
+        api.evaluate_pronunciation(AUDIO_PATH, "supermarket", audio_sample_rate=44100)
+        self.assertEqual(transport.requests[0].params["start"]["param"]["audio"]["sampleRate"], 16000)
+
+    def test_normalization_can_be_disabled(self):
+        """Test that normalize_audio=False uploads the audio as given"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          preflight=False, normalize_audio=False)
+        data = wav_bytes(tone(48000, 0.5, channels=2), 48000)
+        api.evaluate_pronunciation(data, "supermarket", audio_sample_rate=48000)
+        self.assertEqual(transport.requests[0].audio, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ratelimit import RateLimiter
+from src.speech_api import SuperSpeech
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket_rate(self):
+        """Test that requests beyond the burst are spaced by the rate"""
+        limiter = RateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            self.assertTrue(limiter.acquire())
+            limiter.release()
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_concurrency_limit(self):
+        """Test that max_concurrent caps requests in flight"""
+        limiter = RateLimiter(rate=1000, max_concurrent=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.05))
+        limiter.release()
+        self.assertTrue(limiter.acquire(timeout=0.05))
+
+    def test_interactive_goes_first(self):
+        """Test that waiting interactive requests start before waiting bulk ones"""
+        limiter = RateLimiter(rate=1000, max_concurrent=1)
+        order = []
+        limiter.acquire("bulk")
+
+        def worker(lane, name):
+            limiter.acquire(lane)
+            order.append(name)
+            limiter.release()
+
+        threads = [threading.Thread(target=worker, args=("bulk", "bulk%d" % i)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=worker, args=("interactive", "gui"))
+        interactive.start()
+        time.sleep(0.05)
+        self.assertEqual(limiter.waiting(), {"interactive": 1, "bulk": 3})
+
+        limiter.release()
+        for thread in threads + [interactive]:
+            thread.join()
+        self.assertEqual(order[0], "gui")
+        self.assertEqual(limiter.granted, {"interactive": 1, "bulk": 4})
+
+
+class TestSuperSpeechRateLimit(unittest.TestCase):
+
+    @patch('requests.Session.post')
+    def test_lanes(self, mock_post):
+        """Test that direct calls use the interactive lane and batches the bulk lane"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = json.dumps({"result": {"overall": 90}})
+        mock_post.return_value = mock_response
+
+        limiter = RateLimiter(rate=1000, max_concurrent=2)
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", rate_limiter=limiter)
+        with patch('builtins.open', MagicMock()):
+            api.evaluate_pronunciation("a.wav", "namja", core_type="word.eval.kr")
+            api.evaluate_batch([("b.wav", "yeoja"), ("c.wav", "saram")])
+        self.assertEqual(limiter.granted, {"interactive": 1, "bulk": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
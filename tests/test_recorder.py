@@ -0,0 +1,113 @@
+import os
+import struct
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.recorder import FakePyAudio, PA_INPUT_OVERFLOW, Recorder
+
+
+def chunk(first, count=4):
+    """count 16-bit samples numbered from first, so their order can be checked."""
+    return struct.pack(f"<{count}h", *range(first, first + count))
+
+
+def samples(data):
+    return list(struct.unpack(f"<{len(data) // 2}h", bytes(data)))
+
+
+class TestRecorder(unittest.TestCase):
+
+    def make_recorder(self, max_seconds=1.0, **kwargs):
+        audio = FakePyAudio()
+        # 10 Hz keeps the numbers small: one second is 10 samples
+        recorder = Recorder(sample_rate=10, chunk=4, max_seconds=max_seconds, audio=audio, **kwargs)
+        return recorder, audio
+
+    def test_capture_is_one_view_of_the_buffer(self):
+        """Test that chunks end up in order in one buffer, returned without a copy"""
+        recorder, audio = self.make_recorder()
+        recorder.start()
+        audio.stream.push(chunk(0))
+        audio.stream.push(chunk(4))
+        data = recorder.stop()
+
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(samples(data), list(range(8)))
+        self.assertEqual(recorder.frames, 8)
+        self.assertFalse(recorder.recording)
+
+    def test_frames_over_the_limit_are_dropped(self):
+        """Test that the capture stops growing at max_seconds and the excess is counted"""
+        recorder, audio = self.make_recorder()
+        recorder.start()
+        for first in range(0, 16, 4):
+            audio.stream.push(chunk(first))
+        data = recorder.stop()
+
+        self.assertEqual(samples(data), list(range(10)))
+        self.assertEqual(recorder.dropped_frames, 6)
+
+    def test_overwrite_keeps_the_latest_audio(self):
+        """Test that with overwrite=True the buffer wraps and is returned oldest first"""
+        recorder, audio = self.make_recorder(overwrite=True)
+        recorder.start()
+        for first in range(0, 16, 4):
+            audio.stream.push(chunk(first))
+        self.assertEqual(samples(recorder.stop()), list(range(6, 16)))
+        self.assertEqual(recorder.dropped_frames, 6)
+
+        recorder.start()
+        audio.stream.push(chunk(100, count=25))  # one chunk longer than the whole buffer
+        self.assertEqual(samples(recorder.stop()), list(range(115, 125)))
+
+    def test_overflows_are_counted(self):
+        """Test that chunks flagged as input overflow are counted"""
+        recorder, audio = self.make_recorder()
+        recorder.start()
+        audio.stream.push(chunk(0), PA_INPUT_OVERFLOW)
+        audio.stream.push(chunk(4))
+        audio.stream.push(chunk(8), PA_INPUT_OVERFLOW)
+        recorder.stop()
+        self.assertEqual(recorder.overflows, 2)
+
+    def test_start_resets_the_capture(self):
+        """Test that a new capture reuses the buffer and starts from zero"""
+        recorder, audio = self.make_recorder()
+        recorder.start()
+        audio.stream.push(chunk(0, count=12), PA_INPUT_OVERFLOW)
+        recorder.stop()
+        buffer = recorder._buffer
+
+        recorder.start()
+        audio.stream.push(chunk(50))
+        self.assertEqual(samples(recorder.stop()), [50, 51, 52, 53])
+        self.assertIs(recorder._buffer, buffer)
+        self.assertEqual((recorder.overflows, recorder.dropped_frames), (0, 0))
+
+    def test_chunks_are_forwarded_from_the_audio_thread(self):
+        """Test that on_chunk sees every chunk, on the thread that delivers them"""
+        received = []
+        recorder, audio = self.make_recorder(on_chunk=lambda data: received.append((data, threading.get_ident())))
+        recorder.start()
+        thread = threading.Thread(target=lambda: [audio.stream.push(chunk(first)) for first in (0, 4)])
+        thread.start()
+        thread.join()
+        recorder.stop()
+
+        self.assertEqual([data for data, _ in received], [chunk(0), chunk(4)])
+        self.assertTrue(all(ident == thread.ident for _, ident in received))
+
+    def test_close_releases_only_its_own_device(self):
+        """Test that a recorder does not terminate a PyAudio instance it was given"""
+        recorder, audio = self.make_recorder()
+        with recorder:
+            recorder.start()
+        self.assertFalse(audio.terminated)
+        self.assertFalse(audio.stream.active)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.keypool import KeyPool
+from src.resilience import RetryPolicy, CircuitBreaker
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def scripted(*responses):
+    """Stand-in handler answering with the given (status, body) pairs, then the canned result"""
+    queue = list(responses)
+    return lambda handler: queue.pop(0) if queue else (200, CANNED_RESULT)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_capped_and_jittered(self):
+        """Test exponential growth, the cap and jitter bounds"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=False)
+        self.assertEqual([policy.backoff(n) for n in range(1, 6)], [0.5, 1.0, 2.0, 3.0, 3.0])
+        jittered = RetryPolicy(base_delay=0.5, max_delay=3.0)
+        self.assertTrue(all(0 <= jittered.backoff(3) <= 2.0 for _ in range(100)))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_then_probes(self):
+        """Test closed -> open -> half_open -> closed transitions"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        with patch('time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "closed")
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+            self.assertFalse(breaker.allow())
+        with patch('time.monotonic', return_value=111.0):
+            self.assertEqual(breaker.state, "half_open")
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())  # only one probe at a time
+            breaker.record_success()
+            self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.stats()["rejected"], 2)
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe opens the circuit again"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with patch('time.monotonic', return_value=0.0):
+            breaker.record_failure()
+        with patch('time.monotonic', return_value=10.0):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+
+    def test_abandoned_probe_is_released(self):
+        """Test that a probe ending without an outcome lets the next request probe"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with patch('time.monotonic', return_value=0.0):
+            breaker.record_failure()
+        with patch('time.monotonic', return_value=10.0):
+            self.assertTrue(breaker.allow())
+            breaker.release()
+            self.assertEqual(breaker.state, "half_open")
+            self.assertTrue(breaker.allow())
+
+
+class TestSuperSpeechRetries(unittest.TestCase):
+
+    def setUp(self):
+        """Start a local stand-in for the API"""
+        self.server = StandInServer().start()
+        self.api = SuperSpeech(app_key="test_key", secret_key="test_secret", base_url=self.server.url,
+                               retry=RetryPolicy(max_attempts=3, base_delay=0.01))
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_retries_5xx_and_empty_bodies(self):
+        """Test that transient failures are retried until success"""
+        self.server.respond = scripted((503, {"error": "busy"}), (200, b""))
+        result = self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(result, CANNED_RESULT)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(self.api._local.retries, 2)
+
+    def test_api_errors_are_not_retried(self):
+        """Test that errId responses are returned right away"""
+        error = {"errId": 41030, "error": "invalid coreType"}
+        self.server.respond = scripted((200, error))
+        self.assertEqual(self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket"), error)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_batch_reports_client_retries(self):
+        """Test that batch records include the client's automatic retries"""
+        self.server.respond = scripted((502, b""))
+        results = self.api.evaluate_batch([(AUDIO_PATH, "supermarket")])
+        self.assertEqual(results[0]["result"], CANNED_RESULT)
+        self.assertEqual(results[0]["retries"], 1)
+
+    def test_deadline_covers_all_attempts(self):
+        """Test that a slow upstream cannot hold a call past its deadline"""
+        self.server.delay = 0.8
+        start = time.monotonic()
+        result = self.api.evaluate_spontaneous_speech(AUDIO_PATH, "Why?", deadline=0.5)
+        self.assertIn("error", result)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_breaker_fails_fast(self):
+        """Test that an open circuit rejects calls without touching the network"""
+        self.api.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        self.server.respond = lambda handler: (500, b"")
+        self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(self.api.breaker.state, "open")
+        self.assertEqual(self.server.request_count, 3)
+
+        result = self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertTrue(result["error"].startswith("Circuit breaker open"))
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_probe_exception_does_not_stick_half_open(self):
+        """Test that a probe failing with any transport error is reported to the breaker"""
+        self.api.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.api.retry = RetryPolicy(max_attempts=1)
+        errors = [requests.ConnectionError("refused"), requests.exceptions.ChunkedEncodingError("cut off")]
+
+        def send(*args, **kwargs):
+            if errors:
+                raise errors.pop(0)
+            return 200, json.dumps(CANNED_RESULT)
+        with patch.object(self.api, '_send', side_effect=send):
+            self.assertIn("error", self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket"))
+            self.assertIn("error", self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket"))
+            self.assertEqual(self.api.breaker.failures, 2)
+            self.assertEqual(self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket"), CANNED_RESULT)
+        self.assertEqual(self.api.breaker.state, "closed")
+
+    def test_probe_without_key_is_released(self):
+        """Test that a probe which finds no usable key does not hold the circuit half open"""
+        self.api.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.api.breaker.record_failure()
+        self.api.keys = KeyPool([("key", "secret")])
+        with patch.object(self.api.keys, 'acquire', return_value=None):
+            result = self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertTrue(result["error"].startswith("No API key available"))
+        self.assertTrue(self.api.breaker.allow())
+
+    def test_rejected_key_does_not_close_the_circuit(self):
+        """Test that a probe answered with a credential error leaves the circuit half open"""
+        self.api.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.api.breaker.record_failure()
+        self.api.keys = KeyPool([("key", "secret")])
+        self.api.retry = RetryPolicy(max_attempts=1)
+        self.server.respond = lambda handler: (401, {"error": "unauthorized"})
+        self.api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(self.api.breaker.state, "half_open")
+        self.assertTrue(self.api.breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import copy
+import json
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cache import ResultCache
+from src.resilience import RetryPolicy
+from src.results import EvaluationResult, Word
+from src.speech_api import SuperSpeech
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+WORD_RESULT = {
+    "result": {
+        "overall": 76, "pronunciation": 80, "fluency": 70, "rhythm": 65, "speed": 98,
+        "integrity": 100, "duration": "0.95",
+        "words": [{
+            "word": "supermarket",
+            "scores": {"overall": 76, "pronunciation": 80},
+            "span": {"start": 12, "end": 95},
+            "phonics": [[{"phoneme": "s", "spell": "s", "overall": 90},
+                         {"phoneme": "uː", "spell": "u", "overall": 62}]]
+        }]
+    }
+}
+
+
+class TestEvaluationResult(unittest.TestCase):
+
+    def test_fields(self):
+        """Test that scores, words and phonics are read from the response"""
+        result = EvaluationResult(json.dumps(WORD_RESULT).encode("utf-8"))
+        self.assertTrue(result.ok)
+        self.assertEqual((result.overall, result.pronunciation, result.fluency, result.rhythm,
+                          result.speed, result.integrity), (76, 80, 70, 65, 98, 100))
+        self.assertEqual(result.duration, 0.95)
+
+        word = result.words[0]
+        self.assertEqual((word.word, word.overall, word.pronunciation, word.start, word.end),
+                         ("supermarket", 76, 80, 12, 95))
+        self.assertEqual([(p.phoneme, p.spell, p.score) for p in word.phonics],
+                         [("s", "s", 90), ("uː", "u", 62)])
+
+    def test_lazy_decoding(self):
+        """Test that the body is not decoded until a field is read"""
+        result = EvaluationResult(b'{"result": {"overall": 50}}')
+        self.assertFalse(result._parsed)
+        self.assertEqual(result.overall, 50)
+        self.assertTrue(result._parsed)
+        self.assertIsNone(result.fluency)
+        self.assertEqual(result.words, ())
+
+    def test_slots(self):
+        """Test that results, words and phonics carry no per-instance dict"""
+        result = EvaluationResult(json.dumps(WORD_RESULT))
+        for obj in (result, result.words[0], result.words[0].phonics[0]):
+            self.assertFalse(hasattr(obj, "__dict__"))
+
+    def test_flat_phonics_list(self):
+        """Test phonics given as a flat list with a phoneme list per entry"""
+        word = Word.from_dict({"word": "cat", "phonics": [{"phoneme": ["k", "æ"], "spell": "ca", "score": 71}]})
+        self.assertEqual((word.phonics[0].phoneme, word.phonics[0].score), ("k æ", 71))
+
+    def test_raw_and_dict_access(self):
+        """Test the .raw escape hatch and the read-only dict interface"""
+        result = EvaluationResult(json.dumps(WORD_RESULT))
+        self.assertEqual(result.raw, WORD_RESULT)
+        self.assertEqual(result["result"]["overall"], 76)
+        self.assertIn("result", result)
+        self.assertNotIn("error", result)
+        self.assertIsNone(result.get("error"))
+        self.assertIs(copy.deepcopy(result), result)
+
+    def test_errors(self):
+        """Test API errors and malformed bodies"""
+        result = EvaluationResult.from_dict({"errId": 42003, "error": "audio too short"})
+        self.assertFalse(result.ok)
+        self.assertEqual((result.err_id, result.error), (42003, "audio too short"))
+        self.assertIn("error", result)
+
+        result = EvaluationResult(b"<html>Bad Gateway</html>")
+        self.assertIn("JSON decode error", result.error)
+
+
+class TestTypedClient(unittest.TestCase):
+
+    def test_typed_results(self):
+        """Test that typed_results returns EvaluationResult objects, also from the cache"""
+        with StandInServer() as server:
+            api = SuperSpeech(app_key="test_key", secret_key="test_secret", base_url=server.url,
+                              typed_results=True, cache=ResultCache(":memory:"),
+                              retry=RetryPolicy(max_attempts=1))
+            first = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+            second = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+            server.respond = lambda handler: (200, b"")
+            empty = api.evaluate_pronunciation(AUDIO_PATH, "supermarket", use_cache=False)
+            api.close()
+
+        self.assertIsInstance(first, EvaluationResult)
+        self.assertEqual(first.overall, CANNED_RESULT["result"]["overall"])
+        self.assertEqual(second, first)
+        self.assertEqual(server.request_count, 2)
+        self.assertEqual(api.cache.stats()["hits"], 1)
+        self.assertIn("Empty response", empty.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.singleflight import SingleFlight
+from src.speech_api import SuperSpeech
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def run_concurrently(fn, count):
+    """Call fn from count threads released at the same moment"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent calls run the work once"""
+        flights = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"result": {"overall": 80}}
+
+        results = run_concurrently(lambda: flights.do("key", work), 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.saved, 4)
+        self.assertTrue(all(r == {"result": {"overall": 80}} for r in results))
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failure is raised to the waiting callers too"""
+        flights = SingleFlight()
+
+        def work():
+            time.sleep(0.05)
+            raise ConnectionError("reset")
+
+        def call():
+            try:
+                flights.do("key", work)
+            except ConnectionError as e:
+                return str(e)
+
+        self.assertEqual(run_concurrently(call, 3), ["reset"] * 3)
+
+
+class TestSuperSpeechCoalescing(unittest.TestCase):
+
+    @patch('requests.Session.post')
+    def test_duplicate_uploads_are_coalesced(self, mock_post):
+        """Test that concurrent identical evaluations send one request"""
+        def slow_post(*args, **kwargs):
+            time.sleep(0.1)
+            response = MagicMock()
+            response.status_code = 200
+            response.text = json.dumps({"result": {"overall": 91}})
+            return response
+        mock_post.side_effect = slow_post
+
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", coalesce=True)
+        results = run_concurrently(
+            lambda: api.evaluate_pronunciation(AUDIO_PATH, "namja", core_type="word.eval.kr"), 4)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(api.coalesced_calls, 3)
+        self.assertTrue(all(r["result"]["overall"] == 91 for r in results))
+
+        api.evaluate_pronunciation(AUDIO_PATH, "yeoja", core_type="word.eval.kr")
+        self.assertEqual(mock_post.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.resilience import RetryPolicy
+from src.speech_api import SuperSpeech
+from src.transport import FakeTransport, FAKE_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def make_api(respond, pool_size=4):
+    transport = FakeTransport(respond)
+    api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                      pool_size=pool_size, retry=RetryPolicy(max_attempts=1))
+    return api, transport
+
+
+class TestSpeculativeEvaluation(unittest.TestCase):
+
+    def test_first_success_wins(self):
+        """Test that the fastest successful variant is returned without waiting for the others"""
+        def respond(request):
+            if request.core_type == "sent.eval.kr":
+                time.sleep(1.0)
+            return 200, FAKE_RESULT
+        api, transport = make_api(respond)
+        start = time.monotonic()
+        record = api.evaluate_speculative(AUDIO_PATH, [("sent.eval.kr", "namja"), ("word.eval.kr", "namja")])
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(record["variant"], ("word.eval.kr", "namja"))
+        self.assertEqual(record["result"], FAKE_RESULT)
+        self.assertEqual(record["requests"], 2)
+        api.close()
+
+    def test_failures_do_not_delay_the_winner(self):
+        """Test that a failing variant costs a request but not a sequential round-trip"""
+        def respond(request):
+            if request.params["start"]["param"]["request"]["refText"] == "namja":
+                return 200, {"errId": 41030, "error": "refText not supported"}
+            time.sleep(0.05)
+            return 200, FAKE_RESULT
+        api, transport = make_api(respond)
+        record = api.evaluate_speculative(AUDIO_PATH, [("word.eval.kr", "namja"), ("word.eval.kr", "남자")])
+
+        self.assertEqual(record["variant"], ("word.eval.kr", "남자"))
+        self.assertEqual(transport.request_count, 2)
+        stats = api.speculation.stats()
+        self.assertEqual(stats["wins"], {"word.eval.kr": 1})
+        self.assertEqual(stats["position_wins"], {1: 1})
+        self.assertEqual(stats["extra_requests"], 1)
+
+    def test_all_variants_fail(self):
+        """Test that the most likely variant's error is reported when nothing succeeds"""
+        def respond(request):
+            return 200, {"errId": 1, "error": request.core_type + " failed"}
+        api, transport = make_api(respond)
+        record = api.evaluate_speculative(AUDIO_PATH, [("word.eval.kr", "namja"), ("sent.eval.kr", "namja")])
+
+        self.assertIsNone(record["variant"])
+        self.assertEqual(record["result"]["error"], "word.eval.kr failed")
+        self.assertEqual(api.speculation.stats()["failures"], 1)
+
+    def test_queued_variants_are_cancelled(self):
+        """Test that variants still waiting for a worker are never sent once one succeeds"""
+        release = threading.Event()
+        started = threading.Event()
+
+        def respond(request):
+            if request.params["start"]["param"]["request"]["refText"] == "a":
+                started.wait(2)  # succeed only once "b" is in flight
+            else:
+                started.set()
+                release.wait(2)
+            return 200, FAKE_RESULT
+        # One worker runs variant "a"; the second worker is held up by "b"
+        api, transport = make_api(respond, pool_size=1)
+        record = api.evaluate_speculative(AUDIO_PATH, [("sent.eval.kr", text) for text in "abcd"])
+        release.set()
+
+        self.assertEqual(record["variant"], ("sent.eval.kr", "a"))
+        self.assertEqual(record["cancelled"], 2)
+        self.assertEqual(record["requests"], 2)
+        api.close()
+
+    def test_preflight_rejected_variants_are_not_sent(self):
+        """Test that variants the API would reject never leave the client"""
+        api, transport = make_api(lambda request: (200, FAKE_RESULT))
+        record = api.evaluate_speculative(AUDIO_PATH, [("word.eval.kr", "namja keoyo"),
+                                                       ("sent.eval.kr", "namja keoyo")])
+
+        self.assertEqual(record["variant"], ("sent.eval.kr", "namja keoyo"))
+        self.assertEqual(transport.request_count, 1)
+        self.assertEqual([request.core_type for request in transport.requests], ["sent.eval.kr"])
+
+
+if __name__ == '__main__':
+    unittest.main()
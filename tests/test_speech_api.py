@@ -2,12 +2,14 @@ import unittest
 import sys
 import os
 import json
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
-# Add the src directory to the path so we can import the speech_api module
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add the project root to the path so we can import the src package
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from speech_api import SuperSpeech
+from src.speech_api import SuperSpeech
 
 class TestSuperSpeech(unittest.TestCase):
     
@@ -32,7 +34,7 @@ class TestSuperSpeech(unittest.TestCase):
         self.assertTrue(isinstance(start_sig, str))
         self.assertEqual(len(connect_sig), 40)  # SHA-1 hash is 40 chars
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_evaluate_pronunciation(self, mock_post):
         """Test pronunciation evaluation with mocked API response"""
         # Mock the API response
@@ -65,6 +67,111 @@ class TestSuperSpeech(unittest.TestCase):
         mock_post.assert_called_once()
         args, kwargs = mock_post.call_args
         self.assertTrue(args[0].startswith("https://api.speechsuper.com/word.eval.promax"))
+    
+    def test_session_is_reused(self):
+        """Test that all requests share one pooled session"""
+        session = self.api.transport._get_session()
+        self.assertIs(self.api.transport._get_session(), session)
+        self.assertEqual(session.get_adapter("https://api.speechsuper.com/")._pool_maxsize, 10)
+    
+    def test_close_and_context_manager(self):
+        """Test that closing drops the pooled session"""
+        with patch('requests.Session.close') as mock_close:
+            with SuperSpeech(app_key="test_key", secret_key="test_secret", pool_size=2) as api:
+                api.transport._get_session()
+            mock_close.assert_called_once()
+        self.assertIsNone(api.transport._session)
+    
+    @patch('requests.Session.post')
+    def test_evaluate_batch(self, mock_post):
+        """Test that batch results keep input order and isolate failures"""
+        def fake_post(url, data=None, headers=None, files=None, **kwargs):
+            ref_text = json.loads(data['text'])['start']['param']['request']['refText']
+            if ref_text == "broken":
+                raise ConnectionError("connection reset")
+            response = MagicMock()
+            response.status_code = 200
+            response.text = json.dumps({"result": {"overall": len(ref_text)}})
+            return response
+        mock_post.side_effect = fake_post
+        
+        items = [
+            ("a.wav", "one", "word.eval.kr"),
+            {"audio_path": "b.wav", "ref_text": "three words here", "core_type": "sent.eval.kr"},
+            ("c.wav", "broken"),
+            ("d.wav", "four")
+        ]
+        with patch('builtins.open', MagicMock()):
+            results = self.api.evaluate_batch(items, max_workers=3, retries=2)
+        
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[0]["result"]["result"]["overall"], 3)
+        self.assertEqual(results[1]["result"]["result"]["overall"], 16)
+        self.assertEqual(results[3]["result"]["result"]["overall"], 4)
+        self.assertIsNone(results[0]["error"])
+        self.assertEqual(results[2]["error"], "connection reset")
+        self.assertEqual(results[2]["retries"], 2)
+        self.assertEqual(results[0]["retries"], 0)
+        self.assertTrue(all(r["elapsed"] >= 0 for r in results))
+
+    def test_malformed_batch_items_fail_alone(self):
+        """Test that bad items get an error record instead of aborting the batch"""
+        state, lock = {"active": 0, "peak": 0}, threading.Lock()
+        items = [("a.wav", "0.0"), ("b.wav",), None, "clip.wav", ("c.wav", "0.0")]
+        with patch.object(self.api, 'evaluate_pronunciation', self._fake_evaluate(state, lock)):
+            results = self.api.evaluate_batch(items)
+            streamed = sorted(self.api.evaluate_stream(items), key=lambda r: r["index"])
+        for records in (results, streamed):
+            self.assertEqual([r["error"] is None for r in records], [True, False, False, False, True])
+            self.assertIn("got str", records[3]["error"])
+
+    def _fake_evaluate(self, state, lock):
+        """Evaluate stand-in that sleeps per item and tracks peak concurrency"""
+        def evaluate(audio_path, ref_text, core_type="word.eval.promax", **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(float(ref_text))
+            with lock:
+                state["active"] -= 1
+            return {"result": {"overall": 100, "ref": ref_text}}
+        return evaluate
+    
+    def test_evaluate_stream_orders(self):
+        """Test completion-order and input-order streaming"""
+        state, lock = {"active": 0, "peak": 0}, threading.Lock()
+        items = [("a.wav", "0.2"), ("b.wav", "0.0"), ("c.wav", "0.1")]
+        with patch.object(self.api, 'evaluate_pronunciation', self._fake_evaluate(state, lock)):
+            completed = [r["index"] for r in self.api.evaluate_stream(items, max_workers=3)]
+            in_order = [r["index"] for r in self.api.evaluate_stream(items, max_workers=3, ordered=True)]
+        self.assertEqual(completed, [1, 2, 0])
+        self.assertEqual(in_order, [0, 1, 2])
+    
+    def test_evaluate_stream_is_lazy_and_bounded(self):
+        """Test that the in-flight window bounds jobs and audio bytes"""
+        state, lock = {"active": 0, "peak": 0}, threading.Lock()
+        consumed = []
+        
+        def manifest():
+            for i in range(50):
+                consumed.append(i)
+                yield ("clip%d.wav" % i, "0.01")
+        
+        with patch.object(self.api, 'evaluate_pronunciation', self._fake_evaluate(state, lock)):
+            stream = self.api.evaluate_stream(manifest(), max_workers=8, max_in_flight=4)
+            next(stream)
+            self.assertLessEqual(len(consumed), 5)
+            self.assertEqual(len(list(stream)), 49)
+        self.assertLessEqual(state["peak"], 4)
+        
+        # Each job is 1 KB, so a 2 KB budget allows only two at once
+        state["peak"] = 0
+        with patch.object(self.api, 'evaluate_pronunciation', self._fake_evaluate(state, lock)), \
+                patch.object(self.api, '_job_size', return_value=1024):
+            results = list(self.api.evaluate_stream(manifest(), max_workers=8,
+                                                    max_in_flight_bytes=2048))
+        self.assertEqual(len(results), 50)
+        self.assertLessEqual(state["peak"], 2)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.speech_api import SuperSpeech
+from src.websocket import OP_BINARY, OP_TEXT, apply_mask, encode_frame, read_frame
+from benchmarks.standin_ws_server import StandInWebSocketServer
+from benchmarks.standin_server import CANNED_RESULT
+
+
+def _reader(data):
+    position = [0]
+
+    def read_exactly(size):
+        chunk = data[position[0]:position[0] + size]
+        position[0] += size
+        return chunk
+    return read_exactly
+
+
+class TestFrames(unittest.TestCase):
+
+    def test_masked_frame_round_trip(self):
+        """Test that client frames of every length encoding decode back to the payload"""
+        for size in (0, 5, 125, 126, 65535, 65536):
+            payload = os.urandom(size)
+            fin, opcode, decoded = read_frame(_reader(encode_frame(OP_BINARY, payload)))
+            self.assertTrue(fin)
+            self.assertEqual(opcode, OP_BINARY)
+            self.assertEqual(decoded, payload)
+
+    def test_server_frames_are_unmasked(self):
+        """Test that server frames carry the payload as is"""
+        frame = encode_frame(OP_TEXT, b"hello", mask=False)
+        self.assertEqual(frame, b"\x81\x05hello")
+
+    def test_mask_is_its_own_inverse(self):
+        """Test that applying the same mask twice restores the payload"""
+        payload = b"streaming audio frame"
+        self.assertEqual(apply_mask(apply_mask(payload, b"abcd"), b"abcd"), payload)
+
+
+class TestStreamingSession(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInWebSocketServer().start()
+        self.api = SuperSpeech(app_key="test_key", secret_key="test_secret",
+                               base_url=self.server.url.replace("ws://", "http://"))
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_streams_frames_and_returns_result(self):
+        """Test that a session sends connect, start, a WAV header and every frame before stop"""
+        session = self.api.stream_pronunciation("supermarket", "word.eval.kr")
+        frames = [bytes([i]) * 3200 for i in range(5)]
+        for frame in frames:
+            session.send(frame)
+        result = session.finish()
+
+        self.assertEqual(result["result"], CANNED_RESULT["result"])
+        record = self.server.sessions[0]
+        self.assertEqual(record.core_type, "word.eval.kr")
+        self.assertEqual(record.connect["cmd"], "connect")
+        self.assertEqual(record.start["param"]["request"]["refText"], "supermarket")
+        self.assertEqual(record.start["param"]["request"]["tokenId"], result["tokenId"])
+        self.assertEqual(bytes(record.audio[:4]), b"RIFF")
+        self.assertEqual(bytes(record.audio[44:]), b"".join(frames))
+        self.assertEqual(session.bytes_sent, len(b"".join(frames)))
+        self.assertIsNotNone(session.latency)
+
+    def test_every_session_gets_its_own_token_id(self):
+        """Test that concurrent sessions are sent with distinct tokenIds"""
+        sessions = [self.api.stream_pronunciation("supermarket") for _ in range(3)]
+        for session in sessions:
+            session.send(b"\x00" * 320)
+        results = [session.finish() for session in sessions]
+        token_ids = {result["tokenId"] for result in results}
+        self.assertEqual(len(token_ids), 3)
+
+    def test_result_follows_stop_quickly(self):
+        """Test that the result arrives soon after finish() when the audio was sent during recording"""
+        session = self.api.stream_pronunciation("supermarket")
+        for _ in range(10):
+            session.send(b"\x00" * 3200)
+            time.sleep(0.01)
+        started = time.monotonic()
+        result = session.finish()
+        self.assertNotIn("error", result)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_spontaneous_session(self):
+        """Test that spontaneous speech sessions use the speak.eval.pro endpoint"""
+        session = self.api.stream_spontaneous_speech("Describe your hometown")
+        session.send(b"\x00" * 320)
+        session.finish()
+        record = self.server.sessions[0]
+        self.assertEqual(record.core_type, "speak.eval.pro")
+        self.assertEqual(record.start["param"]["request"]["questionPrompt"], "Describe your hometown")
+
+    def test_cancel_sends_no_stop(self):
+        """Test that a cancelled session never asks the server for a result"""
+        session = self.api.stream_pronunciation("supermarket")
+        session.send(b"\x00" * 320)
+        session.cancel()
+        with self.assertRaises(RuntimeError):
+            session.send(b"\x00" * 320)
+        time.sleep(0.1)
+        self.assertTrue(all(not record.stopped for record in self.server.sessions))
+
+    def test_api_error_is_returned(self):
+        """Test that an error message from the server becomes the session result"""
+        self.server.respond = lambda record: {"errId": 41008, "error": "invalid refText"}
+        session = self.api.stream_pronunciation("supermarket")
+        result = session.finish()
+        self.assertEqual(result["error"], "invalid refText")
+
+    def test_unreachable_server(self):
+        """Test that a session whose connection fails reports an error"""
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+        session = api.stream_pronunciation("supermarket", ws_url="ws://127.0.0.1:1/")
+        result = session.finish(timeout=5)
+        self.assertIn("Streaming session failed", result["error"])
+
+    def test_websocket_url_from_base_url(self):
+        """Test that the WebSocket URL follows the HTTP base URL"""
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret")
+        self.assertEqual(api._websocket_url("word.eval.kr"), "wss://api.speechsuper.com/word.eval.kr")
+        self.assertEqual(api._websocket_url("word.eval.kr", "ws://localhost:9000"),
+                         "ws://localhost:9000/word.eval.kr")
+
+
+if __name__ == '__main__':
+    unittest.main()
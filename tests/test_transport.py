@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.resilience import RetryPolicy
+from src.speech_api import SuperSpeech
+from src.transport import (FakeTransport, HTTPXTransport, RequestsTransport, httpx,
+                           make_transport, FAKE_RESULT)
+from benchmarks.standin_server import StandInServer, CANNED_RESULT
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+class TestFakeTransport(unittest.TestCase):
+
+    def test_records_uploads(self):
+        """Test that the fake transport decodes the payload and keeps the audio"""
+        transport = FakeTransport()
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport)
+        result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket", "word.eval.kr")
+
+        self.assertEqual(result, FAKE_RESULT)
+        request = transport.requests[0]
+        self.assertEqual(request.core_type, "word.eval.kr")
+        self.assertEqual(request.params["start"]["param"]["request"]["refText"], "supermarket")
+        with open(AUDIO_PATH, 'rb') as f:
+            self.assertEqual(request.audio, f.read())
+
+    def test_transport_errors_are_retried(self):
+        """Test that connection errors raised by a transport go through the retry policy"""
+        def respond(request):
+            if transport.request_count < 3:
+                raise requests.ConnectionError("reset")
+            return 200, {"result": {"overall": 70}}
+        transport = FakeTransport(respond)
+        api = SuperSpeech(app_key="test_key", secret_key="test_secret", transport=transport,
+                          retry=RetryPolicy(max_attempts=3, base_delay=0.01))
+        result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+        self.assertEqual(result["result"]["overall"], 70)
+        self.assertEqual(transport.request_count, 3)
+
+
+class TestMakeTransport(unittest.TestCase):
+
+    def test_names(self):
+        """Test selecting transports by name or instance"""
+        self.assertIsInstance(make_transport(), RequestsTransport)
+        self.assertIsInstance(make_transport("fake"), FakeTransport)
+        transport = FakeTransport()
+        self.assertIs(make_transport(transport), transport)
+        with self.assertRaises(ValueError):
+            make_transport("carrier-pigeon")
+
+    @unittest.skipIf(httpx is not None, "httpx is installed")
+    def test_httpx_missing(self):
+        """Test that the httpx transports ask for the optional dependency"""
+        with self.assertRaises(ImportError):
+            make_transport("http2")
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHTTPXTransport(unittest.TestCase):
+
+    def test_upload(self):
+        """Test a whole evaluation over httpx against the stand-in server"""
+        with StandInServer() as server:
+            api = SuperSpeech(app_key="test_key", secret_key="test_secret", base_url=server.url,
+                              transport=HTTPXTransport(http2=False))
+            result = api.evaluate_pronunciation(AUDIO_PATH, "supermarket")
+            api.close()
+        self.assertEqual(result, CANNED_RESULT)
+        self.assertGreater(server.bytes_received, os.path.getsize(AUDIO_PATH))
+
+    def test_connection_errors_are_translated(self):
+        """Test that httpx failures surface as requests exceptions"""
+        transport = HTTPXTransport(http2=False)
+        with self.assertRaises(requests.ConnectionError):
+            transport.head("http://127.0.0.1:9/", timeout=(0.5, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+if np is not None:
+    from src.vad import as_samples, detect_speech, speech_frames
+
+AUDIO_PATH = os.path.join(os.path.dirname(__file__), '..', 'audio_samples', 'supermarket.wav')
+
+
+def take(silence_before=1.0, speech=0.5, silence_after=1.0, rate=16000, noise=30, amplitude=8000):
+    """int16 recording: background noise with a tone burst in the middle."""
+    rng = np.random.default_rng(0)
+    total = int(rate * (silence_before + speech + silence_after))
+    samples = rng.standard_normal(total) * noise
+    start = int(rate * silence_before)
+    t = np.arange(int(rate * speech)) / rate
+    samples[start:start + len(t)] += amplitude * np.sin(2 * np.pi * 220 * t)
+    return samples.astype(np.int16)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestDetectSpeech(unittest.TestCase):
+
+    def test_trims_to_margin(self):
+        """Test that silence is trimmed to the margin around the speech"""
+        span = detect_speech(take().tobytes(), margin_ms=100)
+        self.assertAlmostEqual(span.start, 16000 - 1600, delta=320)
+        self.assertAlmostEqual(span.end, 24000 + 1600, delta=320)
+        self.assertEqual(span.bytes_saved, 2 * (40000 - (span.end - span.start)))
+
+    def test_speech_is_a_view(self):
+        """Test that the speech span shares memory with the recording"""
+        pcm = bytearray(take().tobytes())
+        span = detect_speech(pcm)
+        self.assertTrue(np.shares_memory(span.speech, as_samples(pcm)))
+        self.assertEqual(len(span.speech), span.end - span.start)
+
+    def test_silent_takes_are_rejected(self):
+        """Test that digital silence, room noise and a single click count as silent"""
+        self.assertIsNone(detect_speech(bytes(32000)))
+        self.assertIsNone(detect_speech(take(speech=0)))
+        click = take(speech=0)
+        click[8000:8100] = 20000
+        self.assertIsNone(detect_speech(click))
+
+    def test_quiet_fricatives_count_as_speech(self):
+        """Test that a quiet, noisy frame is kept when its zero-crossing rate is high"""
+        samples = take(speech=0, noise=200)
+        hiss = np.random.default_rng(1).standard_normal(8000) * 400
+        samples[16000:24000] += np.diff(hiss, prepend=0).astype(np.int16)  # about 9 dB over the noise
+        frames = speech_frames(samples)
+        self.assertTrue(frames[50:75].all())
+        self.assertFalse(frames[:50].any())
+
+    def test_speech_only_recording_is_kept(self):
+        """Test that a recording without leading or trailing silence is left whole"""
+        with open(AUDIO_PATH, 'rb') as f:
+            pcm = f.read()[44:]
+        span = detect_speech(pcm)
+        self.assertEqual((span.start, span.end, span.bytes_saved), (0, len(pcm) // 2, 0))
+
+    def test_continuous_loud_audio_is_kept(self):
+        """Test that a take with no silence at all is not its own noise floor"""
+        tone = take(silence_before=0, speech=2.0, silence_after=0)
+        noise = (np.random.default_rng(2).standard_normal(32000) * 4000).astype(np.int16)
+        for samples in (tone, noise):
+            span = detect_speech(samples)
+            self.assertIsNotNone(span)
+            self.assertEqual((span.start, span.end), (0, len(samples)))
+
+
+if __name__ == '__main__':
+    unittest.main()